@@ -1,19 +1,26 @@
 from sensor.configuration.mongo_db_connection import MongoDBClient
 from sensor.exception import SensorException
 import os,sys
+import itertools
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Union
 from sensor.logger import logging
 from sensor.pipeline import training_pipeline
 from sensor.pipeline.training_pipeline import TrainPipeline
 import os
 from sensor.utils.main_utils import read_yaml_file
-from sensor.constant.training_pipeline import SAVED_MODEL_DIR
-from fastapi import FastAPI
-from sensor.constant.application import APP_HOST, APP_PORT
+from fastapi import Body, FastAPI, File, Request, UploadFile
+from starlette.concurrency import run_in_threadpool
+from sensor.constant.application import APP_HOST, APP_PORT, PREDICTION_CHUNK_SIZE
 from starlette.responses import RedirectResponse
 from uvicorn import run as app_run
-from fastapi.responses import Response
-from sensor.ml.model.estimator import ModelResolver,TargetValueMapping
-from sensor.utils.main_utils import load_object
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sensor.pipeline.train_job import get_training_job_status, submit_training_job
+from sensor.ml.model.model_cache import model_cache
+from sensor.pipeline.batch_prediction import BatchPrediction, batch_prediction_stats, get_file_format
+from sensor.pipeline.online_prediction import online_batcher
+from sensor.pipeline.binary_prediction import BINARY_CONTENT_TYPES, predict_binary
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
@@ -26,7 +33,21 @@ def set_env_variable(env_file_path):
         os.environ['MONGO_DB_URL']=env_config['MONGO_DB_URL']
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Model startup pe hi load (aur watcher start), taaki pehli request load ka wait na kare aur /model
+    # pehle din se version dikhaye. Kharab model se server nahi rukta: watcher agle push ka wait karta hai
+    try:
+        await run_in_threadpool(model_cache.get)
+    except Exception as e:
+        model_cache.last_error = str(e)
+        logging.exception(e)
+        model_cache.start()
+    yield
+    model_cache.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 origins = ["*"]
 
 app.add_middleware(
@@ -42,39 +63,107 @@ app.add_middleware(
 async def index():
     return RedirectResponse(url="/docs")
 
-@app.get("/train")
-async def train_route():
+@app.post("/train")
+async def train_route(run_id: str = None):
     try:
+        # Training background worker process mein chalti hai; yahan se turant job id wapas jaati hai.
+        # run_id diya ho to woh (fail hua) run pehle adhoore stage se resume hota hai
+        job = submit_training_job(run_id=run_id)
+        if job is None:
+            return JSONResponse({"message": "Training pipeline is already running."}, status_code=409)
+        return JSONResponse({"job_id": job["job_id"], "status": job["status"],
+                             "status_url": f"/train/{job['job_id']}"}, status_code=202)
+    except ValueError as e:
+        return JSONResponse({"message": str(e)}, status_code=400)
+    except Exception as e:
+        return Response(f"Error Occurred! {e}")
 
-        train_pipeline = TrainPipeline()
-        if train_pipeline.is_pipeline_running:
-            return Response("Training pipeline is already running.")
-        train_pipeline.run_pipeline()
-        return Response("Training successful !!")
+@app.get("/train/{job_id}")
+async def train_status_route(job_id: str):
+    try:
+        # Job status, stage progress (run checkpoint se) aur run khatam hone par stage timings
+        job = get_training_job_status(job_id)
+        if job is None:
+            return JSONResponse({"message": f"No training job with id {job_id}"}, status_code=404)
+        return JSONResponse(job)
     except Exception as e:
         return Response(f"Error Occurred! {e}")
 
-@app.get("/predict")
-async def predict_route():
+@app.get("/model")
+async def model_info_route():
+    # Active model version, kab load hua aur load mein kitna time laga
+    return JSONResponse(model_cache.info())
+
+@app.post("/predict")
+def predict_route(file: UploadFile = File(...), output_format: str = None, chunk_size: int = PREDICTION_CHUNK_SIZE):
     try:
-        #get data from user csv file
-        #conver csv file to dataframe
-
-        df=None
-        model_resolver = ModelResolver(model_dir=SAVED_MODEL_DIR)
-        if not model_resolver.is_model_exists():
-            return Response("Model is not available")
-        
-        best_model_path = model_resolver.get_best_model_path()
-        model = load_object(file_path=best_model_path)
-        y_pred = model.predict(df)
-        df['predicted_column'] = y_pred
-        df['predicted_column'].replace(TargetValueMapping().reverse_mapping(),inplace=True)
-        
-        #decide how to return file to user.
-        
+        # Upload (CSV/Parquet) chunk by chunk padha jaata hai aur predictions usi waqt stream hoti hain,
+        # isliye memory chunk_size se bound hai. Best model process mein ek hi baar load hota hai.
+        loaded_model = model_cache.get()
+        if loaded_model is None:
+            return Response("Model is not available", status_code=503)
+
+        input_format = get_file_format(file.filename, file.content_type)
+        output_format = output_format or input_format
+        chunks = BatchPrediction(loaded_model.model, chunk_size=chunk_size).stream(file.file, input_format, output_format)
+        # Pehla chunk yahin banta hai taaki galat input (missing columns wagairah) 400 ban kar lautey,
+        # adhoora stream nahi
+        first_chunk = next(chunks, b"")
     except Exception as e:
-        raise Response(f"Error Occured! {e}")
+        logging.exception(e)
+        return Response(f"Error Occurred! {e}", status_code=400)
+
+    output_file_name = f"{os.path.splitext(file.filename or 'input')[0]}_predictions.{output_format}"
+    media_type = "text/csv" if output_format == "csv" else "application/vnd.apache.parquet"
+    return StreamingResponse(itertools.chain([first_chunk], chunks), media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{output_file_name}"',
+                                      "X-Model-Version": loaded_model.version})
+
+@app.post("/predict/binary")
+async def binary_predict_route(request: Request):
+    try:
+        # Arrow IPC stream ya raw float32 matrix (Content-Type se); bytes seedha NumPy mein jaate hain
+        # aur predictions usi binary format mein lautti hain
+        loaded_model = model_cache.get()
+        if loaded_model is None:
+            return Response("Model is not available", status_code=503)
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        if content_type not in BINARY_CONTENT_TYPES:
+            return Response(f"Unsupported content type, expected one of {BINARY_CONTENT_TYPES}", status_code=415)
+        body = await request.body()
+        content = await run_in_threadpool(predict_binary, loaded_model.model, body, content_type)
+        return Response(content, media_type=content_type, headers={"X-Model-Version": loaded_model.version})
+    except Exception as e:
+        logging.exception(e)
+        return Response(f"Error Occurred! {e}", status_code=400)
+
+@app.get("/predict/stats")
+async def predict_stats_route():
+    # Batch prediction ki ginti aur pichle run ka throughput (rows/sec)
+    return JSONResponse(batch_prediction_stats.to_dict())
+
+@app.post("/predict/online")
+async def online_predict_route(payload: Union[dict, list] = Body(...)):
+    try:
+        # Ek record (dict), records ki list, ya {"records": [...]}; concurrent requests micro-batcher mein
+        # ek saath predict hoti hain
+        if isinstance(payload, list):
+            records = payload
+        else:
+            records = payload.get("records", [payload])
+        if not records or not all(isinstance(record, dict) for record in records):
+            return JSONResponse({"message": "Expected a record or a list of records"}, status_code=400)
+        predictions = await online_batcher.predict(records)
+        return JSONResponse({"predictions": predictions})
+    except asyncio.QueueFull:
+        return JSONResponse({"message": "Prediction queue is full, retry later"}, status_code=503)
+    except Exception as e:
+        return Response(f"Error Occurred! {e}", status_code=500)
+
+@app.get("/predict/online/stats")
+async def online_predict_stats_route():
+    # Queue depth aur batch size histogram
+    return JSONResponse(online_batcher.stats())
 
 def main():
     try:
@@ -2,100 +2,333 @@ from sensor.exception import SensorException
 from sensor.logger import logging
 from sensor.entity.config_entity import DataIngestionConfig
 from sensor.entity.artifact_entity import DataIngestionArtifact
-from sklearn.model_selection import train_test_split
 from pandas import DataFrame
+import numpy as np
 import os, sys
+from contextlib import ExitStack
+from itertools import chain
+from typing import Dict, Iterable, Optional
 
 from sensor.data_access.sensor_data import SensorData
-from sensor.utils.main_utils import read_yaml_file
-from sensor.constant.training_pipeline import SCHEMA_FILE_PATH
+from sensor.data_access.feature_store import FeatureStore
+from sensor.utils.main_utils import DataFrameChunkWriter, iter_dataframe_chunks
+from sensor.utils.schema import get_schema
 
 
 class DataIngestion:
     def __init__(self, data_ingestion_config: DataIngestionConfig):
         try:
             self.data_ingestion_config = data_ingestion_config
-            self._schema_config = read_yaml_file(SCHEMA_FILE_PATH)
+            self._schema = get_schema()
         except Exception as e:
             raise SensorException(e, sys)
 
-    def export_data_into_feature_store(self) -> DataFrame:
+    def export_data_into_feature_store(self) -> Dict[str, int]:
         """
-        Fetch data from MongoDB and save it as a CSV in the feature store.
+        Fetch data from MongoDB chunk by chunk and append each chunk to the feature store file.
+        Peak memory during export depends on the chunk size, not on the collection size.
+        In incremental mode only documents newer than the stored watermark are fetched.
+        Returns the feature store files (in order) with their row counts; the data itself stays on disk.
         """
         try:
+            if self.data_ingestion_config.incremental:
+                return self.export_new_data_into_feature_store()
+
             logging.info("Exporting data from MongoDB to feature store.")
+            chunks = self._export_chunks(SensorData(), query=self.data_ingestion_config.export_query)
+
+            feature_store_file_path = self.data_ingestion_config.feature_store_file_path
+            number_of_rows = self.write_chunks_to_feature_store(chunks, feature_store_file_path,
+                                                                dtypes=self._schema.ingested_dtype_map)
+
+            if number_of_rows == 0:
+                raise SensorException("Exported dataframe is empty!", sys)
+
+            logging.info(f"Data exported to feature store at {feature_store_file_path} ({number_of_rows} rows)")
+
+            return {feature_store_file_path: number_of_rows}
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def export_new_data_into_feature_store(self) -> Dict[str, int]:
+        """
+        Fetch only the documents after the persisted watermark, append them to the versioned feature store
+        as a new part and return all committed parts with their row counts. MongoDB export time scales with the delta only.
+        """
+        try:
+            config = self.data_ingestion_config
+            feature_store = FeatureStore(config.feature_store_dir, watermark_key=config.watermark_key)
+            watermark = feature_store.get_watermark()
+
             sensor_data = SensorData()
-            dataframe = sensor_data.export_collection_as_dataframe(
-                collection_name=self.data_ingestion_config.collection_name
+            if watermark is not None and not self.is_feature_store_in_sync(sensor_data, feature_store, watermark):
+                # Source collection khaali/dobara load hui ya documents delete hue: purane parts pe append
+                # karne se duplicate rows train aur test dono mein chale jaate, isliye full export se nayi store
+                feature_store.reset()
+                watermark = None
+
+            high_watermark = sensor_data.get_max_key(
+                config.collection_name, key=config.watermark_key, query=config.export_query
             )
+            if watermark is not None and (high_watermark is None or high_watermark < watermark):
+                high_watermark = watermark
 
-            if dataframe.empty:
-                raise SensorException("Exported dataframe is empty!", sys)
+            queries, window_keys = self.get_incremental_queries(sensor_data, feature_store, watermark, high_watermark)
+            if queries:
+                logging.info(f"Exporting documents with {config.watermark_key} after {watermark} up to {high_watermark}")
+                source = sensor_data.get_collection_signature(
+                    config.collection_name, key=config.watermark_key,
+                    query=self._with_export_query({config.watermark_key: {"$lte": high_watermark}})
+                )
+                part_file_path = feature_store.new_part_file_path(config.feature_store_version)
+                chunks = chain.from_iterable(self._export_chunks(sensor_data, query=query) for query in queries)
+                number_of_rows = self.write_chunks_to_feature_store(chunks, part_file_path,
+                                                                    dtypes=self._schema.ingested_dtype_map)
 
-            # Save the DataFrame to CSV
-            feature_store_file_path = self.data_ingestion_config.feature_store_file_path
-            dir_path = os.path.dirname(feature_store_file_path)
-            os.makedirs(dir_path, exist_ok=True)
+                if number_of_rows > 0:
+                    feature_store.commit_version(config.feature_store_version, part_file_path,
+                                                 number_of_rows, high_watermark, window_keys=window_keys,
+                                                 source=source)
+            else:
+                logging.info(f"No new documents after watermark {watermark}, reusing existing feature store")
 
-            dataframe.to_csv(feature_store_file_path, index=False, header=True)
-            logging.info(f"Data exported to feature store at {feature_store_file_path}")
+            part_files = feature_store.part_files()
+            number_of_rows = sum(part_files.values())
+            if number_of_rows == 0:
+                raise SensorException("Exported dataframe is empty!", sys)
 
-            return dataframe
+            logging.info(f"Feature store has {len(feature_store.versions)} versions, {number_of_rows} rows")
+            return part_files
         except Exception as e:
             raise SensorException(e, sys)
 
-    def split_data_as_train_test(self, dataframe: DataFrame) -> None:
+    def is_feature_store_in_sync(self, sensor_data: SensorData, feature_store: FeatureStore, watermark) -> bool:
         """
-        Split the DataFrame into train and test sets and save them.
+        Committed feature store abhi bhi source collection se mel khaati hai ya nahi. Watermark tak ke source
+        documents ki ginti committed rows (plus pichhli safety window ke late documents jo abhi aane baaki hain)
+        ke barabar honi chahiye, aur min key manifest wali hi honi chahiye. Collection khaali hui, kam keys ke
+        saath dobara load hui ya naye _id ke saath re-seed hui to False.
         """
         try:
-            train_set, test_set = train_test_split(
-                dataframe, test_size=self.data_ingestion_config.train_test_split_ratio
+            config = self.data_ingestion_config
+            key = config.watermark_key
+            signature = sensor_data.get_collection_signature(
+                config.collection_name, key=key, query=self._with_export_query({key: {"$lte": watermark}})
             )
+            committed_rows = feature_store.committed_rows
+            expected_min_key = feature_store.source.get("min_key")
+            if expected_min_key is not None and signature["min_key"] != expected_min_key:
+                logging.info(f"Source min {key} {signature['min_key']} != feature store min {key} {expected_min_key}")
+                return False
 
-            logging.info("Performed train-test split on the dataframe.")
+            late_rows = 0
+            seen_keys = feature_store.get_window_keys()
+            window_lower = FeatureStore.window_lower_bound(watermark, config.watermark_safety_window_seconds)
+            if seen_keys is not None and window_lower is not None:
+                late_rows = sum(1 for window_key in sensor_data.get_keys(config.collection_name, key=key,
+                                                                         lower=window_lower, upper=watermark,
+                                                                         query=config.export_query)
+                                if str(window_key) not in seen_keys)
+            if signature["count"] != committed_rows + late_rows:
+                logging.info(f"Source has {signature['count']} documents up to watermark {watermark}, "
+                             f"feature store has {committed_rows} rows (+{late_rows} late)")
+                return False
+            return True
+        except Exception as e:
+            raise SensorException(e, sys)
 
-            # Ensure the training directory exists
-            dir_path = os.path.dirname(self.data_ingestion_config.training_file_path)
-            os.makedirs(dir_path, exist_ok=True)
+    def get_incremental_queries(self, sensor_data: SensorData, feature_store: FeatureStore, watermark,
+                                high_watermark) -> tuple:
+        """
+        Is run ke export queries aur naye watermark ki safety window ki keys: (queries, window_keys).
+        Window ke neeche ka naya data key range se aata hai; window ke andar ke documents explicit keys (`$in`,
+        watermark_keys_per_query ke batches mein) se, jo export se pehle hi pin ho jaati hain, taaki sidecar mein
+        wahi keys jaayein jo sach mein export hui. Purani window ki jo keys feature store mein nahi thi (der se
+        insert hue documents) woh bhi `$in` mein judti hain, baaki _id se skip. Kuch naya na ho to queries khaali.
+        Window na ban sake (key type ObjectId/datetime nahi) to seedha (watermark, high] range.
+        """
+        try:
+            config = self.data_ingestion_config
+            key = config.watermark_key
+            if high_watermark is None:
+                return [], None
 
-            # Save train and test sets
-            train_set.to_csv(
-                self.data_ingestion_config.training_file_path, index=False, header=True
-            )
-            test_set.to_csv(
-                self.data_ingestion_config.testing_file_path, index=False, header=True
+            window_seconds = config.watermark_safety_window_seconds
+            window_lower = FeatureStore.window_lower_bound(high_watermark, window_seconds)
+            if window_lower is None:
+                if watermark is not None and not high_watermark > watermark:
+                    return [], None
+                key_range = {"$lte": high_watermark}
+                if watermark is not None:
+                    key_range["$gt"] = watermark
+                return [self._with_export_query({key: key_range})], None
+
+            # Naye watermark ki window ki keys abhi pin: export ke baad aane wale documents agle run mein aayenge
+            window_keys = sensor_data.get_keys(config.collection_name, key=key, lower=window_lower,
+                                               upper=high_watermark, query=config.export_query)
+            seen_keys = feature_store.get_window_keys()
+            new_keys = {}
+            for window_key in window_keys:
+                if watermark is None or window_key > watermark or (seen_keys is not None
+                                                                   and str(window_key) not in seen_keys):
+                    new_keys[str(window_key)] = window_key
+            previous_window_lower = FeatureStore.window_lower_bound(watermark, window_seconds)
+            if seen_keys is not None and previous_window_lower is not None and previous_window_lower < window_lower:
+                # Purani window ka jo hissa nayi window ke neeche hai, uske late documents
+                for late_key in sensor_data.get_keys(config.collection_name, key=key, lower=previous_window_lower,
+                                                     upper=min(watermark, window_lower), query=config.export_query):
+                    if str(late_key) not in seen_keys:
+                        new_keys[str(late_key)] = late_key
+            if new_keys:
+                logging.info(f"{len(new_keys)} documents in the {window_seconds}s safety window are new")
+
+            queries = []
+            if watermark is None or window_lower > watermark:
+                key_range = {"$lte": window_lower}
+                if watermark is not None:
+                    key_range["$gt"] = watermark
+                queries.append(self._with_export_query({key: key_range}))
+            new_keys = sorted(new_keys.values())
+            for start in range(0, len(new_keys), config.watermark_keys_per_query):
+                batch = new_keys[start:start + config.watermark_keys_per_query]
+                queries.append(self._with_export_query({key: {"$in": batch}}))
+            return queries, window_keys
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def _with_export_query(self, query: dict) -> dict:
+        export_query = self.data_ingestion_config.export_query
+        return {"$and": [export_query, query]} if export_query else query
+
+    def _export_chunks(self, sensor_data: SensorData, query: Optional[dict]) -> Iterable[DataFrame]:
+        config = self.data_ingestion_config
+        if config.export_partitions > 1:
+            # Range-partitioned parallel export, partitions key order mein feature store mein stitch hote hain
+            partitions = sensor_data.export_collection_in_partitions(
+                collection_name=config.collection_name,
+                n_partitions=config.export_partitions,
+                partition_key=config.export_partition_key,
+                chunk_size=config.export_chunk_size,
+                projection=self.get_schema_projection(),
+                query=query,
+                prefetch_chunks=config.export_prefetch_chunks
             )
+            return map(self.coerce_numeric_chunk, partitions)
+        chunks = sensor_data.export_collection_as_chunks(
+            collection_name=config.collection_name,
+            chunk_size=config.export_chunk_size,
+            projection=self.get_schema_projection(),
+            query=query
+        )
+        return map(self.coerce_numeric_chunk, chunks)
 
-            logging.info(f"Train and test files saved at {dir_path}")
+    def get_schema_projection(self) -> dict:
+        """
+        MongoDB projection from schema.yaml: only the schema columns minus drop_columns are sent
+        by the server, `_id` and unknown fields never leave MongoDB.
+        """
+        return self._schema.projection()
+
+    @staticmethod
+    def write_chunks_to_feature_store(chunks: Iterable[DataFrame], file_path: str,
+                                      dtypes: Optional[dict] = None) -> int:
+        """
+        Write DataFrame chunks to the feature store file (Parquet or CSV, by extension) as they arrive.
+        Every chunk is aligned to the schema columns and types (`dtypes`, Schema.ingested_dtype_map) so that the file
+        stays rectangular; without it a chunk with a column the first chunk did not have is an error.
+        Returns the number of rows written.
+        """
+        try:
+            with DataFrameChunkWriter(file_path, dtypes=dtypes) as writer:
+                for chunk in chunks:
+                    writer.write(chunk)
+                    logging.info(f"Wrote chunk of {len(chunk)} rows to feature store (total {writer.number_of_rows})")
+
+            return writer.number_of_rows
         except Exception as e:
             raise SensorException(e, sys)
 
-    def initiate_data_ingestion(self) -> DataIngestionArtifact:
+    def coerce_numeric_chunk(self, chunk: DataFrame) -> DataFrame:
         """
-        Execute the full data ingestion pipeline: fetch from DB → clean → split → save.
+        Dict-decoded chunks mein 'na' strings aur numbers mixed hote hain; schema dtypes mein cast kar dete hain
+        taaki har chunk ke column types same rahein.
+        Jo values number nahi ban paayi unki rows schema ke not_numeric_column mein mark hoti hain.
+        """
+        return self._schema.coerce(chunk)
+
+    def split_data_as_train_test(self, feature_store_files: Dict[str, int]) -> None:
+        """
+        Feature store files ko chunk by chunk padh kar train aur test files mein likhta hai.
+        Test rows pehle se row index par random sample ho jaati hain (train_test_split jitni hi), isliye
+        poora feature store kabhi memory mein nahi aata; peak memory ek chunk aur ek bool per row hai.
+        Sample split_random_state se seeded hai, isliye same feature store pe split har run mein same rehta hai.
         """
         try:
-            # Step 1: Load data from MongoDB
-            dataframe = self.export_data_into_feature_store()
+            config = self.data_ingestion_config
+            number_of_rows = sum(feature_store_files.values())
+            test_size = int(np.ceil(number_of_rows * config.train_test_split_ratio))
+            if test_size == 0 or test_size >= number_of_rows:
+                raise ValueError(f"Cannot split {number_of_rows} rows with test ratio {config.train_test_split_ratio}")
+
+            is_test_row = np.zeros(number_of_rows, dtype=bool)
+            rng = np.random.default_rng(config.split_random_state)
+            is_test_row[rng.choice(number_of_rows, size=test_size, replace=False)] = True
+            logging.info(f"Sampled {test_size} of {number_of_rows} rows for the test set.")
+
+            # Ensure the training directory exists
+            dir_path = os.path.dirname(config.training_file_path)
+            os.makedirs(dir_path, exist_ok=True)
+
+            # Train aur test (columnar) ek saath likhte hain; CSV copies sirf maangne par
+            file_paths = {"train": [config.training_file_path], "test": [config.testing_file_path]}
+            if config.export_csv:
+                for split_name in file_paths:
+                    file_paths[split_name].append(os.path.splitext(file_paths[split_name][0])[0] + ".csv")
+
+            drop_columns = set(self._schema.drop_columns)
+            with ExitStack() as stack:
+                writers = {
+                    split_name: [stack.enter_context(DataFrameChunkWriter(file_path, dtypes=self._schema.ingested_dtype_map))
+                                 for file_path in paths]
+                    for split_name, paths in file_paths.items()
+                }
+                row_offset = 0
+                for feature_store_file_path in feature_store_files:
+                    for chunk in iter_dataframe_chunks(feature_store_file_path, chunk_size=config.export_chunk_size):
+                        # Column names clean karo; schema ke drop columns writer ke column list mein hote hi nahi
+                        chunk.columns = chunk.columns.astype(str).str.strip()
+                        chunk = self._schema.cast(chunk.drop(columns=[col for col in chunk.columns if col in drop_columns]))
+                        if self._schema.not_numeric_column not in chunk.columns:
+                            # Purane feature store parts mein coercion mask nahi tha
+                            chunk[self._schema.not_numeric_column] = False
 
-            print("\n\n=== Dataframe Sample ===\n", dataframe.head(), "\n\n")
+                        chunk_is_test = is_test_row[row_offset: row_offset + len(chunk)]
+                        row_offset += len(chunk)
+                        for split_name, split in (("train", chunk[~chunk_is_test]), ("test", chunk[chunk_is_test])):
+                            if len(split) == 0:
+                                continue
+                            for writer in writers[split_name]:
+                                writer.write(split)
 
+            if row_offset != number_of_rows:
+                raise ValueError(f"Feature store has {row_offset} rows, expected {number_of_rows}")
 
-            # Step 2: Clean column names
-            dataframe.columns = dataframe.columns.astype(str).str.strip()
+            logging.info(f"Train ({number_of_rows - test_size} rows) and test ({test_size} rows) files saved at {dir_path}")
+        except Exception as e:
+            raise SensorException(e, sys)
 
-            # Step 3: Drop columns specified in schema
-            drop_columns = [col.strip() for col in self._schema_config.get("drop_columns", [])]
-            existing_drop_columns = [col for col in drop_columns if col in dataframe.columns]
-            dataframe = dataframe.drop(existing_drop_columns, axis=1)
-            logging.info(f"Dropped columns: {existing_drop_columns}")
+    def initiate_data_ingestion(self) -> DataIngestionArtifact:
+        """
+        Execute the full data ingestion pipeline: fetch from DB → clean → split → save.
+        """
+        try:
+            # Step 1: Stream data from MongoDB into the feature store on disk
+            feature_store_files = self.export_data_into_feature_store()
 
-            # Step 4: Split into train and test
-            self.split_data_as_train_test(dataframe=dataframe)
+            # Step 2: Clean columns and split into train and test, chunk by chunk from the feature store
+            self.split_data_as_train_test(feature_store_files=feature_store_files)
 
-            # Step 5: Return artifact
+            # Step 3: Return artifact
             data_ingestion_artifact = DataIngestionArtifact(
                 trained_file_path=self.data_ingestion_config.training_file_path,
                 test_file_path=self.data_ingestion_config.testing_file_path
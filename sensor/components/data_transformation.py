@@ -15,6 +15,8 @@ from sensor.exception import SensorException
 from sensor.logger import logging
 from sensor.ml.model.estimator import TargetValueMapping
 from sensor.utils.main_utils import save_numpy_array_data, save_object
+from sensor.utils.schema import get_schema
+from sensor.pipeline.dag import TaskGraph
 
 
 class DataTransformation:
@@ -33,9 +35,9 @@ class DataTransformation:
 
     @staticmethod
     def read_data(file_path) -> pd.DataFrame:
-        # CSV file read karta hai aur DataFrame return karta hai
+        # Parquet/CSV file ko schema ke dtypes ke saath (already numeric) read karta hai
         try:
-            return pd.read_csv(file_path)
+            return get_schema().read(file_path)
         except Exception as e:
             raise SensorException(e, sys)
         
@@ -59,18 +61,12 @@ class DataTransformation:
 
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        'na' strings ko NaN mein convert karta hai aur numeric columns ko proper dtypes mein convert karta hai
+        Jo columns abhi bhi schema dtype mein nahi hain (e.g. purani CSV files) unhe hi convert karta hai;
+        schema reader se aaya typed data waise hi wapas aa jaata hai
         """
         try:
-            # 'na' strings ko actual NaN values mein convert karo
-            df = df.replace('na', np.nan)
-            
-            # All columns (except target) ko numeric mein convert karo
-            for col in df.columns:
-                if col != TARGET_COLUMN:  # Target column ko skip karo
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            logging.info(f"Data cleaned: converted 'na' strings to NaN and numeric conversion done")
+            df = get_schema().cast(df)
+            logging.info(f"Data cleaned: columns cast to schema dtypes")
             return df
         except Exception as e:
             raise SensorException(e, sys) from e
@@ -78,55 +74,59 @@ class DataTransformation:
     def initiate_data_transformation(self) -> DataTransformationArtifact:
 
         try:
-            # Step 1: Cleaned data read karo
-            train_df = DataTransformation.read_data(self.data_validation_artifact.valid_train_file_path)
-            test_df = DataTransformation.read_data(self.data_validation_artifact.valid_test_file_path)
+            config = self.data_transformation_config
 
-            # Step 1.5: 'na' strings ko handle karo
-            train_df = self.clean_data(train_df)
-            test_df = self.clean_data(test_df)
+            # Step 1 + 1.5: Cleaned data read karo aur 'na' strings ko handle karo
+            def load_split(file_path):
+                return self.clean_data(DataTransformation.read_data(file_path))
 
             # Step 2: Features aur target alag karo
-            input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN])
-            target_feature_train_df = train_df[TARGET_COLUMN].replace(TargetValueMapping().to_dict())
-
-            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN])
-            target_feature_test_df = test_df[TARGET_COLUMN].replace(TargetValueMapping().to_dict())
-
-            preprocessor = self.get_data_transformer_object()
-            preprocessor_object = preprocessor.fit(input_feature_train_df)
-
-            # Step 3: Data ko transform karo
-            transformed_input_train_feature = preprocessor_object.transform(input_feature_train_df)
-            transformed_input_test_feature = preprocessor_object.transform(input_feature_test_df)
-
-            smt = SMOTETomek(sampling_strategy="minority")
-
-            # Step 4: Imbalanced data ko balance karo
-            input_feature_train_final, target_feature_train_final = smt.fit_resample(
-                transformed_input_train_feature, target_feature_train_df
-            )
-            input_feature_test_final, target_feature_test_final = smt.fit_resample(
-                transformed_input_test_feature, target_feature_test_df
-            )
-
-            train_arr = np.c_[input_feature_train_final, np.array(target_feature_train_final)]
-            test_arr = np.c_[input_feature_test_final, np.array(target_feature_test_final)]
-
-            save_numpy_array_data(
-                self.data_transformation_config.transformed_train_file_path, array=train_arr
-            )
-            save_numpy_array_data(
-                self.data_transformation_config.transformed_test_file_path, array=test_arr
-            )
-            save_object(
-                self.data_transformation_config.transformed_object_file_path, preprocessor_object
-            )
+            def split_features(dataframe):
+                input_feature_df = dataframe.drop(columns=[TARGET_COLUMN])
+                target_feature_df = dataframe[TARGET_COLUMN].map(TargetValueMapping().to_dict()).astype(int)
+                return input_feature_df, target_feature_df
+
+            # Step 3 + 4: Data ko transform karo, imbalanced data ko balance karo aur save karo
+            def transform_resample_save(split, preprocessor, feature_file_path, target_file_path,
+                                        unsampled_feature_file_path=None, unsampled_target_file_path=None):
+                input_feature_df, target_feature_df = split
+                transformed_input_feature = preprocessor.transform(input_feature_df)
+                if unsampled_feature_file_path is not None:
+                    # Resampling se pehle wali copy: tuning isi se validation fold nikaalti hai (leak nahi hota)
+                    save_numpy_array_data(unsampled_feature_file_path, array=np.ascontiguousarray(
+                        transformed_input_feature, dtype=config.feature_dtype))
+                    save_numpy_array_data(unsampled_target_file_path, array=np.asarray(target_feature_df, dtype=config.target_dtype))
+                smt = SMOTETomek(sampling_strategy="minority")
+                input_feature_final, target_feature_final = smt.fit_resample(transformed_input_feature, target_feature_df)
+                # X aur y alag files: np.c_ wala poora copy (aur float64 mein target) nahi banta
+                save_numpy_array_data(feature_file_path, array=np.ascontiguousarray(
+                    input_feature_final, dtype=config.feature_dtype))
+                save_numpy_array_data(target_file_path, array=np.asarray(target_feature_final, dtype=config.target_dtype))
+
+            # Train aur test ka transform + SMOTETomek ek doosre se independent hai, isliye saath chalte hain
+            graph = TaskGraph("data_transformation")
+            graph.add_task("train", lambda: split_features(load_split(self.data_validation_artifact.valid_train_file_path)))
+            graph.add_task("test", lambda: split_features(load_split(self.data_validation_artifact.valid_test_file_path)))
+            graph.add_task("preprocessor", lambda train: self.get_data_transformer_object().fit(train[0]), inputs=["train"])
+            graph.add_task("save_preprocessor", lambda preprocessor: save_object(
+                config.transformed_object_file_path, preprocessor), inputs=["preprocessor"])
+            graph.add_task("train_array", lambda train, preprocessor: transform_resample_save(
+                train, preprocessor, config.transformed_train_file_path, config.transformed_train_target_file_path,
+                config.transformed_train_unsampled_file_path, config.transformed_train_unsampled_target_file_path),
+                inputs=["train", "preprocessor"])
+            graph.add_task("test_array", lambda test, preprocessor: transform_resample_save(
+                test, preprocessor, config.transformed_test_file_path, config.transformed_test_target_file_path),
+                inputs=["test", "preprocessor"])
+            graph.run()
 
             data_transformation_artifact = DataTransformationArtifact(
                 transformed_object_file_path=self.data_transformation_config.transformed_object_file_path,
                 transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
                 transformed_test_file_path=self.data_transformation_config.transformed_test_file_path,
+                transformed_train_target_file_path=self.data_transformation_config.transformed_train_target_file_path,
+                transformed_test_target_file_path=self.data_transformation_config.transformed_test_target_file_path,
+                transformed_train_unsampled_file_path=self.data_transformation_config.transformed_train_unsampled_file_path,
+                transformed_train_unsampled_target_file_path=self.data_transformation_config.transformed_train_unsampled_target_file_path,
             )
             logging.info(f"Data transformation artifact: {data_transformation_artifact}")
             return data_transformation_artifact
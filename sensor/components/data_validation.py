@@ -1,12 +1,16 @@
 import shutil
-from sensor.constant.training_pipeline import SCHEMA_FILE_PATH
 from sensor.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
 from sensor.entity.config_entity import DataValidationConfig
 from sensor.exception import SensorException
 from sensor.logger import logging
-from sensor.utils.main_utils import read_yaml_file
-from sensor.utils.main_utils import write_yaml_file   # ya jahan pe likha ho wahan se
-from scipy.stats import ks_2samp
+from sensor.utils.schema import get_schema
+from sensor.utils.main_utils import write_dataframe, write_yaml_file   # ya jahan pe likha ho wahan se
+from sensor.utils.row_validator import RowValidator
+from sensor.utils.frame_store import frame_store
+from sensor.pipeline.dag import TaskGraph
+from sensor.ml.metric.drift_metric import get_drift_report
+from sensor.ml.metric.quantile_sketch import ColumnSketches, get_sketch_drift_report
+import numpy as np
 import pandas as pd
 import os,sys
 
@@ -19,7 +23,8 @@ class DataValidation:
         try:
             self.data_ingestion_artifact = data_ingestion_artifact  # Yeh train/test file ka path laata hai
             self.data_validation_config = data_validation_config    # Yeh drift report file path laata hai
-            self._schema_config = read_yaml_file(SCHEMA_FILE_PATH) # schema.yaml file read kar ke config save kar raha
+            self._schema = get_schema()                             # schema.yaml ka compiled (cached) Schema object
+            self._row_validator = RowValidator(self._schema)        # schema.yaml ke "validation" rules se row checks
         except Exception as e:
             raise  SensorException(e,sys)
 
@@ -30,12 +35,14 @@ class DataValidation:
     # ✅ Yeh function check karta hai ki dataframe ke columns ka count schema ke equal hai ya nahi
     def validate_number_of_columns(self,dataframe:pd.DataFrame)->bool:
         try:
-            number_of_columns = len(self._schema_config["columns"])  # Expected column count
+            number_of_columns = len(self._schema.columns)  # Expected column count
             logging.info(f"Required number of columns: {number_of_columns}")
-            logging.info(f"Data frame has columns: {len(dataframe.columns)}")
+            # Ingestion ka not_numeric mask column schema ka column nahi hai, ginti mein nahi aata
+            dataframe_columns = [column for column in dataframe.columns if column != self._schema.not_numeric_column]
+            logging.info(f"Data frame has columns: {len(dataframe_columns)}")
             
             # Agar match ho gaya toh return True, warna False
-            if len(dataframe.columns)==number_of_columns:
+            if len(dataframe_columns)==number_of_columns:
                 return True
             return False
         except Exception as e:
@@ -44,7 +51,7 @@ class DataValidation:
     # 🔢 Yeh check karta hai ki schema ke numerical columns dataframe me present hain ya nahi
     def is_numerical_column_exist(self,dataframe:pd.DataFrame)->bool:
         try:
-            numerical_columns = self._schema_config["numerical_columns"]   # schema.yaml se expected numerical columns
+            numerical_columns = self._schema.numerical_columns   # schema.yaml se expected numerical columns
             dataframe_columns = dataframe.columns                          # actual dataframe ke columns
 
             numerical_column_present = True
@@ -62,47 +69,45 @@ class DataValidation:
         except Exception as e:
             raise SensorException(e,sys)
 
-    # 📖 Yeh static function hai jo CSV file ko read karke dataframe return karta hai
+    # 📖 Yeh static function hai jo Parquet/CSV file ko schema ke dtypes ke saath read karke dataframe return karta hai
     @staticmethod
     def read_data(file_path)->pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return get_schema().read(file_path)
         except Exception as e:
             raise SensorException(e,sys)
 
-    # 🔄 Yeh function train aur test data ke beech **data drift** check karta hai using KS test
-    def detect_dataset_drift(self, base_df, current_df, threshold=0.05):
+    # 🧹 Har row ko schema rules pe check karta hai aur valid/invalid rows alag files mein likhta hai
+    def validate_rows(self, dataframe: pd.DataFrame, valid_file_path: str, invalid_file_path: str):
         try:
-            drift_report = {}
-            numerical_columns = base_df.select_dtypes(include=['int64', 'float64']).columns
-            
-            for column in numerical_columns:
-                d1 = base_df[column]
-                d2 = current_df[column]
-    
-                # Drop NaNs and convert all to float for ks_2samp
-                d1_clean = pd.to_numeric(d1.dropna(), errors='coerce')
-                d2_clean = pd.to_numeric(d2.dropna(), errors='coerce')
-    
-                d1_clean = d1_clean.dropna()
-                d2_clean = d2_clean.dropna()
-    
-                if len(d1_clean) == 0 or len(d2_clean) == 0:
-                    drift_report[column] = {
-                        "p_value": None,
-                        "drift_status": "Insufficient data"
-                    }
-                    continue
-    
-                is_same_dist = ks_2samp(d1_clean, d2_clean)
-                drift_status = is_same_dist.pvalue > threshold
-    
-                drift_report[column] = {
-                    "p_value": float(is_same_dist.pvalue),
-                    "drift_status": drift_status
-                }
-    
-            # line 104 in data_validation.py
+            valid_df, invalid_df, report = self._row_validator.validate(dataframe)
+            write_dataframe(valid_file_path, valid_df, keep_in_memory=True)
+            write_dataframe(invalid_file_path, invalid_df)
+            logging.info(f"Row validation: {report['valid_rows']} valid, {report['invalid_rows']} invalid "
+                         f"rows, failed checks: {report['failed_checks']}")
+            return valid_df, report
+        except Exception as e:
+            raise SensorException(e,sys)
+
+    # 🔄 Yeh function train aur test data ke beech **data drift** check karta hai (KS / binned KS / PSI)
+    def detect_dataset_drift(self, base_df, current_df, threshold=None):
+        try:
+            config = self.data_validation_config
+            numerical_columns = list(base_df.select_dtypes(include=[np.number]).columns)
+
+            # Saare columns ek baar sort hote hain aur column blocks thread pool pe chalte hain
+            drift_report = get_drift_report(
+                base_df=base_df,
+                current_df=current_df,
+                columns=numerical_columns,
+                threshold=config.drift_threshold if threshold is None else threshold,
+                method=config.drift_method,
+                bins=config.drift_bins,
+                psi_threshold=config.drift_psi_threshold,
+                binned_min_rows=config.drift_binned_min_rows,
+                max_workers=config.drift_max_workers,
+            )
+
             write_yaml_file(
                      file_path=self.data_validation_config.drift_report_file_path,
                      data=drift_report
@@ -113,55 +118,115 @@ class DataValidation:
         except Exception as e:
             raise SensorException(e, sys)
 
-
-    # 🚀 Ye main function hai jo pura data validation pipeline execute karta hai
-    def initiate_data_validation(self)->DataValidationArtifact:
+    # 📐 Har numerical column ka quantile sketch banata hai (train + test merge karke) aur drift report ke paas save karta hai
+    def build_column_sketches(self, train_df, test_df) -> ColumnSketches:
         try:
-            error_message = ""  # Saare errors collect karke final me raise karenge
-
-            # Ingested train/test files ka path le rahe hain
-            train_file_path = self.data_ingestion_artifact.trained_file_path
-            test_file_path = self.data_ingestion_artifact.test_file_path
+            config = self.data_validation_config
+            numerical_columns = list(train_df.select_dtypes(include=[np.number]).columns)
 
-            # Train aur Test data read karte hain
-            train_dataframe = DataValidation.read_data(train_file_path)
-            test_dataframe = DataValidation.read_data(test_file_path)
-
-            # Step 1️⃣: Check number of columns in train
-            status = self.validate_number_of_columns(dataframe=train_dataframe)
-            if not status:
-                error_message = f"{error_message}Train dataframe does not contain all columns.\n"
+            # Train aur test ke sketches alag bante hain aur merge ho jaate hain, bilkul incremental batches ki tarah
+            sketches = ColumnSketches.from_dataframe(train_df, numerical_columns, compression=config.sketch_compression)
+            sketches = sketches.merge(
+                ColumnSketches.from_dataframe(test_df, numerical_columns, compression=config.sketch_compression)
+            )
+            sketches.save(config.sketch_file_path)
+            logging.info(f"Column sketches saved at: {config.sketch_file_path}")
+            return sketches
+        except Exception as e:
+            raise SensorException(e, sys)
 
-            # Step 2️⃣: Check number of columns in test
-            status = self.validate_number_of_columns(dataframe=test_dataframe)
-            if not status:
-                error_message = f"{error_message}Test dataframe does not contain all columns.\n"
+    # 🕰️ Kisi purane run ke sketches (baseline) ke against drift, purana raw data padhe bina
+    def detect_baseline_drift(self, current_sketches: ColumnSketches, baseline_sketch_file_path: str, threshold=None):
+        try:
+            config = self.data_validation_config
+            baseline_sketches = ColumnSketches.load(baseline_sketch_file_path)
+            drift_report = get_sketch_drift_report(
+                base=baseline_sketches,
+                current=current_sketches,
+                threshold=config.drift_threshold if threshold is None else threshold,
+            )
+            write_yaml_file(file_path=config.baseline_report_file_path, data=drift_report)
+            logging.info(f"Baseline drift report against {baseline_sketch_file_path} saved at: {config.baseline_report_file_path}")
+            return drift_report
+        except Exception as e:
+            raise SensorException(e, sys)
 
-            # Step 3️⃣: Check numerical columns in train
-            status = self.is_numerical_column_exist(dataframe=train_dataframe)
-            if not status:
-                error_message = f"{error_message}Train dataframe does not contain all numerical columns.\n"
 
-            # Step 4️⃣: Check numerical columns in test
-            status = self.is_numerical_column_exist(dataframe=test_dataframe)
-            if not status:
-                error_message = f"{error_message}Test dataframe does not contain all numerical columns.\n"
+    # 🚀 Ye main function hai jo pura data validation pipeline execute karta hai
+    def initiate_data_validation(self)->DataValidationArtifact:
+        try:
+            config = self.data_validation_config
+
+            # Train aur Test data bina cast kiye read karte hain, taaki non-numeric values row validation mein pakdi jaayein
+            def read_split(file_path):
+                dataframe = self._schema.read(file_path, cast=False)
+                # Ingested frame ab validated frame se replace ho jaayega, memory mein rakhne ki zarurat nahi
+                frame_store.discard(file_path)
+                return dataframe
+
+            # Step 1️⃣-4️⃣: Column count aur numerical columns check, har split ka apna error message
+            def check_columns(split_name, dataframe):
+                message = ""
+                if not self.validate_number_of_columns(dataframe=dataframe):
+                    message = f"{message}{split_name} dataframe does not contain all columns.\n"
+                if not self.is_numerical_column_exist(dataframe=dataframe):
+                    message = f"{message}{split_name} dataframe does not contain all numerical columns.\n"
+                return message
 
             # Agar koi bhi error mila toh raise kar denge
-            if len(error_message) > 0:
-                raise Exception(error_message)
-
-            # Step 5️⃣: Run data drift check
-            status = self.detect_dataset_drift(base_df=train_dataframe, current_df=test_dataframe)
-
-            # Step 6️⃣: Sab kuch sahi gaya toh ek DataValidationArtifact return karenge
+            def raise_column_errors(check_train, check_test):
+                error_message = check_train + check_test
+                if len(error_message) > 0:
+                    raise Exception(error_message)
+
+            # Step 5️⃣: Row level validation, good rows validated/ mein aur bad rows invalid/ mein
+            def write_row_report(rows_train, rows_test):
+                error_message = ""
+                reports = {"train": rows_train[1], "test": rows_test[1]}
+                write_yaml_file(file_path=config.validation_report_file_path, data=reports)
+                for split, report in (("Train", reports["train"]), ("Test", reports["test"])):
+                    if report["valid_rows"] == 0:
+                        error_message = f"{error_message}{split} dataframe has no valid rows.\n"
+                    if len(report["columns_over_null_limit"]) > 0:
+                        error_message = (f"{error_message}{split} dataframe columns over null ratio limit: "
+                                         f"{report['columns_over_null_limit']}\n")
+                if len(error_message) > 0:
+                    raise Exception(error_message)
+
+            # Step 7️⃣: Quantile sketches save karo, aur baseline diya ho toh uske against bhi drift check
+            def save_sketches(rows_train, rows_test, row_report):
+                sketches = self.build_column_sketches(train_df=rows_train[0], test_df=rows_test[0])
+                baseline_sketch_file_path = config.baseline_sketch_file_path
+                if baseline_sketch_file_path is not None and os.path.exists(baseline_sketch_file_path):
+                    self.detect_baseline_drift(current_sketches=sketches, baseline_sketch_file_path=baseline_sketch_file_path)
+
+            # Jo steps ek doosre pe depend nahi karte (train vs test, drift vs sketches) woh saath chalte hain
+            graph = TaskGraph("data_validation")
+            graph.add_task("read_train", lambda: read_split(self.data_ingestion_artifact.trained_file_path))
+            graph.add_task("read_test", lambda: read_split(self.data_ingestion_artifact.test_file_path))
+            graph.add_task("check_train", lambda read_train: check_columns("Train", read_train), inputs=["read_train"])
+            graph.add_task("check_test", lambda read_test: check_columns("Test", read_test), inputs=["read_test"])
+            graph.add_task("column_checks", raise_column_errors, inputs=["check_train", "check_test"])
+            graph.add_task("rows_train", lambda read_train, column_checks: self.validate_rows(
+                read_train, config.valid_train_file_path, config.invalid_train_file_path), inputs=["read_train", "column_checks"])
+            graph.add_task("rows_test", lambda read_test, column_checks: self.validate_rows(
+                read_test, config.valid_test_file_path, config.invalid_test_file_path), inputs=["read_test", "column_checks"])
+            graph.add_task("row_report", write_row_report, inputs=["rows_train", "rows_test"])
+            # Step 6️⃣: Run data drift check (sirf valid rows pe)
+            graph.add_task("drift", lambda rows_train, rows_test, row_report: self.detect_dataset_drift(
+                base_df=rows_train[0], current_df=rows_test[0]), inputs=["rows_train", "rows_test", "row_report"])
+            graph.add_task("sketches", save_sketches, inputs=["rows_train", "rows_test", "row_report"])
+            status = graph.run()["drift"]
+
+            # Step 8️⃣: Sab kuch sahi gaya toh ek DataValidationArtifact return karenge
             data_validation_artifact = DataValidationArtifact(
                 validation_status = status,
-                valid_train_file_path = self.data_ingestion_artifact.trained_file_path,
-                valid_test_file_path = self.data_ingestion_artifact.test_file_path,
-                invalid_train_file_path = None,
-                invalid_test_file_path = None,
+                valid_train_file_path = config.valid_train_file_path,
+                valid_test_file_path = config.valid_test_file_path,
+                invalid_train_file_path = config.invalid_train_file_path,
+                invalid_test_file_path = config.invalid_test_file_path,
                 drift_report_file_path = self.data_validation_config.drift_report_file_path,
+                sketch_file_path = self.data_validation_config.sketch_file_path,
             )
 
             # Final output ko log kar dete hain
@@ -5,11 +5,14 @@ from sensor.entity.config_entity import ModelEvaluationConfig
 import os, sys
 from sensor.ml.metric.classification_metric import get_classification_score
 from sensor.ml.model.estimator import SensorModel
+from sensor.ml.model.model_bundle import load_sensor_model
 from sensor.utils.main_utils import save_object, load_object, write_yaml_file
+from sensor.utils.schema import get_schema
+from sensor.pipeline.dag import TaskGraph
 from sensor.ml.model.estimator import ModelResolver
 from sensor.constant.training_pipeline import TARGET_COLUMN
 from sensor.ml.model.estimator import TargetValueMapping
-import pandas as pd
+import numpy as np
 
 class ModelEvaluation:
 
@@ -31,21 +34,22 @@ class ModelEvaluation:
             valid_train_file_path = self.data_validation_artifact.valid_train_file_path
             valid_test_file_path = self.data_validation_artifact.valid_test_file_path
 
-            # Train aur test data ko load karke ek hi dataframe mein combine kar diya
-            train_df = pd.read_csv(valid_train_file_path)
-            test_df = pd.read_csv(valid_test_file_path)
-            df = pd.concat([train_df, test_df])
+            # Naya train hua model: bundle ke files background mein load hone lagte hain, data padhte waqt hi
+            train_model_file_path = self.model_trainer_artifact.trained_model_file_path
+            train_model = load_sensor_model(train_model_file_path)
+
+            # Train aur test data load karte hain (isi run mein validation ke baad memory se, warna disk se).
+            # Dono ko concat nahi karte: har split pe alag predict karke sirf labels/predictions jodte hain.
+            schema = get_schema()
+            splits = [schema.read(valid_train_file_path), schema.read(valid_test_file_path)]
 
             # Target column ke string labels ko number mein convert kar diya (ex: pos → 1, neg → 0)
-            y_true = df[TARGET_COLUMN]
-            y_true.replace(TargetValueMapping().to_dict(), inplace=True)
+            y_true = np.concatenate([
+                split_df[TARGET_COLUMN].map(TargetValueMapping().to_dict()).astype(int).to_numpy() for split_df in splits
+            ])
 
             # Target column ko features se hata diya (kyunki prediction ke time pe target chahiye nahi hota)
-            df.drop(TARGET_COLUMN, axis=1, inplace=True)
-
-            # Naya train hua model ka path le kar us model ko load kar rahe hain
-            train_model_file_path = self.model_trainer_artifact.trained_model_file_path
-            train_model = load_object(file_path=train_model_file_path)
+            splits = [split_df.drop(columns=[TARGET_COLUMN]) for split_df in splits]
 
             # ModelResolver ka object banaya jo purana best model dhoondhne mein help karega
             model_resolver = ModelResolver()
@@ -66,11 +70,15 @@ class ModelEvaluation:
 
             # Agar purana model mila to uska path lekar usko bhi load kar rahe hain
             latest_model_path = model_resolver.get_best_model_path()
-            latest_model = load_object(file_path=latest_model_path)
+            latest_model = load_sensor_model(latest_model_path)
 
             # Dono models (naya aur purana) se same data pe prediction kar rahe hain
-            y_trained_pred = train_model.predict(df)
-            y_latest_pred = latest_model.predict(df)
+            # Candidate aur incumbent ek doosre se independent hain, isliye dono ke predictions saath chalte hain
+            graph = TaskGraph("model_evaluation")
+            graph.add_task("trained", lambda: np.concatenate([train_model.predict(split_df) for split_df in splits]))
+            graph.add_task("latest", lambda: np.concatenate([latest_model.predict(split_df) for split_df in splits]))
+            predictions = graph.run()
+            y_trained_pred, y_latest_pred = predictions["trained"], predictions["latest"]
 
             # Dono predictions ka performance score (F1-score) calculate kar rahe hain
             trained_metric = get_classification_score(y_true, y_trained_pred)
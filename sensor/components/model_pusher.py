@@ -21,19 +21,31 @@ class ModelPusher:
             raise SensorException(e, sys)
     
 
+    @staticmethod
+    def copy_model(trained_model_path: str, model_dir: str) -> str:
+        """
+        Model folder ki saari files (bundle: arrays, booster, trees) copy karta hai; model file (manifest.json)
+        sabse aakhir mein, taaki serving ko naya model tabhi dikhe jab uski saari files aa chuki hon
+        """
+        os.makedirs(model_dir, exist_ok=True)
+        trained_model_dir = os.path.dirname(trained_model_path)
+        for file_name in sorted(os.listdir(trained_model_dir)):
+            file_path = os.path.join(trained_model_dir, file_name)
+            if file_path != trained_model_path and os.path.isfile(file_path):
+                shutil.copy(src=file_path, dst=os.path.join(model_dir, file_name))
+        model_file_path = os.path.join(model_dir, os.path.basename(trained_model_path))
+        shutil.copy(src=trained_model_path, dst=model_file_path)
+        return model_file_path
+
     def initiate_model_pusher(self,)->ModelPusherArtifact:
         try:
             trained_model_path = self.model_eval_artifact.trained_model_path
             
             #Creating model pusher dir to save model
-            model_file_path = self.model_pusher_config.model_file_path
-            os.makedirs(os.path.dirname(model_file_path),exist_ok=True)
-            shutil.copy(src=trained_model_path, dst=model_file_path)
+            model_file_path = self.copy_model(trained_model_path, os.path.dirname(self.model_pusher_config.model_file_path))
 
             #saved model dir
-            saved_model_path = self.model_pusher_config.saved_model_path
-            os.makedirs(os.path.dirname(saved_model_path),exist_ok=True)
-            shutil.copy(src=trained_model_path, dst=saved_model_path)
+            saved_model_path = self.copy_model(trained_model_path, os.path.dirname(self.model_pusher_config.saved_model_path))
 
             #prepare artifact
             model_pusher_artifact = ModelPusherArtifact(saved_model_path=saved_model_path, model_file_path=model_file_path)
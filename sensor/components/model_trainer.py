@@ -8,6 +8,8 @@ import os,sys
 from xgboost import XGBClassifier
 from sensor.ml.metric.classification_metric import get_classification_score
 from sensor.ml.model.estimator import SensorModel
+from sensor.ml.model.hyperparameter_search import HyperparameterSearch
+from sensor.ml.model.model_bundle import save_model_bundle
 from sensor.utils.main_utils import save_object,load_object
 class ModelTrainer:
 
@@ -19,12 +21,48 @@ class ModelTrainer:
         except Exception as e:
             raise SensorException(e,sys)
 
-    def perform_hyper_paramter_tunig(self):...
+    def perform_hyper_paramter_tunig(self, x_source, y_source):
+        """
+        Random search + successive halving (HyperparameterSearch) train data ke validation fold pe.
+        x_source / y_source: SMOTETomek se pehle wale transformed train ke .npy paths ya arrays; search validation
+        fold alag karke sirf train fold ko resample karti hai.
+        Best trial ke params aur early stopping wala n_estimators return, ya None (tuning band / budget mein kuch nahi)
+        """
+        try:
+            config = self.model_trainer_config
+            if not config.tuning_enabled:
+                return None
+            search = HyperparameterSearch(
+                trials_file_path=config.tuning_trials_file_path,
+                search_space=config.tuning_search_space,
+                n_trials=config.tuning_n_trials,
+                min_estimators=config.tuning_min_estimators,
+                max_estimators=config.tuning_max_estimators,
+                reduction_factor=config.tuning_reduction_factor,
+                early_stopping_rounds=config.tuning_early_stopping_rounds,
+                valid_fraction=config.tuning_valid_fraction,
+                time_budget_seconds=config.tuning_time_budget_seconds,
+                max_workers=config.tuning_max_workers,
+                trial_nthread=config.tuning_trial_nthread,
+                random_state=config.tuning_random_state,
+                resample=True,
+            )
+            best = search.search(x_source, y_source)
+            if best is None:
+                logging.info("Hyperparameter search finished no trial within its budget, using default parameters")
+                return None
+            return {**best["params"], "n_estimators": best["best_iteration"] + 1}
+        except Exception as e:
+            raise SensorException(e, sys)
     
 
-    def train_model(self,x_train,y_train):
+    def train_model(self,x_train,y_train,params=None):
         try:
-            xgb_clf = XGBClassifier()
+            # params: tuning ke best params (n_estimators samet); final model poore train data pe fit hota hai
+            if params:
+                xgb_clf = XGBClassifier(**params, random_state=self.model_trainer_config.tuning_random_state)
+            else:
+                xgb_clf = XGBClassifier()
             xgb_clf.fit(x_train,y_train)
             return xgb_clf
         except Exception as e:
@@ -32,21 +70,30 @@ class ModelTrainer:
     
     def initiate_model_trainer(self)->ModelTrainerArtifact:
         try:
-            train_file_path = self.data_transformation_artifact.transformed_train_file_path
-            test_file_path = self.data_transformation_artifact.transformed_test_file_path
+            artifact = self.data_transformation_artifact
 
             #loading training array and testing array
-            train_arr = load_numpy_array_data(train_file_path)
-            test_arr = load_numpy_array_data(test_file_path)
-
-            x_train, y_train, x_test, y_test = (
-                train_arr[:, :-1],
-                train_arr[:, -1],
-                test_arr[:, :-1],
-                test_arr[:, -1],
-            )
+            # X (float32) aur y (int8) alag contiguous files hain: mmap se padhte hain, RAM mein poora copy nahi
+            # aur slicing wale non-contiguous views bhi nahi jinhe XGBoost dobara copy karta
+            x_train = load_numpy_array_data(artifact.transformed_train_file_path, mmap_mode="r")
+            x_test = load_numpy_array_data(artifact.transformed_test_file_path, mmap_mode="r")
+            if artifact.transformed_train_target_file_path is not None:
+                y_train = load_numpy_array_data(artifact.transformed_train_target_file_path, mmap_mode="r")
+                y_test = load_numpy_array_data(artifact.transformed_test_target_file_path, mmap_mode="r")
+            else:
+                # Purane runs ka artifact (X aur y ek hi array mein, aakhri column target)
+                x_train, y_train = x_train[:, :-1], x_train[:, -1]
+                x_test, y_test = x_test[:, :-1], x_test[:, -1]
 
-            model = self.train_model(x_train, y_train)
+            if artifact.transformed_train_unsampled_file_path is not None:
+                # Search ko files ke paths milte hain, folds .npy mein bante hain aur workers unhe mmap karte hain
+                params = self.perform_hyper_paramter_tunig(artifact.transformed_train_unsampled_file_path,
+                                                           artifact.transformed_train_unsampled_target_file_path)
+            else:
+                # Purane artifact mein sirf resampled train hai; us pe validation fold leak karta, isliye tuning nahi
+                logging.info("No un-resampled train arrays in the transformation artifact, skipping tuning")
+                params = None
+            model = self.train_model(x_train, y_train, params=params)
             y_train_pred = model.predict(x_train)
             classification_train_metric =  get_classification_score(y_true=y_train, y_pred=y_train_pred)
             
@@ -68,13 +115,19 @@ class ModelTrainer:
             model_dir_path = os.path.dirname(self.model_trainer_config.trained_model_file_path)
             os.makedirs(model_dir_path,exist_ok=True)
             sensor_model = SensorModel(preprocessor=preprocessor,model=model)
-            save_object(self.model_trainer_config.trained_model_file_path, obj=sensor_model)
+            # Pickle ki jagah model bundle: native booster, preprocessing arrays, trees aur manifest
+            save_model_bundle(model_dir_path, sensor_model, metrics={
+                "train": classification_train_metric.__dict__,
+                "test": classification_test_metric.__dict__,
+            })
 
             #model trainer artifact
 
             model_trainer_artifact = ModelTrainerArtifact(trained_model_file_path=self.model_trainer_config.trained_model_file_path, 
             train_metric_artifact=classification_train_metric,
-            test_metric_artifact=classification_test_metric)
+            test_metric_artifact=classification_test_metric,
+            trained_tree_ensemble_file_path=self.model_trainer_config.trained_tree_ensemble_file_path,
+            tuning_trials_file_path=self.model_trainer_config.tuning_trials_file_path if params else None)
             logging.info(f"Model trainer artifact: {model_trainer_artifact}")
             return model_trainer_artifact
         except Exception as e:
@@ -1,2 +1,9 @@
 APP_HOST = "0.0.0.0"
-APP_PORT = 8080
\ No newline at end of file
+APP_PORT = 8080
+MODEL_CACHE_POLL_INTERVAL_SECONDS: float = 5.0
+PREDICTION_CHUNK_SIZE: int = 10000
+PREDICTION_COLUMN_NAME: str = "predicted_column"
+MICRO_BATCH_MAX_SIZE: int = 256
+MICRO_BATCH_MAX_WAIT_MS: float = 5.0
+MICRO_BATCH_MAX_QUEUE_SIZE: int = 10000
+MODEL_SERVING_PREDICTOR: str = "native"
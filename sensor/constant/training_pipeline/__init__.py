@@ -2,6 +2,20 @@ import os
 
 
 SAVED_MODEL_DIR =os.path.join("saved_models")
+FEATURE_STORE_DIR = os.path.join("feature_store")
+STAGE_CACHE_DIR = os.path.join("stage_cache")
+STAGE_CACHE_ENABLED: bool = True
+STAGE_CACHE_MAX_SIZE_BYTES: int = 5 * 1024 ** 3
+PIPELINE_CHECKPOINT_FILE_NAME: str = "checkpoint.yaml"
+PIPELINE_CHECKPOINT_DIR: str = "checkpoints"
+PIPELINE_MAX_WORKERS: int = None
+PIPELINE_TIMING_REPORT_FILE_NAME: str = "timing_report.yaml"
+PIPELINE_RUN_ID_FORMAT: str = "%m_%d_%Y_%H_%M_%S"
+PIPELINE_RUN_ID_PATTERN: str = r"^\d{2}_\d{2}_\d{4}_\d{2}_\d{2}_\d{2}$"
+TRAINING_JOB_DIR = os.path.join("training_jobs")
+TRAINING_JOB_LOCK_FILE_NAME: str = "train.lock"
+TRAINING_JOB_SLOT_FILE_NAME: str = "train.slot"
+TRAINING_JOB_ID_PATTERN: str = r"^[0-9a-f]{32}$"
 
 # defining common constant variable for training pipeline
 
@@ -11,15 +25,26 @@ COLLECTION_NAME = "sensor1-Data"
 TARGET_COLUMN = "class"
 PIPELINE_NAME: str = "sensor"
 ARTIFACT_DIR: str = "artifact"
-FILE_NAME: str = "sensor.csv"
+FILE_NAME: str = "sensor.parquet"
 
-TRAIN_FILE_NAME: str = "train.csv"
-TEST_FILE_NAME: str = "test.csv"
+TRAIN_FILE_NAME: str = "train.parquet"
+TEST_FILE_NAME: str = "test.parquet"
 
 PREPROCSSING_OBJECT_FILE_NAME = "preprocessing.pkl"
 MODEL_FILE_NAME = "model.pkl"
+MODEL_PREDICT_NTHREAD: int = None
+TREE_ENSEMBLE_FILE_NAME: str = "model_trees.npz"
+TREE_ENSEMBLE_BATCH_SIZE: int = 4096
+MODEL_BUNDLE_FORMAT_VERSION: int = 1
+MODEL_BUNDLE_MANIFEST_FILE_NAME: str = "manifest.json"
+MODEL_BUNDLE_BOOSTER_FILE_NAME: str = "booster.ubj"
+MODEL_BUNDLE_PREPROCESSING_FILE_NAME: str = "preprocessing.npz"
+MODEL_BUNDLE_LOAD_WORKERS: int = 4
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 SCHEMA_DROP_COLS = "drop_columns"
+SCHEMA_NA_TOKENS: list = ["na"]
+SCHEMA_NUMERIC_DTYPE: str = "float32"
+SCHEMA_NOT_NUMERIC_COLUMN: str = "_not_numeric"
 
 
 """
@@ -30,6 +55,17 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATION: float = 0.2
+DATA_INGESTION_SPLIT_RANDOM_STATE: int = 42
+DATA_INGESTION_EXPORT_CHUNK_SIZE: int = 10000
+DATA_INGESTION_EXPORT_QUERY: dict = None
+DATA_INGESTION_EXPORT_PARTITIONS: int = 1
+DATA_INGESTION_EXPORT_PARTITION_KEY: str = "_id"
+DATA_INGESTION_EXPORT_PREFETCH_CHUNKS: int = 2
+DATA_INGESTION_INCREMENTAL: bool = True
+DATA_INGESTION_WATERMARK_KEY: str = "_id"
+DATA_INGESTION_WATERMARK_SAFETY_WINDOW_SECONDS: int = 600
+DATA_INGESTION_WATERMARK_KEYS_PER_QUERY: int = 50000
+DATA_INGESTION_EXPORT_CSV: bool = False
 
 
 """
@@ -41,6 +77,17 @@ DATA_VALIDATION_VALID_DIR: str = "validated"
 DATA_VALIDATION_INVALID_DIR: str = "invalid"
 DATA_VALIDATION_DRIFT_REPORT_DIR: str = "drift_report"
 DATA_VALIDATION_DRIFT_REPORT_FILE_NAME: str = "report.yaml"
+DATA_VALIDATION_REPORT_FILE_NAME: str = "validation_report.yaml"
+DATA_VALIDATION_DRIFT_METHOD: str = "auto"
+DATA_VALIDATION_DRIFT_THRESHOLD: float = 0.05
+DATA_VALIDATION_DRIFT_PSI_THRESHOLD: float = 0.2
+DATA_VALIDATION_DRIFT_BINS: int = 100
+DATA_VALIDATION_DRIFT_BINNED_MIN_ROWS: int = 1_000_000
+DATA_VALIDATION_DRIFT_MAX_WORKERS: int = None
+DATA_VALIDATION_SKETCH_FILE_NAME: str = "sketches.npz"
+DATA_VALIDATION_SKETCH_COMPRESSION: int = 1000
+DATA_VALIDATION_BASELINE_SKETCH_FILE_PATH: str = None
+DATA_VALIDATION_BASELINE_REPORT_FILE_NAME: str = "baseline_report.yaml"
 
 
 """
@@ -50,6 +97,11 @@ Data Transformation ralated constant start with DATA_TRANSFORMATION VAR NAME
 DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
 DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
 DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR: str = "transformed_object"
+DATA_TRANSFORMATION_FEATURE_FILE_SUFFIX: str = "_x.npy"
+DATA_TRANSFORMATION_TARGET_FILE_SUFFIX: str = "_y.npy"
+DATA_TRANSFORMATION_UNSAMPLED_FILE_SUFFIX: str = "_unsampled"
+DATA_TRANSFORMATION_FEATURE_DTYPE: str = "float32"
+DATA_TRANSFORMATION_TARGET_DTYPE: str = "int8"
 
 """
 Model Trainer ralated constant start with MODE TRAINER VAR NAME
@@ -60,6 +112,27 @@ MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD: float = 0.05
+MODEL_TRAINER_TUNING_ENABLED: bool = True
+MODEL_TRAINER_TUNING_DIR: str = "tuning"
+MODEL_TRAINER_TUNING_TRIALS_FILE_NAME: str = "trials.yaml"
+MODEL_TRAINER_TUNING_SEARCH_SPACE: dict = {
+    "learning_rate": ["log_uniform", 0.01, 0.3],
+    "max_depth": ["int", 3, 10],
+    "min_child_weight": ["log_uniform", 1.0, 20.0],
+    "subsample": ["uniform", 0.5, 1.0],
+    "colsample_bytree": ["uniform", 0.5, 1.0],
+    "reg_lambda": ["log_uniform", 0.001, 10.0],
+}
+MODEL_TRAINER_TUNING_N_TRIALS: int = 27
+MODEL_TRAINER_TUNING_MIN_ESTIMATORS: int = 50
+MODEL_TRAINER_TUNING_MAX_ESTIMATORS: int = 450
+MODEL_TRAINER_TUNING_REDUCTION_FACTOR: int = 3
+MODEL_TRAINER_TUNING_EARLY_STOPPING_ROUNDS: int = 20
+MODEL_TRAINER_TUNING_VALID_FRACTION: float = 0.2
+MODEL_TRAINER_TUNING_TIME_BUDGET_SECONDS: float = 1800
+MODEL_TRAINER_TUNING_MAX_WORKERS: int = None
+MODEL_TRAINER_TUNING_TRIAL_NTHREAD: int = None
+MODEL_TRAINER_TUNING_RANDOM_STATE: int = 42
 
 """
 Model Evaluation ralated constant start with MODE Evaluation VAR NAME
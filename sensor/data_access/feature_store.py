@@ -0,0 +1,176 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pandas as pd
+from bson import ObjectId
+
+from sensor.exception import SensorException
+from sensor.logger import logging
+from sensor.utils.main_utils import read_dataframe, read_yaml_file, write_dataframe, write_yaml_file
+
+
+class FeatureStore:
+    """
+    Persistent, versioned feature store jo runs ke beech bana rehta hai.
+    Har ingestion sirf naye documents ka ek part file likhta hai; manifest.yaml mein
+    versions ki list aur last watermark (jahan tak ka data aa chuka hai) save hota hai.
+    ObjectId monotonic nahi hote (har client apna banata hai), isliye watermark ke neeche ki ek safety window
+    ki saari keys bhi ek sidecar file mein rehti hain: agla run us window ko dobara scan karke sirf wahi
+    documents laata hai jo tab tak nahi aaye the (der se insert hue), baaki _id se de-duplicate ho jaate hain.
+    Manifest mein source (count, min/max key) bhi rehta hai; source se mel na khaye (collection khaali hui,
+    dobara load hui, documents delete hue) to reset() se nayi store full export se banti hai.
+    """
+
+    def __init__(self, feature_store_dir: str, watermark_key: str = "_id", manifest_file_name: str = "manifest.yaml"):
+        try:
+            self.feature_store_dir = feature_store_dir
+            self.watermark_key = watermark_key
+            self.manifest_file_path = os.path.join(feature_store_dir, manifest_file_name)
+            self.manifest = self._read_manifest()
+            self._stale_file_names = []
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def _new_manifest(self) -> dict:
+        return {"watermark_key": self.watermark_key, "watermark": None, "watermark_type": None, "versions": []}
+
+    def _read_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_file_path):
+            return self._new_manifest()
+        manifest = read_yaml_file(self.manifest_file_path)
+        if manifest.get("watermark_key") != self.watermark_key:
+            raise Exception(f"Feature store at {self.feature_store_dir} is keyed on "
+                            f"'{manifest.get('watermark_key')}', not '{self.watermark_key}'")
+        return manifest
+
+    @property
+    def versions(self) -> list:
+        return self.manifest["versions"]
+
+    @property
+    def committed_rows(self) -> int:
+        return sum(int(version["rows"]) for version in self.versions)
+
+    @property
+    def source(self) -> dict:
+        """Pichle commit ke waqt source collection: count, min_key, max_key (purane manifest mein khaali)."""
+        return self.manifest.get("source") or {}
+
+    def reset(self) -> None:
+        """
+        Nayi khaali store shuru karta hai (agla commit full export hoga). Purani files tab tak disk pe rehti hain
+        jab tak naya manifest commit na ho, taaki beech mein fail hone par purani store hi bani rahe.
+        """
+        self._stale_file_names = [version["file_name"] for version in self.versions]
+        if self.manifest.get("window_keys_file") is not None:
+            self._stale_file_names.append(self.manifest["window_keys_file"])
+        self.manifest = self._new_manifest()
+
+    def get_watermark(self):
+        """Last ingested watermark value, MongoDB query mein use karne layak type mein."""
+        watermark = self.manifest["watermark"]
+        if watermark is not None and self.manifest.get("watermark_type") == "objectid":
+            return ObjectId(watermark)
+        return watermark
+
+    def new_part_file_path(self, version: str) -> str:
+        return os.path.join(self.feature_store_dir, f"part-{version}.parquet")
+
+    @staticmethod
+    def window_lower_bound(watermark, window_seconds: float):
+        """
+        Watermark se window_seconds pehle wali key (exclusive lower bound): ObjectId ke timestamp ya datetime pe.
+        Kisi aur type ki key ya window 0 ho to None (safety window nahi).
+        """
+        if watermark is None or not window_seconds or window_seconds <= 0:
+            return None
+        if isinstance(watermark, ObjectId):
+            return ObjectId.from_datetime(watermark.generation_time - timedelta(seconds=window_seconds))
+        if isinstance(watermark, datetime):
+            return watermark - timedelta(seconds=window_seconds)
+        return None
+
+    def get_window_keys(self) -> Optional[set]:
+        """
+        Pichle commit ki safety window ki keys (str), jo feature store mein aa chuki hain.
+        None: window keys kabhi save hi nahi hui (purana feature store), watermark tak sab aaya hua maano.
+        """
+        try:
+            window_file_name = self.manifest.get("window_keys_file")
+            if window_file_name is None:
+                return None
+            return set(read_dataframe(os.path.join(self.feature_store_dir, window_file_name))["key"].astype(str))
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def commit_version(self, version: str, part_file_path: str, number_of_rows: int, watermark,
+                       window_keys: Optional[list] = None, source: Optional[dict] = None) -> None:
+        """
+        Part file poori likhne ke baad hi manifest update karte hain, taaki beech mein fail hone par
+        watermark aage na badhe aur adhoora part kabhi padha na jaaye.
+        window_keys: naye watermark ki safety window ki saari keys; inki sidecar file bhi isi manifest
+        replace ke saath hi commit hoti hai.
+        source: export ke waqt source collection ka count aur min/max key, agle run ke consistency check ke liye.
+        """
+        try:
+            previous_window_file_name = self.manifest.get("window_keys_file")
+            if window_keys is not None:
+                window_file_name = f"window-{version}.parquet"
+                write_dataframe(os.path.join(self.feature_store_dir, window_file_name),
+                                pd.DataFrame({"key": [str(key) for key in window_keys]}))
+                self.manifest["window_keys_file"] = window_file_name
+
+            if isinstance(watermark, ObjectId):
+                watermark_value, watermark_type = str(watermark), "objectid"
+            else:
+                watermark_value, watermark_type = watermark, type(watermark).__name__
+
+            self.manifest["versions"].append({
+                "version": version,
+                "file_name": os.path.basename(part_file_path),
+                "rows": int(number_of_rows),
+                "watermark": watermark_value,
+                "created_at": datetime.now().isoformat(),
+            })
+            self.manifest["watermark"] = watermark_value
+            self.manifest["watermark_type"] = watermark_type
+            if source is not None:
+                self.manifest["source"] = source
+
+            temp_manifest_path = f"{self.manifest_file_path}.tmp"
+            write_yaml_file(temp_manifest_path, self.manifest)
+            os.replace(temp_manifest_path, self.manifest_file_path)
+            if previous_window_file_name not in (None, self.manifest.get("window_keys_file")):
+                os.remove(os.path.join(self.feature_store_dir, previous_window_file_name))
+            # reset() ke baad purani store ki files ab kisi manifest mein nahi hain
+            for stale_file_name in self._stale_file_names:
+                stale_file_path = os.path.join(self.feature_store_dir, stale_file_name)
+                if os.path.exists(stale_file_path):
+                    os.remove(stale_file_path)
+            self._stale_file_names = []
+            logging.info(f"Feature store version {version} committed with {number_of_rows} rows, watermark {watermark_value}")
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def part_files(self) -> dict:
+        """Committed part files (version order mein) aur unki row count, bina data padhe."""
+        return {os.path.join(self.feature_store_dir, version["file_name"]): int(version["rows"])
+                for version in self.versions}
+
+    def read_all(self, columns: Optional[list] = None) -> pd.DataFrame:
+        """Saare committed versions ko ek DataFrame mein padhta hai (version order mein)."""
+        try:
+            frames = []
+            for version in self.versions:
+                part_file_path = os.path.join(self.feature_store_dir, version["file_name"])
+                frame = read_dataframe(part_file_path)
+                if columns is not None:
+                    frame = frame.reindex(columns=columns)
+                frames.append(frame)
+            if len(frames) == 0:
+                return pd.DataFrame(columns=columns)
+            return pd.concat(frames, ignore_index=True)
+        except Exception as e:
+            raise SensorException(e, sys)
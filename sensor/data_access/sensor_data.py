@@ -1,12 +1,21 @@
+import copy
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
 
-import numpy as np
 import pandas as pd
-import json
+from pymongo.errors import OperationFailure
 from sensor.configuration.mongo_db_connection import MongoDBClient
-from sensor.constant.training_pipeline import DATABASE_NAME
+from sensor.constant.training_pipeline import DATABASE_NAME, DATA_INGESTION_EXPORT_PREFETCH_CHUNKS
 from sensor.exception import SensorException
+from sensor.logger import logging
+
+# Partition worker ka queue pe aakhri item: is partition ke saare chunks aa gaye
+_PARTITION_DONE = object()
+
 
 class SensorData:
     """
@@ -23,40 +32,302 @@ class SensorData:
             raise SensorException(e,sys)
         
     
-    def save_csv_file(self,file_path,collection_name:str,database_name:Optional[str]=None):                      #firstly save data to mangodb 
+    def save_csv_file(self, file_path, collection_name: str, database_name: Optional[str] = None,
+                      chunk_size: int = 10000, max_workers: int = 4) -> int:          #firstly save data to mangodb
+        """
+        CSV ko chunks mein padh kar MongoDB mein bulk load karta hai.
+        Har chunk se seedha documents bante hain (JSON round-trip nahi) aur unordered insert_many batches
+        ek chhote thread pool se jaate hain. Memory mein ek waqt pe sirf kuch hi chunks rehte hain.
+        """
         try:
-            data_frame = pd.read_csv(file_path)
-            data_frame.reset_index(drop=True,inplace=True)
-            records = list(json.loads(data_frame.T.to_json()).values())
-            if database_name is None:
-                collection = self.mongo_client.database[collection_name]
-            else:
-                collection = self.mongo_client[database_name][collection_name]
-            collection.insert_many(records)
-            return len(records)
+            collection = self._get_collection(collection_name, database_name)
+
+            def insert_chunk(records: list) -> int:
+                collection.insert_many(records, ordered=False)
+                return len(records)
+
+            start_time = time.perf_counter()
+            number_of_records = 0
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = set()
+                for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+                    records = chunk.astype(object).where(chunk.notna(), None).to_dict(orient="records")
+                    pending.add(executor.submit(insert_chunk, records))
+
+                    # In-flight batches ko max_workers ke do guna tak hi rakhte hain
+                    if len(pending) >= 2 * max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        number_of_records += sum(future.result() for future in done)
+
+                number_of_records += sum(future.result() for future in pending)
+
+            elapsed = time.perf_counter() - start_time
+            docs_per_second = number_of_records / elapsed if elapsed > 0 else float("inf")
+            logging.info(f"Inserted {number_of_records} documents into {collection.full_name} "
+                         f"in {elapsed:.2f}s ({docs_per_second:.0f} docs/sec)")
+            return number_of_records
         except Exception as e:
             raise SensorException(e,sys)
         
-    def export_collection_as_dataframe(self, collection_name: str, database_name: Optional[str] = None) -> pd.DataFrame:
+    def export_collection_as_chunks(self, collection_name: str, chunk_size: int = 10000,
+                                    database_name: Optional[str] = None,
+                                    projection: Optional[dict] = None,
+                                    query: Optional[dict] = None,
+                                    pipeline: Optional[list] = None) -> Iterator[pd.DataFrame]:
+        """
+        Collection ko fixed-size DataFrame chunks mein stream karta hai.
+        Cursor ka batch_size bhi chunk_size hi rakha hai, isliye memory sirf ek chunk jitni lagti hai,
+        poore collection jitni nahi.
+
+        projection: MongoDB projection, taaki drop kiye jaane wale fields server se aaye hi nahi
+        query: server-side filter ($match jaisa)
+        pipeline: extra aggregation stages; diya ho to find ki jagah aggregate chalega
+        """
         try:
-            if database_name is None:
-                collection = self.mongo_client.database[collection_name]
-            else:
-                collection = self.mongo_client[database_name][collection_name]
-            
+            collection = self._get_collection(collection_name, database_name)
+
             print(f"Connected to collection: {collection.full_name}")
-            documents = list(collection.find())
-            print(f"Number of documents fetched: {len(documents)}")
-    
-            df = pd.DataFrame(documents)
-    
-            if "_id" in df.columns:
-                df.drop("_id", axis=1, inplace=True)
-    
+            if pipeline is not None:
+                stages = list(pipeline)
+                if query:
+                    stages.insert(0, {"$match": query})
+                if projection:
+                    stages.append({"$project": projection})
+                cursor = collection.aggregate(stages, batchSize=chunk_size)
+            else:
+                cursor = collection.find(query or {}, projection=projection, batch_size=chunk_size)
+
+            total_documents = 0
+            documents = []
+            for document in cursor:
+                documents.append(document)
+                if len(documents) == chunk_size:
+                    total_documents += len(documents)
+                    yield self._documents_to_dataframe(documents)
+                    documents = []
+
+            if len(documents) > 0:
+                total_documents += len(documents)
+                yield self._documents_to_dataframe(documents)
+
+            print(f"Number of documents fetched: {total_documents}")
+        except Exception as e:
+            print("MongoDB se data nikalte waqt error aaya:", e)
+            raise SensorException(e, sys)
+
+    def _get_collection(self, collection_name: str, database_name: Optional[str] = None):
+        if database_name is None:
+            return self.mongo_client.database[collection_name]
+        return self.mongo_client.client[database_name][collection_name]
+
+    def get_max_key(self, collection_name: str, key: str = "_id", database_name: Optional[str] = None,
+                    query: Optional[dict] = None):
+        """Collection (ya query) mein key ki sabse badi value; collection khaali ho to None."""
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            for document in collection.find(query or {}, projection={key: 1}).sort(key, -1).limit(1):
+                return document.get(key)
+            return None
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def get_min_key(self, collection_name: str, key: str = "_id", database_name: Optional[str] = None,
+                    query: Optional[dict] = None):
+        """Collection (ya query) mein key ki sabse chhoti value; collection khaali ho to None."""
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            for document in collection.find(query or {}, projection={key: 1}).sort(key, 1).limit(1):
+                return document.get(key)
+            return None
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def get_keys(self, collection_name: str, key: str = "_id", lower=None, upper=None,
+                 database_name: Optional[str] = None, query: Optional[dict] = None) -> list:
+        """(lower, upper] range ki saari key values, sorted; sirf key field padhi jaati hai (index-only scan)."""
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            key_range = {}
+            if lower is not None:
+                key_range["$gt"] = lower
+            if upper is not None:
+                key_range["$lte"] = upper
+            conditions = ([query] if query else []) + ([{key: key_range}] if key_range else [])
+            key_query = {"$and": conditions} if len(conditions) > 1 else (conditions[0] if conditions else {})
+            return [document[key] for document in collection.find(key_query, projection={key: 1}).sort(key, 1)]
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def get_collection_signature(self, collection_name: str, key: str = "_id", database_name: Optional[str] = None,
+                                 query: Optional[dict] = None) -> dict:
+        """Document count aur key ki min/max value: collection (ya query) ka data badla ya nahi, yeh batane ke liye."""
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            min_key = self.get_min_key(collection_name, key=key, database_name=database_name, query=query)
+            max_key = self.get_max_key(collection_name, key=key, database_name=database_name, query=query)
+            return {"count": int(collection.count_documents(query or {})), "min_key": str(min_key),
+                    "max_key": str(max_key)}
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def get_partition_boundaries(self, collection_name: str, n_partitions: int,
+                                 partition_key: str = "_id", database_name: Optional[str] = None,
+                                 query: Optional[dict] = None) -> list:
+        """
+        Sorted partition_key values jo collection ko lagbhag barabar size ke n_partitions ranges mein baatte hain.
+        Server pe ek hi $bucketAuto aggregation (har boundary ke liye sort + skip nahi); jo server/mock
+        $bucketAuto na chala sake wahan sirf key field ka ek sorted scan. Dono deterministic hain.
+        """
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            query = query or {}
+            if n_partitions <= 1:
+                return []
+            try:
+                stages = ([{"$match": query}] if query else []) + [
+                    {"$bucketAuto": {"groupBy": f"${partition_key}", "buckets": n_partitions}}]
+                # Har bucket ka min inclusive hai, isliye pehle bucket ke baad wale mins hi range boundaries hain
+                boundaries = [bucket["_id"]["min"] for bucket in collection.aggregate(stages)][1:]
+            except (NotImplementedError, OperationFailure) as e:
+                logging.info(f"$bucketAuto not available ({e}), computing partition boundaries with a key scan")
+                boundaries = self._scan_partition_boundaries(collection, n_partitions, partition_key, query)
+            return [value for index, value in enumerate(boundaries) if index == 0 or boundaries[index - 1] != value]
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    @staticmethod
+    def _scan_partition_boundaries(collection, n_partitions: int, partition_key: str, query: dict) -> list:
+        # Sirf key field ka ek sorted pass: har (N / n_partitions) waan document ek boundary
+        total_documents = collection.count_documents(query)
+        n_partitions = max(1, min(n_partitions, total_documents))
+        positions = {i * total_documents // n_partitions for i in range(1, n_partitions)}
+        cursor = collection.find(query, projection={partition_key: 1}).sort(partition_key, 1)
+        return [document[partition_key] for position, document in enumerate(cursor) if position in positions]
+
+    def _iter_partition(self, collection_name: str, partition_key: str, lower, upper,
+                        chunk_size: int, database_name: Optional[str],
+                        projection: Optional[dict], query: Optional[dict]) -> Iterator[pd.DataFrame]:
+        """Ek key range [lower, upper) ke chunks (har ek <= chunk_size rows), key order mein"""
+        # Har worker thread ki apni copy: driver (ya mongomock) query/projection dict ko badal sakta hai
+        projection = copy.deepcopy(projection)
+        query = copy.deepcopy(query)
+        key_range = {}
+        if lower is not None:
+            key_range["$gte"] = lower
+        if upper is not None:
+            key_range["$lt"] = upper
+
+        conditions = [query] if query else []
+        if key_range:
+            conditions.append({partition_key: key_range})
+        partition_query = {"$and": conditions} if len(conditions) > 1 else (conditions[0] if conditions else {})
+
+        collection = self._get_collection(collection_name, database_name)
+        cursor = collection.find(partition_query, projection=projection, batch_size=chunk_size).sort(partition_key, 1)
+        documents = []
+        for document in cursor:
+            documents.append(document)
+            if len(documents) == chunk_size:
+                yield self._documents_to_dataframe(documents)
+                documents = []
+        if len(documents) > 0:
+            yield self._documents_to_dataframe(documents)
+
+    def export_collection_in_partitions(self, collection_name: str, n_partitions: int,
+                                        partition_key: str = "_id", max_workers: Optional[int] = None,
+                                        chunk_size: int = 10000, database_name: Optional[str] = None,
+                                        projection: Optional[dict] = None,
+                                        query: Optional[dict] = None,
+                                        prefetch_chunks: int = DATA_INGESTION_EXPORT_PREFETCH_CHUNKS) -> Iterator[pd.DataFrame]:
+        """
+        Collection ko partition_key ke ranges mein baant kar har range parallel mein fetch karta hai
+        (MongoDBClient ka pooled client threads ke beech share hota hai).
+        Chunks partition order mein yield hote hain aur har partition andar se key pe sorted hai, isliye rows
+        ka order deterministic rehta hai. Har partition ka worker sirf prefetch_chunks chunks aage rakhta hai
+        (bounded queue), isliye memory (workers x prefetch_chunks) chunks jitni hai, poore collection jitni nahi.
+        """
+        try:
+            boundaries = self.get_partition_boundaries(
+                collection_name, n_partitions, partition_key=partition_key,
+                database_name=database_name, query=query
+            )
+            lowers = [None] + boundaries
+            uppers = boundaries + [None]
+            print(f"Exporting {collection_name} in {len(lowers)} partitions on key '{partition_key}'")
+
+            stop = threading.Event()
+            queues = [queue.Queue(maxsize=max(1, prefetch_chunks)) for _ in lowers]
+
+            def put(partition_queue: queue.Queue, item) -> bool:
+                # Consumer ruk gaya (error / generator band) to worker bhi ruk jaaye, hamesha block na rahe
+                while not stop.is_set():
+                    try:
+                        partition_queue.put(item, timeout=0.1)
+                        return True
+                    except queue.Full:
+                        continue
+                return False
+
+            def fetch(index: int) -> None:
+                try:
+                    for chunk in self._iter_partition(collection_name, partition_key, lowers[index], uppers[index],
+                                                      chunk_size, database_name, projection, query):
+                        if not put(queues[index], chunk):
+                            return
+                    put(queues[index], _PARTITION_DONE)
+                except BaseException as e:
+                    put(queues[index], e)
+
+            # Pool FIFO hai: partition i hamesha i+1 se pehle shuru hota hai, isliye order mein padhne se deadlock nahi
+            executor = ThreadPoolExecutor(max_workers=max_workers or len(lowers))
+            try:
+                for index in range(len(lowers)):
+                    executor.submit(fetch, index)
+                for partition_queue in queues:
+                    while True:
+                        item = partition_queue.get()
+                        if item is _PARTITION_DONE:
+                            break
+                        if isinstance(item, BaseException):
+                            raise item
+                        yield item
+            finally:
+                stop.set()
+                executor.shutdown(wait=True, cancel_futures=True)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    @staticmethod
+    def _documents_to_dataframe(documents: list) -> pd.DataFrame:
+        df = pd.DataFrame(documents)
+        if "_id" in df.columns:
+            df.drop("_id", axis=1, inplace=True)
+        return df
+
+    def export_collection_as_dataframe(self, collection_name: str, database_name: Optional[str] = None,
+                                       chunk_size: int = 10000, projection: Optional[dict] = None,
+                                       query: Optional[dict] = None,
+                                       pipeline: Optional[list] = None,
+                                       n_partitions: int = 1) -> pd.DataFrame:
+        try:
+            if n_partitions > 1 and pipeline is None:
+                chunks = list(self.export_collection_in_partitions(
+                    collection_name=collection_name, n_partitions=n_partitions, chunk_size=chunk_size,
+                    database_name=database_name, projection=projection, query=query
+                ))
+            else:
+                chunks = list(self.export_collection_as_chunks(
+                    collection_name=collection_name, chunk_size=chunk_size, database_name=database_name,
+                    projection=projection, query=query, pipeline=pipeline
+                ))
+            if len(chunks) == 0:
+                return pd.DataFrame()
+
+            df = pd.concat(chunks, ignore_index=True)
+
             print("First 5 rows:")
             print(df.head())
-    
+
             return df
         except Exception as e:
-            print("MongoDB se data nikalte waqt error aaya:", e)
             raise SensorException(e, sys)
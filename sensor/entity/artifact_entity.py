@@ -13,12 +13,17 @@ class DataValidationArtifact:
     invalid_train_file_path: str
     invalid_test_file_path: str
     drift_report_file_path: str
+    sketch_file_path: str = None
 
 @dataclass
 class DataTransformationArtifact:
     transformed_object_file_path: str
     transformed_train_file_path: str
     transformed_test_file_path: str
+    transformed_train_target_file_path: str = None
+    transformed_test_target_file_path: str = None
+    transformed_train_unsampled_file_path: str = None
+    transformed_train_unsampled_target_file_path: str = None
 
 
 @dataclass
@@ -33,6 +38,8 @@ class ModelTrainerArtifact:
     trained_model_file_path: str
     train_metric_artifact: ClassificationMetricArtifact
     test_metric_artifact: ClassificationMetricArtifact
+    trained_tree_ensemble_file_path: str = None
+    tuning_trials_file_path: str = None
 
 
 @dataclass
@@ -1,15 +1,32 @@
 from datetime import datetime                                                   # Abhi ka date aur time lene ke liye
+import re                                                                        # Run id (timestamp) ka format check karne ke liye
 import os                                                                        # Computer ke folders aur file paths ko handle karne ke liye
 from sensor.constant  import training_pipeline                                    # Ek constant file se training pipeline ke fixed naam aur paths ko import kiya
 
 class TrainingPipelineConfig:
 
-    def __init__(self, timestamp=datetime.now()):                                         # Jab bhi class ka object banega, to current time le lenge
-      timestamp = timestamp.strftime("%m_%d_%Y_%H_%M_%S")                                 # Time ko ek readable format mein convert kiya (month_day_year_hour_minute_second)
+    def __init__(self, timestamp=None):                                                    # Jab bhi class ka object banega, to current time le lenge (ya purane run ka id, resume ke liye)
+      if timestamp is None:
+          timestamp = datetime.now()
+      if isinstance(timestamp, datetime):
+          timestamp = timestamp.strftime(training_pipeline.PIPELINE_RUN_ID_FORMAT)         # Time ko ek readable format mein convert kiya (month_day_year_hour_minute_second)
+      if not self.is_valid_run_id(timestamp):
+          raise ValueError(f"Invalid run id {timestamp!r}")                               # Run id path mein judta hai: "../" jaisi value artifact folder ke bahar na le jaaye
 
       self.pipeline_name: str = training_pipeline.PIPELINE_NAME                                 # Pipeline ka naam constants file se liya
       self.artifact_dir: str = os.path.join(training_pipeline.ARTIFACT_DIR,timestamp)                  # Ek folder banega jisme sari cheeze store hongi (har run ke liye alag folder time ke naam se)
       self.timestamp: str = timestamp                                                                     # Time ko object mein store bhi kiya future use ke liye
+      self.stage_cache_enabled: bool = training_pipeline.STAGE_CACHE_ENABLED                              # Same inputs + config + code wale stage ka purana artifact reuse karna hai ya nahi
+      self.stage_cache_dir: str = training_pipeline.STAGE_CACHE_DIR                                       # Runs ke beech share hone wala cache folder (har entry ek fingerprint ke naam se)
+      self.stage_cache_max_size_bytes: int = training_pipeline.STAGE_CACHE_MAX_SIZE_BYTES                 # Cache isse bada hua to sabse purani use hui entries hata di jaati hain
+      self.checkpoint_file_path: str = os.path.join(self.artifact_dir, training_pipeline.PIPELINE_CHECKPOINT_FILE_NAME)   # Run ke completed stages ka manifest (resume ke liye)
+      self.checkpoint_dir: str = os.path.join(self.artifact_dir, training_pipeline.PIPELINE_CHECKPOINT_DIR)               # Har completed stage ka pickled artifact
+      self.max_workers: int = training_pipeline.PIPELINE_MAX_WORKERS                                                          # Stages ke DAG ka thread pool size (None = cpu count ke hisaab se)
+      self.timing_report_file_path: str = os.path.join(self.artifact_dir, training_pipeline.PIPELINE_TIMING_REPORT_FILE_NAME)  # Har task ka start/end/duration aur critical path
+
+    @staticmethod
+    def is_valid_run_id(run_id) -> bool:
+      return isinstance(run_id, str) and re.fullmatch(training_pipeline.PIPELINE_RUN_ID_PATTERN, run_id) is not None
 
 class DataIngestionConfig:                                                                                                                   # 👇 Ye class data ingestion ke liye sab folder aur file ka path batati hai
         def __init__(self,training_pipeline_config:TrainingPipelineConfig):                                                                # training_pipeline_config object se base artifact folder ka path mil raha hai
@@ -26,7 +43,22 @@ class DataIngestionConfig:
                 self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR, training_pipeline.TEST_FILE_NAME                                      # Test data ka file path banata hai
             )
             self.train_test_split_ratio: float = training_pipeline.DATA_INGESTION_TRAIN_TEST_SPLIT_RATION                                   # Ye value decide karti hai ki data ko kitne hisso me baatna hai (e.g. 80-20)
+            self.split_random_state: int = training_pipeline.DATA_INGESTION_SPLIT_RANDOM_STATE                                                         # Test rows ke sample ka seed, taaki same data pe split har run mein same rahe
             self.collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME                                                              # MongoDB me jis collection se data uthana hai, uska naam
+            self.export_chunk_size: int = training_pipeline.DATA_INGESTION_EXPORT_CHUNK_SIZE                                                           # Ek baar me MongoDB se kitne documents ka chunk laana hai
+            self.export_query: dict = training_pipeline.DATA_INGESTION_EXPORT_QUERY                                                                   # Server-side filter jo MongoDB pe hi apply hota hai (None = saare documents)
+            self.export_partitions: int = training_pipeline.DATA_INGESTION_EXPORT_PARTITIONS                                                            # Kitne key ranges parallel mein fetch karne hain (1 = single cursor)
+            self.export_partition_key: str = training_pipeline.DATA_INGESTION_EXPORT_PARTITION_KEY                                                      # Kis field ke ranges pe collection ko baatna hai
+            self.export_prefetch_chunks: int = training_pipeline.DATA_INGESTION_EXPORT_PREFETCH_CHUNKS                                                  # Har partition worker kitne chunks aage fetch karke rakh sakta hai (memory bound)
+            self.incremental: bool = training_pipeline.DATA_INGESTION_INCREMENTAL                                                                        # Sirf watermark ke baad wale naye documents laane hain ya poora collection
+            self.watermark_key: str = training_pipeline.DATA_INGESTION_WATERMARK_KEY                                                                    # Kis field se pata chalega ki document naya hai (_id / insertion timestamp)
+            self.watermark_safety_window_seconds: int = training_pipeline.DATA_INGESTION_WATERMARK_SAFETY_WINDOW_SECONDS                                  # Watermark ke itne seconds neeche tak dobara scan, taaki der se insert hue documents skip na hon
+            self.watermark_keys_per_query: int = training_pipeline.DATA_INGESTION_WATERMARK_KEYS_PER_QUERY                                              # Safety window ki explicit keys ek query ($in) mein kitni, taaki query document limit mein rahe
+            self.feature_store_dir: str = os.path.join(
+                training_pipeline.FEATURE_STORE_DIR, training_pipeline.DATABASE_NAME, self.collection_name                                                    # Persistent feature store: feature_store/<database>/<collection>, har run ka naya part yahin judta hai
+            )
+            self.feature_store_version: str = training_pipeline_config.timestamp                                                                     # Is run ke part file ka version
+            self.export_csv: bool = training_pipeline.DATA_INGESTION_EXPORT_CSV                                                                        # Train/test ki CSV copy bhi chahiye to True (default sirf Parquet)
    
 
 class DataValidationConfig:                                                                                                                  #Tum ek data-validation naam ka folder bana rahe ho, jiske andar kuch subfolders aur files automatically create honge.
@@ -48,22 +80,22 @@ class DataValidationConfig:
             self.data_validation_dir, training_pipeline.DATA_VALIDATION_INVALID_DIR
         )
 
-        # 4. Valid training file path (CSV)
+        # 4. Valid training file path (Parquet)
         self.valid_train_file_path: str = os.path.join(
             self.valid_data_dir,training_pipeline.TRAIN_FILE_NAME
         )
 
-        # 5. Valid testing file path (CSV)
+        # 5. Valid testing file path (Parquet)
         self.valid_test_file_path: str = os.path.join(
             self.valid_data_dir, training_pipeline.TEST_FILE_NAME
         )
 
-        # 6. Invalid training file path (CSV)
+        # 6. Invalid training file path (Parquet)
         self.invalid_train_file_path: str = os.path.join(
             self.invalid_data_dir,training_pipeline.TRAIN_FILE_NAME
         )
 
-        # 7. Invalid testing file path (CSV)
+        # 7. Invalid testing file path (Parquet)
         self.invalid_test_file_path: str = os.path.join(
             self.invalid_data_dir, training_pipeline.TEST_FILE_NAME
         )
@@ -75,16 +107,58 @@ class DataValidationConfig:
             training_pipeline.DATA_VALIDATION_DRIFT_REPORT_FILE_NAME,
         )
 
+        # 8b. Row validation ka summary (har check pe kitni rows fail hui)
+        self.validation_report_file_path: str = os.path.join(
+            self.data_validation_dir, training_pipeline.DATA_VALIDATION_REPORT_FILE_NAME
+        )
+
+        # 9. Drift detection settings (method: ks / histogram_ks / psi / auto)
+        self.drift_method: str = training_pipeline.DATA_VALIDATION_DRIFT_METHOD
+        self.drift_threshold: float = training_pipeline.DATA_VALIDATION_DRIFT_THRESHOLD
+        self.drift_psi_threshold: float = training_pipeline.DATA_VALIDATION_DRIFT_PSI_THRESHOLD
+        self.drift_bins: int = training_pipeline.DATA_VALIDATION_DRIFT_BINS
+        self.drift_binned_min_rows: int = training_pipeline.DATA_VALIDATION_DRIFT_BINNED_MIN_ROWS
+        self.drift_max_workers: int = training_pipeline.DATA_VALIDATION_DRIFT_MAX_WORKERS
+
+        # 10. Per-column quantile sketches drift report ke saath save hote hain; baseline path diya ho toh uske against bhi drift
+        self.sketch_file_path: str = os.path.join(
+            os.path.dirname(self.drift_report_file_path),
+            training_pipeline.DATA_VALIDATION_SKETCH_FILE_NAME,
+        )
+        self.sketch_compression: int = training_pipeline.DATA_VALIDATION_SKETCH_COMPRESSION
+        self.baseline_sketch_file_path: str = training_pipeline.DATA_VALIDATION_BASELINE_SKETCH_FILE_PATH
+        self.baseline_report_file_path: str = os.path.join(
+            os.path.dirname(self.drift_report_file_path),
+            training_pipeline.DATA_VALIDATION_BASELINE_REPORT_FILE_NAME,
+        )
+
 
 class DataTransformationConfig:
     def __init__(self,training_pipeline_config:TrainingPipelineConfig):
         self.data_transformation_dir: str = os.path.join( training_pipeline_config.artifact_dir,training_pipeline.DATA_TRANSFORMATION_DIR_NAME )
 
+        # Features (X) aur target (y) alag contiguous files mein, taaki trainer inhe bina copy ke mmap kar sake
         self.transformed_train_file_path: str = os.path.join( self.data_transformation_dir,training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-            training_pipeline.TRAIN_FILE_NAME.replace("csv", "npy"),)
+            os.path.splitext(training_pipeline.TRAIN_FILE_NAME)[0] + training_pipeline.DATA_TRANSFORMATION_FEATURE_FILE_SUFFIX,)
         
         self.transformed_test_file_path: str = os.path.join(self.data_transformation_dir,  training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-            training_pipeline.TEST_FILE_NAME.replace("csv", "npy"), )
+            os.path.splitext(training_pipeline.TEST_FILE_NAME)[0] + training_pipeline.DATA_TRANSFORMATION_FEATURE_FILE_SUFFIX, )
+
+        self.transformed_train_target_file_path: str = os.path.join(self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            os.path.splitext(training_pipeline.TRAIN_FILE_NAME)[0] + training_pipeline.DATA_TRANSFORMATION_TARGET_FILE_SUFFIX,)
+
+        self.transformed_test_target_file_path: str = os.path.join(self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            os.path.splitext(training_pipeline.TEST_FILE_NAME)[0] + training_pipeline.DATA_TRANSFORMATION_TARGET_FILE_SUFFIX,)
+
+        # SMOTETomek se pehle wala train (asli class balance), tuning ka validation fold isi se alag hota hai
+        self.transformed_train_unsampled_file_path: str = os.path.join(self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            os.path.splitext(training_pipeline.TRAIN_FILE_NAME)[0] + training_pipeline.DATA_TRANSFORMATION_UNSAMPLED_FILE_SUFFIX + training_pipeline.DATA_TRANSFORMATION_FEATURE_FILE_SUFFIX,)
+
+        self.transformed_train_unsampled_target_file_path: str = os.path.join(self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            os.path.splitext(training_pipeline.TRAIN_FILE_NAME)[0] + training_pipeline.DATA_TRANSFORMATION_UNSAMPLED_FILE_SUFFIX + training_pipeline.DATA_TRANSFORMATION_TARGET_FILE_SUFFIX,)
+
+        self.feature_dtype: str = training_pipeline.DATA_TRANSFORMATION_FEATURE_DTYPE  # X float32 (schema dtype), float64 ka aadha
+        self.target_dtype: str = training_pipeline.DATA_TRANSFORMATION_TARGET_DTYPE  # y sirf 0/1 class ids
         
         self.transformed_object_file_path: str = os.path.join( self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
             training_pipeline.PREPROCSSING_OBJECT_FILE_NAME,)
@@ -99,10 +173,30 @@ class ModelTrainerConfig:
         )
         self.trained_model_file_path: str = os.path.join(
             self.model_trainer_dir, training_pipeline.MODEL_TRAINER_TRAINED_MODEL_DIR, 
-            training_pipeline.MODEL_FILE_NAME
-        )
+            training_pipeline.MODEL_BUNDLE_MANIFEST_FILE_NAME
+        )  # Model bundle (booster + preprocessing arrays + trees) ka manifest
+        self.trained_tree_ensemble_file_path: str = os.path.join(
+            self.model_trainer_dir, training_pipeline.MODEL_TRAINER_TRAINED_MODEL_DIR,
+            training_pipeline.TREE_ENSEMBLE_FILE_NAME
+        )  # Booster ka flat array roop (NumPy evaluator ke liye, xgboost ke bina load hota hai)
         self.expected_accuracy: float = training_pipeline.MODEL_TRAINER_EXPECTED_SCORE
         self.overfitting_underfitting_threshold = training_pipeline.MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD
+        self.tuning_enabled: bool = training_pipeline.MODEL_TRAINER_TUNING_ENABLED  # False: default XGBClassifier, koi search nahi
+        self.tuning_trials_file_path: str = os.path.join(
+            self.model_trainer_dir, training_pipeline.MODEL_TRAINER_TUNING_DIR,
+            training_pipeline.MODEL_TRAINER_TUNING_TRIALS_FILE_NAME
+        )  # Har poori hui trial yahan, isi run ko dobara chalane par search yahin se resume hota hai
+        self.tuning_search_space: dict = training_pipeline.MODEL_TRAINER_TUNING_SEARCH_SPACE  # param -> [type, low, high]
+        self.tuning_n_trials: int = training_pipeline.MODEL_TRAINER_TUNING_N_TRIALS  # Pehle rung pe random configs
+        self.tuning_min_estimators: int = training_pipeline.MODEL_TRAINER_TUNING_MIN_ESTIMATORS  # Pehle rung ka rounds budget
+        self.tuning_max_estimators: int = training_pipeline.MODEL_TRAINER_TUNING_MAX_ESTIMATORS  # Aakhri rung ka rounds budget
+        self.tuning_reduction_factor: int = training_pipeline.MODEL_TRAINER_TUNING_REDUCTION_FACTOR  # Har rung pe top 1/n aage, budget n guna
+        self.tuning_early_stopping_rounds: int = training_pipeline.MODEL_TRAINER_TUNING_EARLY_STOPPING_ROUNDS
+        self.tuning_valid_fraction: float = training_pipeline.MODEL_TRAINER_TUNING_VALID_FRACTION  # Train data ka validation fold
+        self.tuning_time_budget_seconds: float = training_pipeline.MODEL_TRAINER_TUNING_TIME_BUDGET_SECONDS  # None: koi limit nahi
+        self.tuning_max_workers: int = training_pipeline.MODEL_TRAINER_TUNING_MAX_WORKERS  # None: os.cpu_count()
+        self.tuning_trial_nthread: int = training_pipeline.MODEL_TRAINER_TUNING_TRIAL_NTHREAD  # None: cores / workers
+        self.tuning_random_state: int = training_pipeline.MODEL_TRAINER_TUNING_RANDOM_STATE
 
 class ModelEvaluationConfig:
 
@@ -120,12 +214,12 @@ class ModelPusherConfig:
         self.model_evaluation_dir: str = os.path.join(
             training_pipeline_config.artifact_dir, training_pipeline.MODEL_PUSHER_DIR_NAME
         )
-        self.model_file_path = os.path.join(self.model_evaluation_dir,training_pipeline.MODEL_FILE_NAME)
+        self.model_file_path = os.path.join(self.model_evaluation_dir,training_pipeline.MODEL_BUNDLE_MANIFEST_FILE_NAME)
         timestamp = round(datetime.now().timestamp())
         self.saved_model_path=os.path.join(
             training_pipeline.SAVED_MODEL_DIR,
             f"{timestamp}",
-            training_pipeline.MODEL_FILE_NAME)
+            training_pipeline.MODEL_BUNDLE_MANIFEST_FILE_NAME)
 
 
 
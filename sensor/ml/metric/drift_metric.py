@@ -0,0 +1,200 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from scipy.stats import kstwo, kstwobign
+
+from sensor.exception import SensorException
+
+# Ek baar mein kitne columns ko saath sort karna hai (memory aur parallelism ka balance)
+DRIFT_COLUMN_BLOCK_SIZE = 16
+PSI_EPSILON = 1e-6
+# Is effective sample size tak p-value finite-n kstwo distribution se, usse upar asymptotic se
+KS_EXACT_MAX_N = 10000
+
+
+def _ks_pvalue(statistic: np.ndarray, n_base: np.ndarray, n_current: np.ndarray) -> np.ndarray:
+    # ks_2samp(method="asymp") wala two-sided p-value: effective sample size ke saath kstwo distribution.
+    # Bade samples pe kstwo.sf bahut slow hai, wahan uska limiting form kstwobign(d * sqrt(n)) use karte hain.
+    effective_n = np.maximum(np.round(n_base * n_current / np.maximum(n_base + n_current, 1)), 1)
+    p_value = np.empty_like(statistic, dtype=np.float64)
+    small = effective_n <= KS_EXACT_MAX_N
+    p_value[small] = kstwo.sf(statistic[small], effective_n[small])
+    p_value[~small] = kstwobign.sf(statistic[~small] * np.sqrt(effective_n[~small]))
+    return np.clip(p_value, 0, 1)
+
+
+def sort_columns(data: np.ndarray) -> tuple:
+    """
+    (k, n) array ki har row (ek column ka data) ko ek hi call mein sort karta hai; NaN end mein jaate hain.
+    return: (sorted_data, valid_counts)
+    """
+    sorted_data = np.sort(data, axis=1)
+    valid_counts = np.count_nonzero(~np.isnan(sorted_data), axis=1)
+    return sorted_data, valid_counts
+
+
+def ks_2samp_columns(base: np.ndarray, current: np.ndarray) -> tuple:
+    """
+    Har column ke liye two-sample KS statistic aur p-value.
+    base: (k, n_base) aur current: (k, n_current) float arrays (har row ek column), NaN ignore hote hain.
+    Har column ek baar sort hota hai, phir dono sorted samples ko merge karke ECDF ka max difference nikalta hai.
+    return: (statistic, p_value, n_base, n_current) har ek shape (k,)
+    """
+    try:
+        base_sorted, n_base = sort_columns(base)
+        current_sorted, n_current = sort_columns(current)
+
+        statistic = np.zeros(base.shape[0])
+        for column in range(base.shape[0]):
+            if n_base[column] == 0 or n_current[column] == 0:
+                continue
+            values = np.concatenate([base_sorted[column, :n_base[column]],
+                                     current_sorted[column, :n_current[column]]])
+            # Do already-sorted runs ka stable merge (lagbhag linear), phir cumulative counts se dono ECDF
+            order = np.argsort(values, kind="stable")
+            merged = values[order]
+            count_base = np.cumsum(order < n_base[column])
+            count_current = np.arange(1, len(values) + 1) - count_base
+
+            # ECDF sirf har distinct value ki aakhri position pe compare hote hain, taaki ties ek saath gine jaayein
+            last_of_value = np.ones(len(values), dtype=bool)
+            last_of_value[:-1] = merged[1:] != merged[:-1]
+            statistic[column] = np.abs(count_base[last_of_value] / n_base[column]
+                                       - count_current[last_of_value] / n_current[column]).max()
+
+        n_base = n_base.astype(np.float64)
+        n_current = n_current.astype(np.float64)
+        return statistic, _ks_pvalue(statistic, n_base, n_current), n_base, n_current
+    except Exception as e:
+        raise SensorException(e, sys)
+
+
+def _binned_counts(base: np.ndarray, current: np.ndarray, bins: int) -> tuple:
+    # Bin edges base ke quantiles se, taaki har bin mein lagbhag barabar base data ho.
+    # Sort ki jagah partition based quantile aur bins mein searchsorted, isliye bade data pe sasta hai.
+    quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+    base_counts, current_counts = [], []
+    for base_column, current_column in zip(base, current):
+        base_column = base_column[~np.isnan(base_column)]
+        current_column = current_column[~np.isnan(current_column)]
+        if len(base_column) == 0:
+            edges = np.array([])
+        else:
+            edges = np.unique(np.quantile(base_column, quantiles))
+        base_counts.append(np.bincount(np.searchsorted(edges, base_column, side="right"), minlength=len(edges) + 1))
+        current_counts.append(np.bincount(np.searchsorted(edges, current_column, side="right"), minlength=len(edges) + 1))
+    return base_counts, current_counts
+
+
+def histogram_ks_columns(base: np.ndarray, current: np.ndarray, bins: int = 100) -> tuple:
+    """
+    KS ka binned version: bahut bade inputs ke liye, pure sort ki jagah quantile bins ke counts se CDF banata hai.
+    Statistic asli KS se thoda chhota (conservative) ho sakta hai.
+    """
+    try:
+        base_counts, current_counts = _binned_counts(base, current, bins)
+        statistic = np.zeros(base.shape[0])
+        n_base = np.zeros(base.shape[0])
+        n_current = np.zeros(base.shape[0])
+        for column, (base_count, current_count) in enumerate(zip(base_counts, current_counts)):
+            n_base[column] = base_count.sum()
+            n_current[column] = current_count.sum()
+            if n_base[column] == 0 or n_current[column] == 0:
+                continue
+            statistic[column] = np.abs(np.cumsum(base_count) / n_base[column]
+                                       - np.cumsum(current_count) / n_current[column]).max()
+        return statistic, _ks_pvalue(statistic, n_base, n_current), n_base, n_current
+    except Exception as e:
+        raise SensorException(e, sys)
+
+
+def psi_columns(base: np.ndarray, current: np.ndarray, bins: int = 10) -> tuple:
+    """
+    Population Stability Index har column ke liye (base ke quantile bins pe).
+    return: (psi, n_base, n_current)
+    """
+    try:
+        base_counts, current_counts = _binned_counts(base, current, bins)
+        psi = np.zeros(base.shape[0])
+        n_base = np.zeros(base.shape[0])
+        n_current = np.zeros(base.shape[0])
+        for column, (base_count, current_count) in enumerate(zip(base_counts, current_counts)):
+            n_base[column] = base_count.sum()
+            n_current[column] = current_count.sum()
+            if n_base[column] == 0 or n_current[column] == 0:
+                continue
+            base_share = np.maximum(base_count / n_base[column], PSI_EPSILON)
+            current_share = np.maximum(current_count / n_current[column], PSI_EPSILON)
+            psi[column] = np.sum((current_share - base_share) * np.log(current_share / base_share))
+        return psi, n_base, n_current
+    except Exception as e:
+        raise SensorException(e, sys)
+
+
+def column_major(dataframe: pd.DataFrame, columns: list) -> np.ndarray:
+    """DataFrame ke columns ko (k, n) contiguous float64 array mein, taaki har column ek continuous row ho."""
+    if len(dataframe) == 0:
+        return np.empty((len(columns), 0))
+    return np.stack([dataframe[column].to_numpy(dtype=np.float64, na_value=np.nan) for column in columns])
+
+
+def get_drift_report(base_df: pd.DataFrame, current_df: pd.DataFrame, columns: Optional[list] = None,
+                     threshold: float = 0.05, method: str = "auto", bins: int = 100,
+                     psi_threshold: float = 0.2, binned_min_rows: int = 1_000_000,
+                     max_workers: Optional[int] = None) -> dict:
+    """
+    Base aur current data ke beech har numerical column ka drift report.
+    method: "ks" (sorted ECDF KS), "histogram_ks", "psi", ya "auto" (bade data pe histogram_ks, warna ks)
+    Columns blocks mein baant kar thread pool pe chalte hain; numpy sort/argsort GIL chhod dete hain.
+    Report format purane report.yaml jaisa hi hai: {column: {"p_value": ..., "drift_status": ...}}
+    drift_status True ka matlab hai distribution same hai (koi drift nahi).
+    """
+    try:
+        if columns is None:
+            columns = list(base_df.select_dtypes(include=[np.number]).columns)
+        if method == "auto":
+            method = "histogram_ks" if max(len(base_df), len(current_df)) >= binned_min_rows else "ks"
+
+        blocks = [columns[i:i + DRIFT_COLUMN_BLOCK_SIZE] for i in range(0, len(columns), DRIFT_COLUMN_BLOCK_SIZE)]
+
+        def run_block(block_columns: list) -> dict:
+            base = column_major(base_df, block_columns)
+            current = column_major(current_df, block_columns)
+            block_report = {}
+
+            if method == "psi":
+                psi, n_base, n_current = psi_columns(base, current, bins=bins)
+                for index, column in enumerate(block_columns):
+                    if n_base[index] == 0 or n_current[index] == 0:
+                        block_report[column] = {"p_value": None, "drift_status": "Insufficient data"}
+                        continue
+                    block_report[column] = {"p_value": None, "psi": float(psi[index]),
+                                            "drift_status": bool(psi[index] <= psi_threshold)}
+                return block_report
+
+            if method == "histogram_ks":
+                statistic, p_value, n_base, n_current = histogram_ks_columns(base, current, bins=bins)
+            elif method == "ks":
+                statistic, p_value, n_base, n_current = ks_2samp_columns(base, current)
+            else:
+                raise ValueError(f"Unknown drift method: {method}")
+
+            for index, column in enumerate(block_columns):
+                if n_base[index] == 0 or n_current[index] == 0:
+                    block_report[column] = {"p_value": None, "drift_status": "Insufficient data"}
+                    continue
+                block_report[column] = {"p_value": float(p_value[index]),
+                                        "drift_status": bool(p_value[index] > threshold)}
+            return block_report
+
+        drift_report = {}
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            for block_report in executor.map(run_block, blocks):
+                drift_report.update(block_report)
+        return drift_report
+    except Exception as e:
+        raise SensorException(e, sys)
@@ -0,0 +1,235 @@
+import os
+import sys
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from sensor.exception import SensorException
+from sensor.ml.metric.drift_metric import _ks_pvalue
+
+DEFAULT_COMPRESSION = 1000
+
+
+class QuantileSketch:
+    """
+    t-digest jaisa mergeable quantile sketch: data ko weighted centroids (mean, weight) mein summarize karta hai.
+    Tails pe chhote aur beech mein bade centroids banta hai, isliye size ~compression rehta hai chahe data kitna bhi ho.
+    Do sketches ko merge karna = centroids jodna aur dobara compress karna.
+    points: jo centroid sirf ek hi value ka hai (e.g. Scania ke 60% zeros) woh point mass hai; CDF uspe
+    seedha apne poore weight se jump karta hai, interpolate nahi hota.
+    """
+
+    def __init__(self, means=None, weights=None, minimum: float = np.nan, maximum: float = np.nan,
+                 null_count: int = 0, compression: int = DEFAULT_COMPRESSION, points=None):
+        self.means = np.asarray(means if means is not None else [], dtype=np.float64)
+        self.weights = np.asarray(weights if weights is not None else [], dtype=np.float64)
+        # Purani sketch files mein points nahi hote; wahan equal-mean centroids _cdf_points mein point ban jaate hain
+        self.points = np.asarray(points if points is not None else np.zeros(len(self.means)), dtype=bool)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.null_count = int(null_count)
+        self.compression = int(compression)
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, compression: int = DEFAULT_COMPRESSION) -> "QuantileSketch":
+        try:
+            values = np.asarray(values, dtype=np.float64)
+            valid = values[~np.isnan(values)]
+            null_count = len(values) - len(valid)
+            if len(valid) == 0:
+                return cls(null_count=null_count, compression=compression)
+            # Har distinct value ek point centroid (uske count ke weight ke saath)
+            values, counts = np.unique(valid, return_counts=True)
+            means, weights, points = cls._compress(values, counts.astype(np.float64),
+                                                   np.ones(len(values), dtype=bool), compression)
+            return cls(means, weights, values[0], values[-1], null_count, compression, points)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    @staticmethod
+    def _collapse_equal_means(means: np.ndarray, weights: np.ndarray, points: np.ndarray) -> tuple:
+        # Same mean wale centroids ek point mass hain: unka poora weight usi value pe
+        starts = np.flatnonzero(np.r_[True, means[1:] != means[:-1]])
+        sizes = np.diff(np.r_[starts, len(means)])
+        return means[starts], np.add.reduceat(weights, starts), np.logical_and.reduceat(points, starts) | (sizes > 1)
+
+    @staticmethod
+    def _scale(q: np.ndarray, compression: int) -> np.ndarray:
+        # k1 scale function: k(q) = compression / (2*pi) * asin(2q - 1)
+        return compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1))
+
+    @classmethod
+    def _compress(cls, means: np.ndarray, weights: np.ndarray, points: np.ndarray, compression: int) -> tuple:
+        # means sorted hone chahiye. Jin centroids ka k ek hi integer bucket mein aata hai unhe ek centroid mein
+        # jod dete hain. Jo centroid akele hi ek bucket se bada hai (bhaari point mass) woh kisi se nahi judta,
+        # warna zeros ka mass padosi values ke saath ek beech wale mean pe chala jaata. Aise point masses exact hain,
+        # isliye buckets sirf baaki (spread) mass pe baantte hain: 60% zeros ho to bhi baaki data ko poore
+        # compression jitne centroids milte hain.
+        means, weights, points = cls._collapse_equal_means(means, weights, points)
+        total = weights.sum()
+        cumulative = np.cumsum(weights)
+        heavy = cls._scale(cumulative / total, compression) - cls._scale((cumulative - weights) / total, compression) >= 1
+        spread_weights = np.where(heavy, 0.0, weights)
+        spread_cumulative = np.cumsum(spread_weights)
+        k = cls._scale((spread_cumulative - spread_weights / 2) / max(spread_cumulative[-1], 1.0), compression)
+        group = np.floor(k).astype(np.int64)
+        boundary = np.r_[True, (group[1:] != group[:-1]) | heavy[1:] | heavy[:-1]]
+        starts = np.flatnonzero(boundary)
+        sizes = np.diff(np.r_[starts, len(means)])
+        group_weights = np.add.reduceat(weights, starts)
+        group_means = np.add.reduceat(means * weights, starts) / group_weights
+        return group_means, group_weights, points[starts] & (sizes == 1)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        try:
+            compression = max(self.compression, other.compression)
+            means = np.concatenate([self.means, other.means])
+            weights = np.concatenate([self.weights, other.weights])
+            points = np.concatenate([self.points, other.points])
+            null_count = self.null_count + other.null_count
+            if len(means) == 0:
+                return QuantileSketch(null_count=null_count, compression=compression)
+            order = np.argsort(means, kind="stable")
+            means, weights, points = self._compress(means[order], weights[order], points[order], compression)
+            return QuantileSketch(means, weights, np.fmin(self.minimum, other.minimum),
+                                  np.fmax(self.maximum, other.maximum), null_count, compression, points)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def _cdf_points(self) -> tuple:
+        # Spread centroid ke mean pe CDF = (pehle ka weight + aadha apna weight) / total. Point mass v pe do
+        # entries (v, pehle ka weight) aur (v, pehle ka + apna weight): CDF wahan seedha jump karta hai.
+        # Min pe 0 aur max pe 1; points non-decreasing hain (jump pe same x do baar).
+        means, weights, is_point = self._collapse_equal_means(self.means, self.weights, self.points)
+        cumulative = np.cumsum(weights) / weights.sum()
+        before = cumulative - weights / weights.sum()
+        points = np.concatenate([[self.minimum], np.repeat(means, np.where(is_point, 2, 1)), [self.maximum]])
+        cdf = np.concatenate([[0.0], np.concatenate([
+            [before[i], cumulative[i]] if is_point[i] else [(before[i] + cumulative[i]) / 2]
+            for i in range(len(means))]), [1.0]])
+        return points, cdf
+
+    def rank_error(self) -> float:
+        """
+        CDF ki maximum galti (rank fraction mein): spread centroid ka CDF uske mean pe (pehle ka + aadha weight)
+        maana jaata hai jabki sach (pehle ka) aur (pehle ka + poora weight) ke beech kahin hai, isliye sabse bhaari
+        spread centroid ka aadha weight / total. Point masses exact hain.
+        """
+        means, weights, is_point = self._collapse_equal_means(self.means, self.weights, self.points)
+        spread = weights[~is_point]
+        return float(spread.max() / 2 / weights.sum()) if len(spread) else 0.0
+
+    def cdf(self, x, side: str = "right") -> np.ndarray:
+        """
+        Approximate CDF; side="right" P(X <= x), side="left" P(X < x) (point mass pe dono alag hain).
+        Points ke beech linear interpolation.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if len(self.weights) == 0:
+            return np.full(x.shape, np.nan)
+        points, cdf = self._cdf_points()
+        index = np.clip(np.searchsorted(points, x, side=side), 1, len(points) - 1)
+        x0, x1 = points[index - 1], points[index]
+        width = x1 - x0
+        fraction = np.clip((x - x0) / np.where(width > 0, width, 1), 0, 1)
+        result = cdf[index - 1] + fraction * (cdf[index] - cdf[index - 1])
+        return np.where(x < points[0], 0.0, np.where(x > points[-1], 1.0, result))
+
+    def quantile(self, q) -> np.ndarray:
+        q = np.asarray(q, dtype=np.float64)
+        if len(self.weights) == 0:
+            return np.full(q.shape, np.nan)
+        points, cdf = self._cdf_points()
+        return np.interp(q, cdf, points)
+
+
+class ColumnSketches:
+    """Har numerical column ka ek QuantileSketch; .npz file mein save/load aur batches ke beech merge hota hai."""
+
+    def __init__(self, sketches: Optional[dict] = None):
+        self.sketches = dict(sketches or {})
+
+    @classmethod
+    def from_dataframe(cls, dataframe: pd.DataFrame, columns: list,
+                       compression: int = DEFAULT_COMPRESSION) -> "ColumnSketches":
+        try:
+            return cls({
+                column: QuantileSketch.from_values(dataframe[column].to_numpy(dtype=np.float64, na_value=np.nan),
+                                                   compression=compression)
+                for column in columns
+            })
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def merge(self, other: "ColumnSketches") -> "ColumnSketches":
+        merged = dict(self.sketches)
+        for column, sketch in other.sketches.items():
+            merged[column] = merged[column].merge(sketch) if column in merged else sketch
+        return ColumnSketches(merged)
+
+    def save(self, file_path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            arrays = {"columns": np.array(list(self.sketches.keys()), dtype=str)}
+            for index, sketch in enumerate(self.sketches.values()):
+                arrays[f"means_{index}"] = sketch.means
+                arrays[f"weights_{index}"] = sketch.weights
+                arrays[f"points_{index}"] = sketch.points
+                arrays[f"meta_{index}"] = np.array([sketch.minimum, sketch.maximum,
+                                                    sketch.null_count, sketch.compression], dtype=np.float64)
+            with open(file_path, "wb") as file_obj:
+                np.savez_compressed(file_obj, **arrays)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    @classmethod
+    def load(cls, file_path: str) -> "ColumnSketches":
+        try:
+            with np.load(file_path) as data:
+                sketches = {}
+                for index, column in enumerate(data["columns"]):
+                    minimum, maximum, null_count, compression = data[f"meta_{index}"]
+                    points = data[f"points_{index}"] if f"points_{index}" in data.files else None
+                    sketches[str(column)] = QuantileSketch(data[f"means_{index}"], data[f"weights_{index}"],
+                                                           minimum, maximum, int(null_count), int(compression),
+                                                           points)
+            return cls(sketches)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+
+def sketch_ks_2samp(base: QuantileSketch, current: QuantileSketch) -> tuple:
+    """
+    Do sketches ke approximate CDFs ka KS statistic aur p-value; cost sirf sketch size pe depend karti hai.
+    Difference har point pe dono taraf se (point mass ke pehle aur baad) dekha jaata hai. p-value se pehle
+    statistic se dono sketches ki rank error ghata dete hain: sketch ki galti ko drift nahi maana jaata.
+    """
+    points = np.union1d(base._cdf_points()[0], current._cdf_points()[0])
+    statistic = max(np.abs(base.cdf(points, side) - current.cdf(points, side)).max() for side in ("left", "right"))
+    widened = max(0.0, statistic - base.rank_error() - current.rank_error())
+    p_value = _ks_pvalue(np.array([widened]), np.array([base.count]), np.array([current.count]))[0]
+    return float(statistic), float(p_value)
+
+
+def get_sketch_drift_report(base: ColumnSketches, current: ColumnSketches, threshold: float = 0.05) -> dict:
+    """
+    Kisi bhi purane run ke sketches (baseline) ke against drift, purana raw data padhe bina.
+    Format get_drift_report jaisa: {column: {"p_value": ..., "drift_status": ...}}
+    """
+    try:
+        drift_report = {}
+        for column, current_sketch in current.sketches.items():
+            base_sketch = base.sketches.get(column)
+            if base_sketch is None or base_sketch.count == 0 or current_sketch.count == 0:
+                drift_report[column] = {"p_value": None, "drift_status": "Insufficient data"}
+                continue
+            _, p_value = sketch_ks_2samp(base_sketch, current_sketch)
+            drift_report[column] = {"p_value": p_value, "drift_status": bool(p_value > threshold)}
+        return drift_report
+    except Exception as e:
+        raise SensorException(e, sys)
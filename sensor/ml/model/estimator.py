@@ -1,5 +1,9 @@
 import os
-from sensor.constant.training_pipeline import SAVED_MODEL_DIR,MODEL_FILE_NAME
+import numpy as np
+import pandas as pd
+from sensor.constant.training_pipeline import SAVED_MODEL_DIR,MODEL_FILE_NAME,MODEL_PREDICT_NTHREAD,MODEL_BUNDLE_MANIFEST_FILE_NAME
+from sensor.logger import logging
+from sensor.ml.model.tree_ensemble import TreeEnsemble
 
 class TargetValueMapping:
     def __init__(self):
@@ -19,18 +23,131 @@ class TargetValueMapping:
 
 class SensorModel:
 
-    def __init__(self,preprocessor,model):
+    def __init__(self,preprocessor,model,nthread=MODEL_PREDICT_NTHREAD):
         try:
             self.preprocessor = preprocessor
             self.model = model
+            self.nthread = nthread
+            self._compile()
         except Exception as e:
             raise e
-    
+
+    def _compile(self):
+        """
+        Fitted preprocessor (constant SimpleImputer + RobustScaler) ko arrays mein nikaal leta hai:
+        fill values, center aur scale. Pipeline kuch aur ho to compiled path band rehta hai aur sklearn wala chalta hai.
+        Purane pickled models ke liye yeh pehle predict pe lazily chalta hai.
+        """
+        self._fill_value = self._center = self._scale = None
+        self._booster = None
+        self._iteration_range = (0, 0)
+        self._feature_names = []
+        # Purane pickles mein nthread attribute nahi hota
+        self.nthread = self.__dict__.get("nthread", MODEL_PREDICT_NTHREAD)
+        try:
+            from sklearn.impute import SimpleImputer
+            from sklearn.pipeline import Pipeline
+            from sklearn.preprocessing import RobustScaler
+
+            steps = [step for _, step in self.preprocessor.steps] if isinstance(self.preprocessor, Pipeline) else []
+            if len(steps) == 2 and type(steps[0]) is SimpleImputer and type(steps[1]) is RobustScaler:
+                imputer, scaler = steps
+                statistics = np.asarray(imputer.statistics_, dtype=np.float64)
+                if (not imputer.add_indicator and np.isnan(imputer.missing_values)
+                        and np.isfinite(statistics).all()):
+                    self._fill_value = statistics.astype(np.float32)
+                    # sklearn ke dtypes hi rakhte hain (center_ float32, scale_ float64) taaki result bit-for-bit same ho
+                    self._center = scaler.center_ if scaler.with_centering else None
+                    self._scale = scaler.scale_ if scaler.with_scaling else None
+                    self._feature_names = list(getattr(self.preprocessor, "feature_names_in_", []))
+
+            if self._fill_value is not None and hasattr(self.model, "get_booster") \
+                    and self.model.get_params().get("objective") == "binary:logistic":
+                self._booster = self.model.get_booster()
+                if self.nthread is not None:
+                    self._booster.set_param({"nthread": self.nthread})
+                best_iteration = getattr(self.model, "best_iteration", None)
+                if best_iteration is not None:
+                    self._iteration_range = (0, best_iteration + 1)
+        except Exception as e:
+            logging.info(f"SensorModel fused predict path disabled: {e}")
+            self._fill_value = None
+            self._booster = None
+        self._compiled = True
+
+    @classmethod
+    def from_arrays(cls, preprocessing: dict, model, booster=None, iteration_range: tuple = (0, 0),
+                    nthread=MODEL_PREDICT_NTHREAD) -> "SensorModel":
+        """
+        Model bundle se: sklearn preprocessor ke bina sirf preprocessing arrays (fill_value, center, scale,
+        feature_names) aur predictor (xgboost Booster ya TreeEnsemble)
+        """
+        sensor_model = cls.__new__(cls)
+        sensor_model.preprocessor = None
+        sensor_model.model = model
+        sensor_model.nthread = nthread
+        sensor_model._fill_value = preprocessing["fill_value"]
+        sensor_model._center = preprocessing.get("center")
+        sensor_model._scale = preprocessing.get("scale")
+        sensor_model._feature_names = [str(name) for name in preprocessing.get("feature_names", [])]
+        sensor_model._booster = booster
+        if booster is not None and nthread is not None:
+            booster.set_param({"nthread": nthread})
+        sensor_model._iteration_range = tuple(iteration_range)
+        sensor_model._compiled = True
+        return sensor_model
+
+    def get_preprocessing_arrays(self) -> dict:
+        """Compiled preprocessor ke arrays (bundle mein save karne ke liye)"""
+        if not self.__dict__.get("_compiled"):
+            self._compile()
+        if self._fill_value is None:
+            raise ValueError(f"Preprocessor {self.preprocessor} cannot be exported as arrays")
+        arrays = {"fill_value": self._fill_value, "feature_names": np.asarray(self._feature_names, dtype=str)}
+        if self._center is not None:
+            arrays["center"] = self._center
+        if self._scale is not None:
+            arrays["scale"] = self._scale
+        return arrays
+
+    def transform(self, x) -> np.ndarray:
+        """
+        Preprocessor ka fused roop: ek contiguous float32 copy, us pe in place NaN -> fill, phir (x - center) / scale.
+        sklearn Pipeline (har step pe validation + nayi matrix) se same result, ek hi allocation mein.
+        """
+        if not self.__dict__.get("_compiled"):
+            self._compile()
+        if self._fill_value is None:
+            return self.preprocessor.transform(x)
+        if isinstance(x, pd.DataFrame):
+            if self._feature_names and list(x.columns) != self._feature_names:
+                x = x[self._feature_names]
+            x = x.to_numpy(dtype=np.float32)
+        x = np.array(x, dtype=np.float32, order="C", copy=True)
+        np.copyto(x, self._fill_value, where=np.isnan(x))
+        if self._center is not None:
+            np.subtract(x, self._center, out=x, casting="same_kind")
+        if self._scale is not None:
+            np.divide(x, self._scale, out=x, casting="same_kind")
+        return x
+
+    def with_tree_ensemble(self, tree_ensemble_file_path: str) -> "SensorModel":
+        """Same preprocessor, par booster ki jagah exported TreeEnsemble (NumPy evaluator, xgboost import nahi)"""
+        tree_ensemble = TreeEnsemble.load(tree_ensemble_file_path)
+        nthread = self.__dict__.get("nthread", MODEL_PREDICT_NTHREAD)
+        if self.preprocessor is None:
+            return SensorModel.from_arrays(self.get_preprocessing_arrays(), tree_ensemble, nthread=nthread)
+        return SensorModel(preprocessor=self.preprocessor, model=tree_ensemble, nthread=nthread)
+
     def predict(self,x):
         try:
-            x_transform = self.preprocessor.transform(x)
-            y_hat = self.model.predict(x_transform)
-            return y_hat
+            x_transform = self.transform(x)
+            if self._booster is None:
+                return self.model.predict(x_transform)
+            # XGBClassifier.predict ka sklearn wrapper chhod kar seedha in-place prediction (DMatrix nahi banta)
+            probabilities = self._booster.inplace_predict(x_transform, iteration_range=self._iteration_range,
+                                                          validate_features=False)
+            return (probabilities > 0.5).astype(np.int64)
         except Exception as e:
             raise e
         
@@ -48,7 +165,11 @@ class ModelResolver:
         try:
             timestamps = list(map(int,os.listdir(self.model_dir)))
             latest_timestamp = max(timestamps)
-            latest_model_path= os.path.join(self.model_dir,f"{latest_timestamp}",MODEL_FILE_NAME)
+            latest_model_dir = os.path.join(self.model_dir,f"{latest_timestamp}")
+            # Naye models bundle hain (manifest.json), purane dill pickle (model.pkl)
+            latest_model_path = os.path.join(latest_model_dir,MODEL_BUNDLE_MANIFEST_FILE_NAME)
+            if not os.path.exists(latest_model_path):
+                latest_model_path= os.path.join(latest_model_dir,MODEL_FILE_NAME)
             return latest_model_path
         except Exception as e:
             raise e
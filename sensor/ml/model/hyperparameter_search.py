@@ -0,0 +1,304 @@
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Optional
+
+import numpy as np
+
+from sensor.exception import SensorException
+from sensor.logger import logging
+from sensor.utils.main_utils import read_yaml_file, write_yaml_file
+
+TRIALS_FORMAT_VERSION = 2
+
+# Har worker process mein ek baar load hua train/validation fold (har trial ke saath data pickle nahi hota)
+_worker_data: dict = {}
+
+
+def _load_array(source) -> np.ndarray:
+    # Path diya ho to .npy ko mmap karte hain (saare workers same page cache share karte hain)
+    return np.load(source, mmap_mode="r") if isinstance(source, str) else source
+
+
+def _init_trial_worker(fold_sources: dict, nthread: int, limit_threads: bool = True) -> None:
+    if limit_threads:
+        # xgboost import se pehle, taaki OpenMP pool bhi nthread se bada na bane
+        os.environ["OMP_NUM_THREADS"] = str(nthread)
+    _worker_data.update({name: _load_array(source) for name, source in fold_sources.items()}, nthread=nthread)
+
+
+def _run_trial(trial_id: int, rung: int, params: dict, n_estimators: int, early_stopping_rounds: int,
+               deadline: Optional[float], random_state: int) -> dict:
+    """Ek config ko n_estimators rounds tak (validation fold pe early stopping ke saath) train karta hai"""
+    import xgboost
+    from sklearn.metrics import f1_score
+
+    class _Deadline(xgboost.callback.TrainingCallback):
+        # Wall-clock budget khatam ho to chal rahi trial bhi agle round pe ruk jaati hai
+        def __init__(self):
+            super().__init__()
+            self.exceeded = False
+
+        def after_iteration(self, model, epoch, evals_log) -> bool:
+            self.exceeded = deadline is not None and time.time() > deadline
+            return self.exceeded
+
+    started_at = time.perf_counter()
+    deadline_callback = _Deadline()
+    model = xgboost.XGBClassifier(
+        **params, n_estimators=n_estimators, early_stopping_rounds=early_stopping_rounds,
+        eval_metric="logloss", n_jobs=_worker_data["nthread"], random_state=random_state,
+        callbacks=[deadline_callback],
+    )
+    model.fit(_worker_data["x_train"], _worker_data["y_train"],
+              eval_set=[(_worker_data["x_valid"], _worker_data["y_valid"])], verbose=False)
+    result = {"trial_id": trial_id, "rung": rung, "params": params, "n_estimators": n_estimators,
+              "duration": round(time.perf_counter() - started_at, 4)}
+    if deadline_callback.exceeded:
+        return {**result, "status": "timeout"}
+    return {
+        **result,
+        "status": "completed",
+        "best_iteration": int(model.best_iteration),
+        "valid_logloss": float(model.best_score),
+        "valid_f1": float(f1_score(_worker_data["y_valid"], model.predict(_worker_data["x_valid"]))),
+    }
+
+
+class HyperparameterSearch:
+    """
+    XGBoost params ke liye random search + successive halving. n_trials random configs sabse chhote budget
+    (min_estimators rounds) pe chalte hain, har rung pe validation logloss ke hisaab se top 1/reduction_factor
+    aage badhte hain aur unka budget reduction_factor guna hota hai (max_estimators tak). Har trial
+    validation fold pe early stopping ke saath chalti hai.
+
+    resample=True: input (un-resampled) train data hai; validation fold pehle alag hota hai aur SMOTETomek sirf
+    train fold pe chalta hai, taaki validation mein synthetic ya train se bane rows na hon aur logloss asli
+    class balance pe naapa jaaye.
+
+    Trials process pool pe chalti hain (spawn, har worker ko nthread threads, taaki workers x nthread cores se
+    zyada na ho), aur har poori hui trial turant trials file mein likhi jaati hai: search beech mein ruk jaaye to
+    wahi file aur wahi settings ke saath dobara chalane par poori hui trials dobara nahi chalti.
+    time_budget_seconds ke baad nayi trials shuru nahi hoti aur chal rahi trials agle round pe ruk jaati hain.
+    """
+
+    def __init__(self, trials_file_path: str, search_space: dict, n_trials: int, min_estimators: int,
+                 max_estimators: int, reduction_factor: int = 3, early_stopping_rounds: int = 20,
+                 valid_fraction: float = 0.2, time_budget_seconds: Optional[float] = None,
+                 max_workers: Optional[int] = None, trial_nthread: Optional[int] = None, random_state: int = 42,
+                 resample: bool = False):
+        try:
+            if reduction_factor < 2:
+                raise ValueError(f"reduction_factor must be at least 2, got {reduction_factor}")
+            if not 0 < min_estimators <= max_estimators:
+                raise ValueError(f"Invalid estimator budget [{min_estimators}, {max_estimators}]")
+            self.trials_file_path = trials_file_path
+            self.search_space = search_space
+            self.n_trials = n_trials
+            self.min_estimators = min_estimators
+            self.max_estimators = max_estimators
+            self.reduction_factor = reduction_factor
+            self.early_stopping_rounds = early_stopping_rounds
+            self.valid_fraction = valid_fraction
+            self.time_budget_seconds = time_budget_seconds
+            cpu_count = os.cpu_count() or 1
+            self.max_workers = max(1, min(max_workers or cpu_count, n_trials))
+            self.trial_nthread = trial_nthread or max(1, cpu_count // self.max_workers)
+            self.random_state = random_state
+            self.resample = resample
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def rung_estimators(self) -> list:
+        """Har rung ka boosting rounds budget: min_estimators * reduction_factor^i, max_estimators tak"""
+        estimators = []
+        budget = self.min_estimators
+        while budget < self.max_estimators:
+            estimators.append(budget)
+            budget *= self.reduction_factor
+        estimators.append(self.max_estimators)
+        return estimators
+
+    def sample_configs(self) -> list:
+        """random_state se deterministic configs, taaki resume pe trial_id ka matlab wahi config rahe"""
+        rng = np.random.default_rng(self.random_state)
+        configs = []
+        for _ in range(self.n_trials):
+            params = {}
+            for name in sorted(self.search_space):
+                kind, *args = self.search_space[name]
+                if kind == "uniform":
+                    params[name] = float(rng.uniform(args[0], args[1]))
+                elif kind == "log_uniform":
+                    params[name] = float(math.exp(rng.uniform(math.log(args[0]), math.log(args[1]))))
+                elif kind == "int":
+                    params[name] = int(rng.integers(args[0], args[1], endpoint=True))
+                elif kind == "choice":
+                    params[name] = args[0][int(rng.integers(len(args[0])))]
+                else:
+                    raise ValueError(f"Unknown search space type {kind} for {name}")
+            configs.append(params)
+        return configs
+
+    def _signature(self, number_of_rows: int) -> str:
+        # Inme se kuch bhi badla to purani trials ka matlab badal jaata hai, unhe reuse nahi karte
+        settings = {
+            "format": TRIALS_FORMAT_VERSION, "search_space": self.search_space, "n_trials": self.n_trials,
+            "rungs": self.rung_estimators(), "reduction_factor": self.reduction_factor,
+            "early_stopping_rounds": self.early_stopping_rounds, "valid_fraction": self.valid_fraction,
+            "random_state": self.random_state, "rows": number_of_rows, "resample": self.resample,
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _load_trials(self, signature: str) -> dict:
+        if not os.path.exists(self.trials_file_path):
+            return {}
+        content = read_yaml_file(self.trials_file_path) or {}
+        if content.get("signature") != signature:
+            logging.info(f"Search settings changed, ignoring previous trials in {self.trials_file_path}")
+            return {}
+        return {(trial["trial_id"], trial["rung"]): trial for trial in content.get("trials", [])}
+
+    def _save_trials(self, signature: str, trials: dict, best: Optional[dict] = None) -> None:
+        # Temp file + rename: beech mein process mare to bhi trials file kabhi adhoori nahi hoti
+        content = {"signature": signature, "best": best,
+                   "trials": [trials[key] for key in sorted(trials)]}
+        temp_file_path = f"{self.trials_file_path}.tmp"
+        write_yaml_file(temp_file_path, content)
+        os.replace(temp_file_path, self.trials_file_path)
+
+    def _split(self, y: np.ndarray) -> tuple:
+        from sklearn.model_selection import train_test_split
+
+        index = np.arange(len(y))
+        train_index, valid_index = train_test_split(index, test_size=self.valid_fraction,
+                                                    random_state=self.random_state, stratify=np.asarray(y))
+        return np.sort(train_index), np.sort(valid_index)
+
+    def _prepare_folds(self, x_source, y_source, train_index: np.ndarray, valid_index: np.ndarray) -> dict:
+        """
+        Train aur validation folds ek baar yahin bante hain (resample ho to SMOTETomek sirf train fold pe).
+        Input .npy paths hon to folds bhi trials file ke paas .npy mein likhe jaate hain aur workers unhe mmap
+        karte hain; arrays hon to arrays hi workers ko jaate hain.
+        """
+        x, y = _load_array(x_source), _load_array(y_source)
+        folds = {
+            "x_train": np.take(x, train_index, axis=0), "y_train": np.take(y, train_index),
+            "x_valid": np.take(x, valid_index, axis=0), "y_valid": np.take(y, valid_index),
+        }
+        if self.resample:
+            from imblearn.combine import SMOTETomek
+
+            smt = SMOTETomek(sampling_strategy="minority", random_state=self.random_state)
+            x_train, y_train = smt.fit_resample(folds["x_train"], folds["y_train"])
+            folds["x_train"] = np.ascontiguousarray(x_train, dtype=folds["x_train"].dtype)
+            folds["y_train"] = np.asarray(y_train, dtype=folds["y_train"].dtype)
+            logging.info(f"Resampled train fold to {len(y_train)} rows, validation fold keeps {len(valid_index)} rows")
+        if not isinstance(x_source, str):
+            return folds
+
+        fold_sources = {}
+        fold_dir = os.path.dirname(self.trials_file_path)
+        for name, array in folds.items():
+            fold_sources[name] = os.path.join(fold_dir, f"fold_{name}.npy")
+            np.save(fold_sources[name], array)
+        return fold_sources
+
+    def search(self, x_source, y_source) -> Optional[dict]:
+        """
+        x_source / y_source: .npy file path (folds bhi .npy mein, workers unhe mmap karte hain) ya array.
+        Sabse achhi trial (sabse oonche rung pe sabse kam validation logloss) return karta hai,
+        ya None agar budget mein ek bhi trial poori nahi hui.
+        """
+        try:
+            deadline = None if self.time_budget_seconds is None else time.time() + self.time_budget_seconds
+            y = _load_array(y_source)
+            train_index, valid_index = self._split(y)
+            signature = self._signature(len(y))
+            os.makedirs(os.path.dirname(self.trials_file_path), exist_ok=True)
+            trials = self._load_trials(signature)
+            configs = self.sample_configs()
+            if trials:
+                logging.info(f"Resuming hyperparameter search with {len(trials)} completed trials")
+            fold_sources = self._prepare_folds(x_source, y_source, train_index, valid_index)
+
+            executor = None
+            if self.max_workers > 1:
+                executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_trial_worker, initargs=(fold_sources, self.trial_nthread))
+            else:
+                # Ek hi worker ho to process spawn karne ka fayda nahi, isi process mein chalate hain
+                _init_trial_worker(fold_sources, self.trial_nthread, limit_threads=False)
+            try:
+                trial_ids = list(range(len(configs)))
+                for rung, n_estimators in enumerate(self.rung_estimators()):
+                    pending = [trial_id for trial_id in trial_ids if (trial_id, rung) not in trials]
+                    if not self._run_rung(executor, rung, n_estimators, pending, configs, deadline,
+                                          trials, signature):
+                        logging.info(f"Hyperparameter search time budget exhausted in rung {rung}")
+                        break
+                    rung_results = sorted((trials[(trial_id, rung)] for trial_id in trial_ids),
+                                          key=lambda trial: trial["valid_logloss"])
+                    logging.info(f"Rung {rung} ({n_estimators} estimators): best validation logloss "
+                                 f"{rung_results[0]['valid_logloss']:.5f} from trial {rung_results[0]['trial_id']}")
+                    trial_ids = [trial["trial_id"] for trial in
+                                 rung_results[:max(1, len(rung_results) // self.reduction_factor)]]
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                _worker_data.clear()
+
+            completed = [trial for trial in trials.values() if trial["status"] == "completed"]
+            if not completed:
+                return None
+            best = min(completed, key=lambda trial: (-trial["rung"], trial["valid_logloss"]))
+            self._save_trials(signature, trials, best=best)
+            logging.info(f"Best hyperparameters: {best['params']} (trial {best['trial_id']}, "
+                         f"{best['best_iteration'] + 1} estimators, validation logloss {best['valid_logloss']:.5f})")
+            return best
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def _run_rung(self, executor, rung: int, n_estimators: int, pending: list, configs: list,
+                  deadline: Optional[float], trials: dict, signature: str) -> bool:
+        """Rung ki baaki trials chalata hai; False agar budget khatam hone se koi trial poori nahi ho saki"""
+        args = lambda trial_id: (trial_id, rung, configs[trial_id], n_estimators, self.early_stopping_rounds,
+                                 deadline, self.random_state)
+        finished = True
+
+        def record(result: dict) -> None:
+            nonlocal finished
+            if result["status"] != "completed":
+                finished = False
+                return
+            trials[(result["trial_id"], rung)] = result
+            self._save_trials(signature, trials)
+
+        if executor is None:
+            for trial_id in pending:
+                if deadline is not None and time.time() > deadline:
+                    return False
+                record(_run_trial(*args(trial_id)))
+            return finished
+
+        futures = {executor.submit(_run_trial, *args(trial_id)) for trial_id in pending}
+        while futures:
+            done, futures = wait(futures, timeout=None if deadline is None else max(0.0, deadline - time.time()),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                record(future.result())
+            if deadline is not None and time.time() > deadline:
+                # Queue wali trials cancel; chal rahi trials deadline callback se khud ruk jaati hain
+                for future in futures:
+                    future.cancel()
+                for future in wait(futures).done:
+                    if not future.cancelled():
+                        record(future.result())
+                return False
+        return finished
@@ -0,0 +1,205 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from sensor.constant.training_pipeline import (
+    MODEL_BUNDLE_BOOSTER_FILE_NAME,
+    MODEL_BUNDLE_FORMAT_VERSION,
+    MODEL_BUNDLE_LOAD_WORKERS,
+    MODEL_BUNDLE_MANIFEST_FILE_NAME,
+    MODEL_BUNDLE_PREPROCESSING_FILE_NAME,
+    MODEL_PREDICT_NTHREAD,
+    SCHEMA_FILE_PATH,
+    TREE_ENSEMBLE_FILE_NAME,
+)
+from sensor.exception import SensorException
+from sensor.logger import logging
+from sensor.ml.model.estimator import SensorModel
+from sensor.ml.model.tree_ensemble import TreeEnsemble
+from sensor.utils.main_utils import load_object
+
+# Bundle files padhne ke liye shared pool (preprocessing aur predictor saath load hote hain)
+_load_executor: Optional[ThreadPoolExecutor] = None
+_load_executor_lock = threading.Lock()
+
+
+def _get_load_executor() -> ThreadPoolExecutor:
+    global _load_executor
+    with _load_executor_lock:
+        if _load_executor is None:
+            _load_executor = ThreadPoolExecutor(max_workers=MODEL_BUNDLE_LOAD_WORKERS,
+                                                thread_name_prefix="model-bundle")
+        return _load_executor
+
+
+def _file_digest(file_path: str) -> str:
+    with open(file_path, "rb") as file_obj:
+        return hashlib.sha256(file_obj.read()).hexdigest()
+
+
+def is_model_bundle(file_path: str) -> bool:
+    return os.path.basename(file_path) == MODEL_BUNDLE_MANIFEST_FILE_NAME
+
+
+def save_model_bundle(bundle_dir: str, sensor_model: SensorModel, metrics: Optional[dict] = None,
+                      schema_file_path: str = SCHEMA_FILE_PATH) -> str:
+    """
+    SensorModel ko bundle folder mein likhta hai aur manifest ka path return karta hai:
+    booster XGBoost ke native UBJSON mein, preprocessing plain arrays (.npz), booster ka TreeEnsemble roop,
+    aur manifest.json (format version, feature order, schema hash, metrics, files + sha256). Manifest sabse
+    aakhir mein likha jaata hai, isliye manifest dikhe to bundle poora hai.
+    """
+    try:
+        os.makedirs(bundle_dir, exist_ok=True)
+        preprocessing = sensor_model.get_preprocessing_arrays()
+        if not hasattr(sensor_model.model, "get_booster"):
+            raise ValueError(f"Model {type(sensor_model.model).__name__} cannot be saved as a bundle")
+        booster = sensor_model.model.get_booster()
+        iteration_range = list(sensor_model._iteration_range)
+
+        files = {
+            "preprocessing": MODEL_BUNDLE_PREPROCESSING_FILE_NAME,
+            "booster": MODEL_BUNDLE_BOOSTER_FILE_NAME,
+            "tree_ensemble": TREE_ENSEMBLE_FILE_NAME,
+        }
+        with open(os.path.join(bundle_dir, files["preprocessing"]), "wb") as file_obj:
+            np.savez(file_obj, **preprocessing)
+        with open(os.path.join(bundle_dir, files["booster"]), "wb") as file_obj:
+            file_obj.write(booster.save_raw("ubj"))
+        TreeEnsemble.from_xgboost(booster, iteration_range=iteration_range).save(
+            os.path.join(bundle_dir, files["tree_ensemble"]))
+
+        import xgboost
+
+        manifest = {
+            "format_version": MODEL_BUNDLE_FORMAT_VERSION,
+            "created_at": datetime.now().isoformat(),
+            "model_type": type(sensor_model.model).__name__,
+            "objective": "binary:logistic",
+            "iteration_range": iteration_range,
+            "feature_columns": [str(name) for name in preprocessing["feature_names"]],
+            "schema_hash": _file_digest(schema_file_path) if os.path.exists(schema_file_path) else None,
+            "metrics": metrics or {},
+            "library_versions": {"xgboost": xgboost.__version__, "numpy": np.__version__},
+            "files": {name: {"path": file_name, "sha256": _file_digest(os.path.join(bundle_dir, file_name))}
+                      for name, file_name in files.items()},
+        }
+        manifest_path = os.path.join(bundle_dir, MODEL_BUNDLE_MANIFEST_FILE_NAME)
+        temp_manifest_path = f"{manifest_path}.tmp-{os.getpid()}"
+        with open(temp_manifest_path, "w") as file_obj:
+            json.dump(manifest, file_obj, indent=2)
+        os.replace(temp_manifest_path, manifest_path)
+        logging.info(f"Model bundle saved at {bundle_dir}")
+        return manifest_path
+    except Exception as e:
+        raise SensorException(e, sys)
+
+
+class BundledSensorModel:
+    """
+    Bundle se lazily load hone wala SensorModel. Constructor sirf manifest padhta hai aur preprocessing arrays
+    aur predictor (native booster, ya predictor="numpy" pe TreeEnsemble, jisme xgboost import hi nahi hota)
+    ko pool pe saath load hone bhej deta hai; pehla transform/predict (ya resolve) unka intezaar karta hai.
+    """
+
+    def __init__(self, manifest_path: str, predictor: str = "native", nthread: Optional[int] = MODEL_PREDICT_NTHREAD):
+        try:
+            self.manifest_path = manifest_path
+            self.bundle_dir = os.path.dirname(manifest_path)
+            self.predictor = predictor
+            self.nthread = nthread
+            # JSON: 163 feature names wala YAML manifest parse karna hi poore bundle load se dheema tha
+            with open(manifest_path) as file_obj:
+                self.manifest = json.load(file_obj)
+            if self.manifest["format_version"] > MODEL_BUNDLE_FORMAT_VERSION:
+                raise ValueError(f"Model bundle format {self.manifest['format_version']} is newer than supported "
+                                 f"format {MODEL_BUNDLE_FORMAT_VERSION}")
+            if predictor not in ("native", "numpy"):
+                raise ValueError(f"Unknown predictor {predictor}")
+
+            executor = _get_load_executor()
+            self._preprocessing = executor.submit(self._load_preprocessing)
+            self._predictor = executor.submit(self._load_tree_ensemble if predictor == "numpy" else self._load_booster)
+            self._sensor_model: Optional[SensorModel] = None
+            self._lock = threading.Lock()
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    @property
+    def feature_columns(self) -> list:
+        return self.manifest["feature_columns"]
+
+    @property
+    def metrics(self) -> dict:
+        return self.manifest.get("metrics", {})
+
+    def _read(self, name: str) -> bytes:
+        file_info = self.manifest["files"][name]
+        with open(os.path.join(self.bundle_dir, file_info["path"]), "rb") as file_obj:
+            content = file_obj.read()
+        if hashlib.sha256(content).hexdigest() != file_info["sha256"]:
+            raise ValueError(f"Model bundle file {file_info['path']} does not match its manifest checksum")
+        return content
+
+    def _load_preprocessing(self) -> dict:
+        with np.load(io.BytesIO(self._read("preprocessing"))) as data:
+            return {name: data[name] for name in data.files}
+
+    def _load_booster(self):
+        import xgboost
+
+        booster = xgboost.Booster()
+        booster.load_model(bytearray(self._read("booster")))
+        return booster
+
+    def _load_tree_ensemble(self) -> TreeEnsemble:
+        return TreeEnsemble.load(io.BytesIO(self._read("tree_ensemble")))
+
+    def resolve(self) -> SensorModel:
+        """Dono parts load hone ka intezaar karke SensorModel banata hai (ek hi baar)"""
+        if self._sensor_model is None:
+            with self._lock:
+                if self._sensor_model is None:
+                    try:
+                        preprocessing = self._preprocessing.result()
+                        predictor = self._predictor.result()
+                        if self.predictor == "numpy":
+                            self._sensor_model = SensorModel.from_arrays(preprocessing, predictor, nthread=self.nthread)
+                        else:
+                            self._sensor_model = SensorModel.from_arrays(
+                                preprocessing, predictor, booster=predictor,
+                                iteration_range=self.manifest["iteration_range"], nthread=self.nthread)
+                    except Exception as e:
+                        raise SensorException(e, sys)
+        return self._sensor_model
+
+    def transform(self, x) -> np.ndarray:
+        return self.resolve().transform(x)
+
+    def predict(self, x):
+        return self.resolve().predict(x)
+
+
+def load_sensor_model(file_path: str, predictor: str = "native", nthread: Optional[int] = MODEL_PREDICT_NTHREAD):
+    """
+    Model path (bundle ka manifest.json, ya purana dill pickled model.pkl) se predict karne layak model.
+    Purane pickle ke saath exported TreeEnsemble ho aur predictor="numpy" to booster ki jagah woh lagta hai.
+    """
+    try:
+        if is_model_bundle(file_path):
+            return BundledSensorModel(file_path, predictor=predictor, nthread=nthread)
+        model = load_object(file_path)
+        tree_ensemble_file_path = os.path.join(os.path.dirname(file_path), TREE_ENSEMBLE_FILE_NAME)
+        if predictor == "numpy" and os.path.exists(tree_ensemble_file_path):
+            model = model.with_tree_ensemble(tree_ensemble_file_path)
+        return model
+    except Exception as e:
+        raise SensorException(e, sys)
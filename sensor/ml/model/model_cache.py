@@ -0,0 +1,144 @@
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from sensor.constant.application import MODEL_CACHE_POLL_INTERVAL_SECONDS, MODEL_SERVING_PREDICTOR
+from sensor.constant.training_pipeline import SAVED_MODEL_DIR
+from sensor.exception import SensorException
+from sensor.logger import logging
+from sensor.ml.model.estimator import ModelResolver
+from sensor.ml.model.model_bundle import BundledSensorModel, load_sensor_model
+
+
+def load_serving_model(model_path: str, predictor: str = MODEL_SERVING_PREDICTOR) -> object:
+    """
+    Saved model (bundle ya purana pickle) load karta hai. Bundle lazily load hota hai, isliye yahin resolve
+    karte hain: background thread poora load kare, swap ke baad requests ko intezaar na karna pade.
+    predictor="numpy": booster ki jagah NumPy tree evaluator (chhote batches pe tez, bade pe native tez hai)
+    """
+    model = load_sensor_model(model_path, predictor=predictor)
+    if isinstance(model, BundledSensorModel):
+        model.resolve()
+    return model
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    model: object
+    version: str
+    model_path: str
+    mtime_ns: int
+    loaded_at: str
+    load_seconds: float
+
+
+class ModelCache:
+    """
+    Process-wide best model cache: model ek baar load hota hai aur har request usi ko use karti hai.
+    Background thread saved_models ko poll karta hai; naya model push hua to wahi thread use load karta hai
+    aur phir ek hi reference assignment se swap karta hai. Jo request pehle se purana LoadedModel le chuki hai
+    woh usi pe khatam hoti hai.
+    """
+
+    def __init__(self, model_dir: str = SAVED_MODEL_DIR, poll_interval: float = MODEL_CACHE_POLL_INTERVAL_SECONDS,
+                 loader: Callable[[str], object] = load_serving_model):
+        self.model_dir = model_dir
+        self.poll_interval = poll_interval
+        self.loader = loader
+        self._current: Optional[LoadedModel] = None
+        self._load_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._failed: Optional[tuple] = None
+        self.last_error: Optional[str] = None
+
+    def _latest(self) -> Optional[tuple]:
+        model_resolver = ModelResolver(model_dir=self.model_dir)
+        if not model_resolver.is_model_exists():
+            return None
+        model_path = model_resolver.get_best_model_path()
+        return model_path, os.stat(model_path).st_mtime_ns
+
+    def refresh(self) -> bool:
+        """Naya model mila to load karke swap karta hai; swap hua to True"""
+        try:
+            with self._load_lock:
+                latest = self._latest()
+                if latest is None:
+                    return False
+                model_path, mtime_ns = latest
+                current = self._current
+                if current is not None and (current.model_path, current.mtime_ns) == (model_path, mtime_ns):
+                    return False
+                # Jo file load nahi ho paayi use dobara tabhi try karte hain jab woh badle (e.g. adhoori copy poori hui)
+                if self._failed == latest:
+                    return False
+
+                start = time.perf_counter()
+                try:
+                    model = self.loader(model_path)
+                except Exception:
+                    self._failed = latest
+                    raise
+                loaded = LoadedModel(
+                    model=model,
+                    version=os.path.basename(os.path.dirname(model_path)),
+                    model_path=model_path,
+                    mtime_ns=mtime_ns,
+                    loaded_at=datetime.now().isoformat(),
+                    load_seconds=round(time.perf_counter() - start, 4),
+                )
+                # Atomic swap: naye requests naya model dekhenge, chal rahi requests apna purana reference rakhti hain
+                self._current = loaded
+                self.last_error = None
+                logging.info(f"Model version {loaded.version} loaded in {loaded.load_seconds}s from {model_path}")
+                return True
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Kharab push serving ko nahi rokta: purana model chalta rehta hai, error /model pe dikhta hai
+                self.last_error = str(e)
+                logging.exception(e)
+
+    def start(self) -> None:
+        if self._watcher is None or not self._watcher.is_alive():
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, name="model-cache-watcher", daemon=True)
+            self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def get(self) -> Optional[LoadedModel]:
+        """Current model (pehli call pe synchronously load), ya None agar koi model saved nahi hai"""
+        if self._current is None:
+            self.refresh()
+        self.start()
+        return self._current
+
+    def info(self) -> dict:
+        current = self._current
+        if current is None:
+            return {"loaded": False, "model_dir": self.model_dir, "last_error": self.last_error}
+        return {
+            "loaded": True,
+            "version": current.version,
+            "model_path": current.model_path,
+            "loaded_at": current.loaded_at,
+            "load_seconds": current.load_seconds,
+            "poll_interval": self.poll_interval,
+            "last_error": self.last_error,
+        }
+
+
+# API process ka shared cache
+model_cache = ModelCache()
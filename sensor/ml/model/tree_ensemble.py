@@ -0,0 +1,168 @@
+import json
+import os
+import sys
+from typing import Optional
+
+import numpy as np
+
+from sensor.constant.training_pipeline import TREE_ENSEMBLE_BATCH_SIZE
+from sensor.exception import SensorException
+
+SUPPORTED_OBJECTIVES = ("binary:logistic",)
+
+
+class TreeEnsemble:
+    """
+    XGBoost booster ka array roop: saare trees ke nodes ek saath flat arrays mein (feature id, threshold,
+    left/right child, default_left, leaf value) aur har tree ka root index. Evaluator poore batch ke liye
+    saare trees ek saath NumPy se chalata hai (har depth level pe ek gather), xgboost import nahi hota.
+    Leaf nodes ke left/right khud unhi ko point karte hain, isliye max_depth steps ke baad har row leaf pe hoti hai.
+    """
+
+    ARRAYS = ("feature", "threshold", "left", "right", "default_left", "value", "roots")
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray, right: np.ndarray,
+                 default_left: np.ndarray, value: np.ndarray, roots: np.ndarray, base_score: float,
+                 num_feature: int, max_depth: int, objective: str = "binary:logistic"):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.base_score = float(base_score)
+        self.num_feature = int(num_feature)
+        self.max_depth = int(max_depth)
+        self.objective = objective
+        # binary:logistic ka base_score probability hai; trees margin (logit) space mein jodte hain
+        self.base_margin = np.float32(np.log(self.base_score / (1 - self.base_score)))
+
+    @property
+    def num_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_xgboost(cls, booster, iteration_range: Optional[tuple] = None) -> "TreeEnsemble":
+        """Booster ke JSON dump se arrays banata hai; iteration_range diya ho to sirf wahi boosting rounds"""
+        try:
+            learner = json.loads(booster.save_raw("json"))["learner"]
+            objective = learner["objective"]["name"]
+            if objective not in SUPPORTED_OBJECTIVES:
+                raise ValueError(f"Unsupported objective {objective}, expected one of {SUPPORTED_OBJECTIVES}")
+            model_param = learner["learner_model_param"]
+            base_score = float(str(model_param["base_score"]).strip("[]"))
+            model = learner["gradient_booster"]["model"]
+            trees = model["trees"]
+            if iteration_range is not None and iteration_range[1] > 0:
+                iteration_indptr = model["iteration_indptr"]
+                trees = trees[iteration_indptr[iteration_range[0]]:iteration_indptr[iteration_range[1]]]
+
+            feature, threshold, left, right, default_left, value, roots = [], [], [], [], [], [], []
+            max_depth = 0
+            offset = 0
+            for tree in trees:
+                if any(tree["split_type"]):
+                    raise ValueError("Categorical splits are not supported")
+                left_children = np.asarray(tree["left_children"], dtype=np.int32)
+                right_children = np.asarray(tree["right_children"], dtype=np.int32)
+                is_leaf = left_children == -1
+                node_ids = np.arange(len(left_children), dtype=np.int32)
+
+                feature.append(np.where(is_leaf, 0, tree["split_indices"]).astype(np.int32))
+                split_conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+                threshold.append(np.where(is_leaf, np.float32(0), split_conditions))
+                # Leaf pe split_conditions hi leaf value hai
+                value.append(np.where(is_leaf, split_conditions, np.float32(0)))
+                left.append(np.where(is_leaf, node_ids, left_children) + offset)
+                right.append(np.where(is_leaf, node_ids, right_children) + offset)
+                default_left.append(np.asarray(tree["default_left"], dtype=bool))
+                roots.append(offset)
+
+                depth = np.zeros(len(left_children), dtype=np.int32)
+                for node in range(len(left_children)):
+                    if not is_leaf[node]:
+                        depth[left_children[node]] = depth[right_children[node]] = depth[node] + 1
+                max_depth = max(max_depth, int(depth.max()))
+                offset += len(left_children)
+
+            return cls(
+                feature=np.concatenate(feature).astype(np.int32),
+                threshold=np.concatenate(threshold).astype(np.float32),
+                left=np.concatenate(left).astype(np.int32),
+                right=np.concatenate(right).astype(np.int32),
+                default_left=np.concatenate(default_left),
+                value=np.concatenate(value).astype(np.float32),
+                roots=np.asarray(roots, dtype=np.int32),
+                base_score=base_score,
+                num_feature=int(model_param["num_feature"]),
+                max_depth=max_depth,
+                objective=objective,
+            )
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def save(self, file_path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            meta = {"base_score": self.base_score, "num_feature": self.num_feature,
+                    "max_depth": self.max_depth, "objective": self.objective}
+            with open(file_path, "wb") as file_obj:
+                np.savez(file_obj, meta=np.asarray(json.dumps(meta)),
+                         **{name: getattr(self, name) for name in self.ARRAYS})
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    @classmethod
+    def load(cls, file_path: str) -> "TreeEnsemble":
+        try:
+            with np.load(file_path) as data:
+                meta = json.loads(str(data["meta"]))
+                return cls(**{name: data[name] for name in cls.ARRAYS}, **meta)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def predict_margin(self, x: np.ndarray, batch_size: int = TREE_ENSEMBLE_BATCH_SIZE) -> np.ndarray:
+        """
+        Har row ka margin (base margin + saare trees ke leaf values). Rows batch_size ke tukdon mein chalti hain
+        taaki (rows x trees) node matrix memory mein chhoti rahe.
+        """
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        if x.ndim != 2 or x.shape[1] != self.num_feature:
+            raise ValueError(f"Expected a 2-D array with {self.num_feature} features, got shape {x.shape}")
+        # children[2 * node + go_left]: ek hi gather mein agla node (leaf apne aap pe rehta hai)
+        children = np.stack([self.right, self.left], axis=1).ravel()
+        roots = self.roots[:, None]
+        margin = np.empty(len(x), dtype=np.float32)
+        for start in range(0, len(x), batch_size):
+            x_batch = x[start:start + batch_size]
+            number_of_rows = len(x_batch)
+            # Feature-major copy: ek node pe aayi lagataar rows ki values memory mein paas paas
+            flat = np.ascontiguousarray(x_batch.T).ravel()
+            has_missing = bool(np.isnan(flat).any())
+            # (trees x rows) layout: har tree ki row contiguous, leaf values ka sum bhi contiguous rows pe
+            rows = np.arange(number_of_rows, dtype=np.intp)[None, :]
+            feature_offset = self.feature.astype(np.intp) * number_of_rows
+            node = np.repeat(roots, number_of_rows, axis=1)
+            for _ in range(self.max_depth):
+                x_value = flat[feature_offset[node] + rows]
+                go_left = x_value < self.threshold[node]
+                if has_missing:
+                    missing = np.isnan(x_value)
+                    go_left = np.where(missing, self.default_left[node], go_left)
+                node = children[2 * node + go_left]
+            leaf_value = self.value[node]
+            # xgboost jaisa tree order mein float32 accumulation
+            batch_margin = np.full(len(x_batch), self.base_margin, dtype=np.float32)
+            for tree_leaf_value in leaf_value:
+                batch_margin += tree_leaf_value
+            margin[start:start + len(x_batch)] = batch_margin
+        return margin
+
+    def predict_proba(self, x: np.ndarray) -> np.ndarray:
+        """Positive class ki probability (binary:logistic)"""
+        margin = self.predict_margin(x)
+        return (np.float32(1) / (np.float32(1) + np.exp(-margin))).astype(np.float32)
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        return (self.predict_proba(x) > 0.5).astype(np.int64)
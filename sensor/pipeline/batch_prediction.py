@@ -0,0 +1,182 @@
+import io
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import BinaryIO, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from sensor.constant.application import PREDICTION_CHUNK_SIZE, PREDICTION_COLUMN_NAME
+from sensor.exception import SensorException
+from sensor.logger import logging
+from sensor.ml.model.estimator import TargetValueMapping
+from sensor.utils.schema import get_schema
+
+SUPPORTED_FORMATS = ("csv", "parquet")
+
+
+def get_file_format(file_name: Optional[str], content_type: Optional[str] = None) -> str:
+    """Upload ka format extension (ya content type) se: csv ya parquet"""
+    file_name = (file_name or "").lower()
+    content_type = (content_type or "").lower()
+    if file_name.endswith(".parquet") or "parquet" in content_type:
+        return "parquet"
+    if file_name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    raise ValueError(f"Unsupported file {file_name!r}, expected one of {SUPPORTED_FORMATS}")
+
+
+class BatchPredictionStats:
+    """Pichle batch prediction runs ki ginti aur throughput (rows/sec), /predict/stats ke liye"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total_requests = 0
+        self.total_rows = 0
+        self.last_run: Optional[dict] = None
+
+    def record(self, run: dict) -> None:
+        with self._lock:
+            self.total_requests += 1
+            self.total_rows += run["rows"]
+            self.last_run = run
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"total_requests": self.total_requests, "total_rows": self.total_rows, "last_run": self.last_run}
+
+
+batch_prediction_stats = BatchPredictionStats()
+
+
+class BatchPrediction:
+    """
+    Upload ki hui CSV/Parquet file ko chunk by chunk padhta hai, har chunk pe model.predict chalata hai aur
+    predicted_column ke saath wahi chunk output format mein bytes bana kar yield karta hai.
+    Memory chunk size se bound rehti hai, file kitni bhi badi ho.
+    """
+
+    def __init__(self, model, chunk_size: int = PREDICTION_CHUNK_SIZE):
+        try:
+            self.model = model
+            self.chunk_size = chunk_size
+            self.schema = get_schema()
+            self.reverse_mapping = TargetValueMapping().reverse_mapping()
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def read_chunks(self, file_obj: BinaryIO, file_format: str) -> Iterator[pd.DataFrame]:
+        """Input file ke chunks, schema dtypes mein cast kiye hue"""
+        if file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(file_obj)
+            for batch in parquet_file.iter_batches(batch_size=self.chunk_size):
+                yield self.schema.cast(batch.to_pandas())
+        else:
+            reader = pd.read_csv(file_obj, chunksize=self.chunk_size, na_values=self.schema.na_tokens,
+                                 dtype={self.schema.target_column: str})
+            with reader:
+                for chunk in reader:
+                    yield self.schema.cast(chunk)
+
+    def predict_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Training wale feature order mein model ko deta hai; input ke baaki columns output mein waise hi rehte hain"""
+        missing_columns = [column for column in self.schema.feature_columns if column not in chunk.columns]
+        if missing_columns:
+            raise ValueError(f"Input is missing {len(missing_columns)} feature columns: {missing_columns[:10]}")
+        y_pred = np.asarray(self.model.predict(chunk[self.schema.feature_columns]))
+        prediction = pd.Series(y_pred, index=chunk.index, name=PREDICTION_COLUMN_NAME).map(self.reverse_mapping)
+        # concat ek hi baar naya frame banata hai (cast ke baad chunk fragmented ho sakta hai)
+        return pd.concat([chunk, prediction], axis=1)
+
+    def get_output_schema(self, columns: list) -> pa.Schema:
+        """
+        Output ka Arrow schema pehle chunk ki values se nahi, Schema.dtype_map se banta hai: feature columns
+        numeric dtype, category aur prediction column string, aur baaki pass-through columns (truck_id jaise)
+        hamesha string. Isliye pehle chunk mein koi column poora null ho tab bhi baad ke chunks fit hote hain.
+        """
+        fields = []
+        for column in columns:
+            dtype = self.schema.dtype_map.get(column, str)
+            fields.append(pa.field(column, pa.string() if dtype is str else pa.from_numpy_dtype(dtype)))
+        return pa.schema(fields)
+
+    def to_arrow_table(self, chunk: pd.DataFrame, arrow_schema: pa.Schema) -> pa.Table:
+        """Chunk ko output schema ke column order mein laata hai; string columns ki values str ban jaati hain"""
+        chunk = chunk.reindex(columns=arrow_schema.names)
+        for field in arrow_schema:
+            if field.type == pa.string() and not pd.api.types.is_string_dtype(chunk[field.name].dtype):
+                chunk[field.name] = chunk[field.name].astype("string")
+        return pa.Table.from_pandas(chunk, schema=arrow_schema, preserve_index=False)
+
+    @staticmethod
+    def _get_writer(sink: BinaryIO, arrow_schema, output_format: str):
+        """CSV mein header pehle chunk ke saath jaata hai; Parquet mein har chunk ek row group hai"""
+        if output_format == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(sink, arrow_schema)
+        import pyarrow.csv as pa_csv
+
+        return pa_csv.CSVWriter(sink, arrow_schema, write_options=pa_csv.WriteOptions(quoting_style="needed"))
+
+    def stream(self, file_obj: BinaryIO, input_format: str, output_format: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Predictions ko output format (default: input wala) ke bytes mein stream karta hai, har chunk ke baad
+        jitne bytes bane utne hi.
+        """
+        output_format = output_format or input_format
+        if input_format not in SUPPORTED_FORMATS or output_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format, expected one of {SUPPORTED_FORMATS}")
+
+        start = time.perf_counter()
+        number_of_rows = 0
+        number_of_chunks = 0
+        buffer = io.BytesIO()
+        writer = None
+        arrow_schema = None
+        try:
+            for chunk in self.read_chunks(file_obj, input_format):
+                chunk = self.predict_chunk(chunk)
+                # Dono formats Arrow writers se likhe jaate hain: pandas to_csv ka float formatting
+                # predict se kayi guna dheema tha
+                if writer is None:
+                    arrow_schema = self.get_output_schema(list(chunk.columns))
+                    writer = self._get_writer(buffer, arrow_schema, output_format)
+                writer.write_table(self.to_arrow_table(chunk, arrow_schema))
+
+                number_of_rows += len(chunk)
+                number_of_chunks += 1
+                # Jo bytes ban gaye woh turant client ko, buffer khaali
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+            if writer is not None:
+                # Parquet footer close pe likha jaata hai
+                writer.close()
+                writer = None
+                yield buffer.getvalue()
+        except Exception as e:
+            raise SensorException(e, sys)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        seconds = time.perf_counter() - start
+        run = {
+            "rows": number_of_rows,
+            "chunks": number_of_chunks,
+            "seconds": round(seconds, 4),
+            "rows_per_second": round(number_of_rows / seconds, 1) if seconds > 0 else None,
+            "input_format": input_format,
+            "output_format": output_format,
+            "finished_at": datetime.now().isoformat(),
+        }
+        batch_prediction_stats.record(run)
+        logging.info(f"Batch prediction: {number_of_rows} rows in {number_of_chunks} chunks, "
+                     f"{run['rows_per_second']} rows/sec")
@@ -0,0 +1,110 @@
+import json
+import struct
+import sys
+
+import numpy as np
+import pandas as pd
+
+from sensor.constant.application import PREDICTION_COLUMN_NAME
+from sensor.exception import SensorException
+from sensor.ml.model.estimator import TargetValueMapping
+from sensor.utils.schema import get_schema
+
+ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+FLOAT32_MATRIX_CONTENT_TYPE = "application/x-sensor-float32"
+BINARY_CONTENT_TYPES = (ARROW_STREAM_CONTENT_TYPE, FLOAT32_MATRIX_CONTENT_TYPE)
+
+# Raw format framing: <uint32 little-endian header length><UTF-8 JSON header><payload>
+HEADER_LENGTH = struct.Struct("<I")
+FLOAT32_DTYPE = np.dtype("<f4")
+LABEL_DTYPE = np.dtype("i1")
+
+
+def _column_order(columns: list, feature_columns: list) -> list:
+    """Request ke columns mein har feature ka index (schema feature order mein); koi feature missing ho to error"""
+    position = {column: index for index, column in enumerate(columns)}
+    missing_columns = [column for column in feature_columns if column not in position]
+    if missing_columns:
+        raise ValueError(f"Input is missing {len(missing_columns)} feature columns: {missing_columns[:10]}")
+    return [position[column] for column in feature_columns]
+
+
+def decode_float32_matrix(body: bytes) -> pd.DataFrame:
+    """
+    Raw float32 request: JSON header {"columns": [...], "rows": n} ke baad n x len(columns) row-major
+    little-endian float32. Columns schema ke feature order mein hon to bytes bina copy ke matrix ban jaate hain,
+    warna ek baar columns reorder hote hain. NaN = missing value.
+    """
+    try:
+        (header_length,) = HEADER_LENGTH.unpack_from(body)
+        header = json.loads(bytes(body[HEADER_LENGTH.size:HEADER_LENGTH.size + header_length]))
+        columns = header["columns"]
+        number_of_rows = int(header["rows"])
+        offset = HEADER_LENGTH.size + header_length
+        expected_size = number_of_rows * len(columns) * FLOAT32_DTYPE.itemsize
+        if len(body) - offset != expected_size:
+            raise ValueError(f"Expected {expected_size} payload bytes for {number_of_rows} x {len(columns)} float32, "
+                             f"got {len(body) - offset}")
+
+        matrix = np.frombuffer(body, dtype=FLOAT32_DTYPE, offset=offset).reshape(number_of_rows, len(columns))
+        feature_columns = get_schema().feature_columns
+        if columns != feature_columns:
+            matrix = matrix[:, _column_order(columns, feature_columns)]
+        return pd.DataFrame(matrix, columns=feature_columns, copy=False)
+    except Exception as e:
+        raise SensorException(e, sys)
+
+
+def decode_arrow_stream(body: bytes) -> pd.DataFrame:
+    """
+    Arrow IPC stream request: feature columns naam se uthte hain (order aur extra columns se farak nahi padta).
+    Float32 columns bina nulls ke seedha buffers se NumPy mein aate hain; nulls NaN bante hain.
+    """
+    try:
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+        feature_columns = get_schema().feature_columns
+        _column_order(table.column_names, feature_columns)
+        matrix = np.empty((table.num_rows, len(feature_columns)), dtype=FLOAT32_DTYPE, order="F")
+        for index, column in enumerate(feature_columns):
+            matrix[:, index] = table.column(column).cast(pa.float32()).to_numpy(zero_copy_only=False)
+        return pd.DataFrame(matrix, columns=feature_columns, copy=False)
+    except Exception as e:
+        raise SensorException(e, sys)
+
+
+def encode_float32_predictions(y_pred: np.ndarray) -> bytes:
+    """Raw response: JSON header {"rows": n, "dtype": "int8", "labels": [...]} ke baad n int8 class ids"""
+    reverse_mapping = TargetValueMapping().reverse_mapping()
+    labels = [reverse_mapping[class_id] for class_id in sorted(reverse_mapping)]
+    header = json.dumps({"rows": len(y_pred), "dtype": LABEL_DTYPE.name, "labels": labels}).encode()
+    return HEADER_LENGTH.pack(len(header)) + header + np.asarray(y_pred, dtype=LABEL_DTYPE).tobytes()
+
+
+def encode_arrow_predictions(y_pred: np.ndarray) -> bytes:
+    """Arrow IPC stream response: ek dictionary column predicted_column (class ids + labels)"""
+    import pyarrow as pa
+
+    reverse_mapping = TargetValueMapping().reverse_mapping()
+    labels = pa.array([reverse_mapping[class_id] for class_id in sorted(reverse_mapping)])
+    predictions = pa.DictionaryArray.from_arrays(pa.array(np.asarray(y_pred, dtype=LABEL_DTYPE)), labels)
+    table = pa.table({PREDICTION_COLUMN_NAME: predictions})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def predict_binary(model, body: bytes, content_type: str) -> bytes:
+    """Binary request ko decode karke model chalata hai aur predictions usi binary format mein lautata hai"""
+    try:
+        if content_type == ARROW_STREAM_CONTENT_TYPE:
+            y_pred = np.asarray(model.predict(decode_arrow_stream(body)))
+            return encode_arrow_predictions(y_pred)
+        if content_type == FLOAT32_MATRIX_CONTENT_TYPE:
+            y_pred = np.asarray(model.predict(decode_float32_matrix(body)))
+            return encode_float32_predictions(y_pred)
+        raise ValueError(f"Unsupported content type {content_type!r}, expected one of {BINARY_CONTENT_TYPES}")
+    except Exception as e:
+        raise SensorException(e, sys)
@@ -0,0 +1,60 @@
+import os
+import sys
+from datetime import datetime
+from typing import Optional
+
+from sensor.exception import SensorException
+from sensor.logger import logging
+from sensor.utils.main_utils import load_object, read_yaml_file, save_object, write_yaml_file
+
+
+class RunCheckpoint:
+    """
+    Ek pipeline run (artifact/<run_id>) ka checkpoint manifest.
+    Har stage ke poora hone ke baad uska artifact pickle hota hai aur manifest mein stage "completed" likha jaata hai;
+    usi run ko dobara chalane par completed stages skip hote hain aur pehle adhoore stage se kaam shuru hota hai.
+    """
+
+    def __init__(self, checkpoint_file_path: str, checkpoint_dir: str):
+        try:
+            self.checkpoint_file_path = checkpoint_file_path
+            self.checkpoint_dir = checkpoint_dir
+            self.manifest = {"stages": {}}
+            if os.path.exists(checkpoint_file_path):
+                self.manifest = read_yaml_file(checkpoint_file_path) or {"stages": {}}
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def get_stage(self, stage_name: str) -> Optional[dict]:
+        return self.manifest["stages"].get(stage_name)
+
+    def load_artifact(self, stage_name: str):
+        """Completed stage ka artifact, ya None agar stage poora nahi hua tha"""
+        try:
+            stage = self.get_stage(stage_name)
+            if stage is None or stage.get("status") != "completed":
+                return None
+            artifact_file_path = os.path.join(self.checkpoint_dir, stage["artifact_file"])
+            if not os.path.exists(artifact_file_path):
+                return None
+            return load_object(artifact_file_path)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def record(self, stage_name: str, artifact, fingerprint: Optional[str] = None) -> None:
+        """Artifact pehle likhte hain, manifest baad mein (temp file + rename), taaki adhoora checkpoint kabhi na padha jaaye"""
+        try:
+            artifact_file_name = f"{stage_name}.pkl"
+            save_object(os.path.join(self.checkpoint_dir, artifact_file_name), artifact)
+            self.manifest["stages"][stage_name] = {
+                "status": "completed",
+                "artifact_file": artifact_file_name,
+                "fingerprint": fingerprint,
+                "completed_at": datetime.now().isoformat(),
+            }
+            temp_file_path = f"{self.checkpoint_file_path}.tmp"
+            write_yaml_file(temp_file_path, self.manifest)
+            os.replace(temp_file_path, self.checkpoint_file_path)
+            logging.info(f"Checkpoint written for stage {stage_name}")
+        except Exception as e:
+            raise SensorException(e, sys)
@@ -0,0 +1,173 @@
+import contextvars
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from sensor.exception import SensorException
+from sensor.logger import logging
+
+# Pipeline run ke dauraan chalne wale saare graphs (stage ke andar wale bhi) apni timings isi report mein likhte hain
+_current_report = contextvars.ContextVar("sensor_timing_report", default=None)
+
+
+def _timed(func: Callable, kwargs: dict) -> tuple:
+    # Module level taaki process pool mein bhi pickle ho; start/end worker ke andar lete hain taaki queue mein
+    # wait kiya time run time na gina jaaye. perf_counter system-wide monotonic clock hai, processes mein comparable
+    start = time.perf_counter()
+    output = func(**kwargs)
+    return output, start, time.perf_counter()
+
+
+@dataclass
+class Task:
+    name: str
+    func: Callable
+    inputs: list = field(default_factory=list)
+
+
+class TimingReport:
+    """
+    Ek run ki saari tasks ki timings (run start se seconds mein) aur har graph ka critical path.
+    Nested graphs ki tasks "<graph>.<task>" naam se aati hain.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.tasks = {}
+        self.critical_paths = {}
+
+    def record(self, name: str, start: float, end: float, inputs: list) -> None:
+        self.tasks[name] = {
+            "start": round(start - self.started_at, 4),
+            "end": round(end - self.started_at, 4),
+            "duration": round(end - start, 4),
+            "inputs": list(inputs),
+        }
+
+    def to_dict(self) -> dict:
+        wall_time = max([task["end"] for task in self.tasks.values()], default=0.0)
+        return {"wall_time": wall_time, "tasks": self.tasks, "critical_paths": self.critical_paths}
+
+    @classmethod
+    def start(cls) -> tuple:
+        """Naya report is context ke liye active karta hai; (report, token) return, token se reset hota hai"""
+        report = cls()
+        return report, _current_report.set(report)
+
+    @staticmethod
+    def reset(token) -> None:
+        _current_report.reset(token)
+
+
+class TaskGraph:
+    """
+    Chhota DAG executor: har task apne inputs (doosre tasks ke naam) declare karta hai aur unke outputs
+    keyword arguments mein paata hai (task ka naam = argument ka naam). Jo tasks ek doosre pe depend nahi karte
+    woh pool pe saath chalte hain. executor="process" ke liye functions picklable (module level) hone chahiye.
+    """
+
+    def __init__(self, name: str, max_workers: Optional[int] = None, executor: str = "thread"):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.name = name
+        self.max_workers = max_workers
+        self.executor = executor
+        self.tasks = {}
+        self.timings = {}
+
+    def add_task(self, name: str, func: Callable, inputs: list = ()) -> "TaskGraph":
+        if name in self.tasks:
+            raise ValueError(f"Task {name} already exists in graph {self.name}")
+        self.tasks[name] = Task(name, func, list(inputs))
+        return self
+
+    def _validate(self) -> None:
+        for task in self.tasks.values():
+            for input_name in task.inputs:
+                if input_name not in self.tasks:
+                    raise ValueError(f"Task {task.name} needs unknown task {input_name}")
+        # Kahn's algorithm: agar saare tasks order mein nahi aa paaye to cycle hai
+        remaining = {name: len(task.inputs) for name, task in self.tasks.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for task in self.tasks.values():
+                if name in task.inputs:
+                    remaining[task.name] -= 1
+                    if remaining[task.name] == 0:
+                        ready.append(task.name)
+        if visited != len(self.tasks):
+            raise ValueError(f"Graph {self.name} has a cycle")
+
+    def critical_path(self) -> list:
+        """Sabse lamba (durations ka sum) dependency chain, jo poore graph ka minimum wall time decide karta hai"""
+        finish, previous = {}, {}
+
+        def longest(name: str) -> float:
+            if name not in finish:
+                task = self.tasks[name]
+                best_input = max(task.inputs, key=longest, default=None)
+                previous[name] = best_input
+                finish[name] = (longest(best_input) if best_input else 0.0) + self.timings[name]["duration"]
+            return finish[name]
+
+        if not self.timings:
+            return []
+        last = max(self.timings, key=longest)
+        path = []
+        while last is not None:
+            path.append(last)
+            last = previous[last]
+        return path[::-1]
+
+    def run(self) -> dict:
+        """Saare tasks chala kar {task_name: output} return karta hai; koi task fail hua to baaki cancel ho kar error"""
+        try:
+            self._validate()
+            report = _current_report.get()
+            results = {}
+            pending = dict(self.tasks)
+            running = {}
+            pool_class = ThreadPoolExecutor if self.executor == "thread" else ProcessPoolExecutor
+            max_workers = self.max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+            with pool_class(max_workers=max_workers) as pool:
+                while pending or running:
+                    for name in [name for name, task in pending.items()
+                                 if all(input_name in results for input_name in task.inputs)]:
+                        task = pending.pop(name)
+                        kwargs = {input_name: results[input_name] for input_name in task.inputs}
+                        if self.executor == "thread":
+                            # Context copy karte hain taaki task ke andar ke nested graphs bhi same report mein likhein
+                            future = pool.submit(contextvars.copy_context().run, _timed, task.func, kwargs)
+                        else:
+                            future = pool.submit(_timed, task.func, kwargs)
+                        running[future] = name
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        error = future.exception()
+                        if error is not None:
+                            for other in running:
+                                other.cancel()
+                            raise error
+                        output, start, end = future.result()
+                        results[name] = output
+                        self.timings[name] = {"start": start, "end": end, "duration": end - start}
+                        if report is not None:
+                            report.record(f"{self.name}.{name}", start, end,
+                                          [f"{self.name}.{input_name}" for input_name in self.tasks[name].inputs])
+
+            critical_path = self.critical_path()
+            if report is not None:
+                report.critical_paths[self.name] = critical_path
+            logging.info(f"Graph {self.name} finished, critical path: {critical_path}")
+            return results
+        except Exception as e:
+            raise SensorException(e, sys)
@@ -0,0 +1,177 @@
+import asyncio
+import bisect
+import sys
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from sensor.constant.application import (
+    MICRO_BATCH_MAX_QUEUE_SIZE,
+    MICRO_BATCH_MAX_SIZE,
+    MICRO_BATCH_MAX_WAIT_MS,
+)
+from sensor.exception import SensorException
+from sensor.logger import logging
+from sensor.ml.model.estimator import TargetValueMapping
+from sensor.ml.model.model_cache import model_cache
+from sensor.utils.schema import get_schema
+
+
+class MicroBatcher:
+    """
+    Asyncio micro-batcher: concurrent requests ke records ek queue mein aate hain, worker unhe max_batch_size rows
+    ya max_wait_ms (jo pehle ho) tak jama karke ek hi vectorized predict_fn call chalata hai aur har caller ko
+    uske hisse ke results wapas deta hai. predict_fn thread pool mein chalta hai taaki event loop block na ho;
+    jab tak ek batch chal raha hai, agla batch queue mein banta rehta hai.
+    """
+
+    def __init__(self, predict_fn: Callable[[list], list], max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+                 max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS, max_queue_size: int = MICRO_BATCH_MAX_QUEUE_SIZE):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop = None
+
+        self.pending_rows = 0
+        self.number_of_batches = 0
+        self.number_of_rows = 0
+        self.last_batch_seconds: Optional[float] = None
+        # Batch size histogram ke buckets: 1, 2, 4, ... max_batch_size (upper bound inclusive)
+        self.batch_size_buckets = sorted({min(2 ** i, max_batch_size)
+                                          for i in range(max_batch_size.bit_length() + 1)})
+        self.batch_size_counts = [0] * (len(self.batch_size_buckets) + 1)
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = loop.create_task(self._run())
+
+    async def predict(self, records: list) -> list:
+        """Records ko agle batch mein daal kar unke predictions ka intezaar; queue bhari ho to asyncio.QueueFull"""
+        self._ensure_started()
+        future = self._loop.create_future()
+        self._queue.put_nowait((records, future))
+        self.pending_rows += len(records)
+        return await future
+
+    async def _next_batch(self, carry: Optional[tuple]) -> tuple:
+        """Pehle item ke baad max_wait tak ya max_batch_size rows hone tak items jama karta hai"""
+        loop = asyncio.get_running_loop()
+        batch = [carry if carry is not None else await self._queue.get()]
+        batch_size = len(batch[0][0])
+        deadline = loop.time() + self.max_wait
+        while batch_size < self.max_batch_size:
+            timeout = deadline - loop.time()
+            try:
+                item = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            if batch_size + len(item[0]) > self.max_batch_size:
+                # Yeh item batch ko max se bada kar deta; agle batch ka pehla item banega
+                return batch, item
+            batch.append(item)
+            batch_size += len(item[0])
+        return batch, None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        carry = None
+        while True:
+            batch, carry = await self._next_batch(carry)
+            rows = [record for records, _ in batch for record in records]
+            self.pending_rows -= len(rows)
+
+            start = time.perf_counter()
+            try:
+                predictions = await loop.run_in_executor(None, self.predict_fn, rows)
+            except Exception as e:
+                logging.exception(e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self._record(len(rows), time.perf_counter() - start)
+
+            offset = 0
+            for records, future in batch:
+                # Client chala gaya ho (future cancel) to uska hissa chhod dete hain
+                if not future.done():
+                    future.set_result(predictions[offset:offset + len(records)])
+                offset += len(records)
+
+    def _record(self, batch_size: int, seconds: float) -> None:
+        self.number_of_batches += 1
+        self.number_of_rows += batch_size
+        self.last_batch_seconds = round(seconds, 6)
+        self.batch_size_counts[bisect.bisect_left(self.batch_size_buckets, batch_size)] += 1
+
+    def stats(self) -> dict:
+        histogram = {f"<={bucket}": count for bucket, count in zip(self.batch_size_buckets, self.batch_size_counts)}
+        if self.batch_size_counts[-1]:
+            histogram[f">{self.batch_size_buckets[-1]}"] = self.batch_size_counts[-1]
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "pending_rows": self.pending_rows,
+            "batches": self.number_of_batches,
+            "rows": self.number_of_rows,
+            "mean_batch_size": round(self.number_of_rows / self.number_of_batches, 2) if self.number_of_batches else None,
+            "last_batch_seconds": self.last_batch_seconds,
+            "batch_size_histogram": histogram,
+        }
+
+
+def records_to_dataframe(records: list, schema) -> pd.DataFrame:
+    """
+    JSON records ko seedha schema dtype wali feature matrix mein: chhote batches pe from_records + cast
+    (har column pe object -> numeric) predict se kayi guna mehenga padta tha.
+    Missing feature, None, NA token ya number na ban paane wali value NaN banti hai; anjaan keys ignore.
+    """
+    column_index = {column: index for index, column in enumerate(schema.feature_columns)}
+    na_tokens = set(schema.na_tokens)
+    empty_row = [np.nan] * len(column_index)
+    rows = []
+    for record in records:
+        row = empty_row.copy()
+        for column, value in record.items():
+            index = column_index.get(column)
+            if index is None or value is None:
+                continue
+            try:
+                if value not in na_tokens:
+                    row[index] = float(value)
+            except (TypeError, ValueError):
+                pass
+        rows.append(row)
+    matrix = np.array(rows, dtype=schema.numeric_dtype).reshape(len(rows), len(column_index))
+    return pd.DataFrame(matrix, columns=schema.feature_columns)
+
+
+def predict_records(records: list) -> list:
+    """
+    JSON records (feature name -> value) ki list pe ek vectorized predict. Jo features record mein nahi hain
+    woh NaN (aur NA tokens bhi), jaise training mein missing values the.
+    """
+    try:
+        loaded_model = model_cache.get()
+        if loaded_model is None:
+            raise Exception("Model is not available")
+        schema = get_schema()
+        dataframe = records_to_dataframe(records, schema)
+        y_pred = np.asarray(loaded_model.model.predict(dataframe))
+        reverse_mapping = TargetValueMapping().reverse_mapping()
+        return [reverse_mapping[int(value)] for value in y_pred]
+    except Exception as e:
+        raise SensorException(e, sys)
+
+
+# API process ka shared batcher (event loop pe pehli request aane par start hota hai)
+online_batcher = MicroBatcher(predict_records)
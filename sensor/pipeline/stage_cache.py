@@ -0,0 +1,169 @@
+import dataclasses
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import time
+from typing import Iterable, Optional
+
+from sensor.exception import SensorException
+from sensor.logger import logging
+from sensor.utils.main_utils import load_object, read_yaml_file, save_object, write_yaml_file
+
+# Cache entry ka format badle to ise badlo, taaki purani entries match hi na hon
+STAGE_CACHE_FORMAT_VERSION = 1
+ARTIFACT_DIR_PLACEHOLDER = "<artifact_dir>"
+TIMESTAMP_PLACEHOLDER = "<timestamp>"
+
+
+class StageCache:
+    """
+    TrainPipeline stages ke liye content-addressed cache.
+    Har stage ka fingerprint = stage naam + upstream stages ke fingerprints + config values + stage code ki files
+    (+ koi extra input, jaise MongoDB collection ka signature). Fingerprint match hua to stage dobara nahi chalta:
+    cache entry se stage folder current run ke artifact folder mein copy hota hai aur artifact wapas milta hai.
+    Cache size max_size_bytes se upar jaaye to sabse pehle least-recently-used entries hat ti hain.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: int):
+        try:
+            self.cache_dir = cache_dir
+            self.max_size_bytes = max_size_bytes
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    @staticmethod
+    def _normalize(value, artifact_dir: str, timestamp: str):
+        # Run-specific cheezein (artifact/<timestamp> path, timestamp) fingerprint mein nahi aani chahiye
+        if isinstance(value, str):
+            return value.replace(artifact_dir, ARTIFACT_DIR_PLACEHOLDER).replace(timestamp, TIMESTAMP_PLACEHOLDER)
+        if isinstance(value, dict):
+            return {str(k): StageCache._normalize(v, artifact_dir, timestamp) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [StageCache._normalize(v, artifact_dir, timestamp) for v in value]
+        return value
+
+    def fingerprint(self, stage_name: str, config, artifact_dir: str, timestamp: str,
+                    upstream: Iterable[str] = (), code: Iterable = (), files: Iterable[str] = (),
+                    extra: Optional[dict] = None) -> str:
+        """
+        config: stage ka config object (uske attributes hash hote hain)
+        upstream: pehle wale stages ke fingerprints (unke inputs ka hash isi mein aa jaata hai)
+        code: classes/modules jinke source files ka content hash hota hai
+        files: aur files jinka content input hai (e.g. schema.yaml)
+        """
+        try:
+            digest = hashlib.sha256()
+            config_values = self._normalize(vars(config), artifact_dir, timestamp)
+            payload = {
+                "format": STAGE_CACHE_FORMAT_VERSION,
+                "stage": stage_name,
+                "upstream": list(upstream),
+                "config": config_values,
+                "extra": self._normalize(extra or {}, artifact_dir, timestamp),
+            }
+            digest.update(json.dumps(payload, sort_keys=True, default=str).encode("utf-8"))
+
+            source_files = sorted({inspect.getsourcefile(obj) for obj in code})
+            for file_path in source_files + list(files):
+                digest.update(os.path.basename(file_path).encode("utf-8"))
+                with open(file_path, "rb") as file_obj:
+                    for block in iter(lambda: file_obj.read(1 << 20), b""):
+                        digest.update(block)
+            return digest.hexdigest()
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    @staticmethod
+    def _relocate(value, source_dir: str, target_dir: str):
+        # Artifact ke andar ke saare paths (nested dataclasses bhi) ek artifact folder se doosre mein badalta hai
+        if isinstance(value, str) and value.startswith(source_dir):
+            return target_dir + value[len(source_dir):]
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return dataclasses.replace(value, **{
+                field.name: StageCache._relocate(getattr(value, field.name), source_dir, target_dir)
+                for field in dataclasses.fields(value)
+            })
+        return value
+
+    def get(self, key: str, stage_dir: str, artifact_dir: str):
+        """Cache hit pe stage folder restore karke artifact return karta hai, miss pe None"""
+        try:
+            entry_dir = self._entry_dir(key)
+            meta_file_path = os.path.join(entry_dir, "meta.yaml")
+            if not os.path.exists(meta_file_path):
+                return None
+
+            cached_stage_dir = os.path.join(entry_dir, "stage")
+            if os.path.isdir(cached_stage_dir):
+                shutil.copytree(cached_stage_dir, stage_dir, dirs_exist_ok=True)
+            artifact = load_object(os.path.join(entry_dir, "artifact.pkl"))
+            # LRU eviction ke liye last use ka time meta file ke mtime mein
+            os.utime(meta_file_path)
+            return self._relocate(artifact, ARTIFACT_DIR_PLACEHOLDER, artifact_dir)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def put(self, key: str, stage_name: str, stage_dir: str, artifact, artifact_dir: str) -> None:
+        """Stage folder aur artifact ko cache mein likhta hai (pehle temp folder, phir atomic rename)"""
+        try:
+            entry_dir = self._entry_dir(key)
+            if os.path.exists(entry_dir):
+                return
+            temp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            os.makedirs(temp_dir)
+            if os.path.isdir(stage_dir):
+                shutil.copytree(stage_dir, os.path.join(temp_dir, "stage"))
+            save_object(os.path.join(temp_dir, "artifact.pkl"),
+                        self._relocate(artifact, artifact_dir, ARTIFACT_DIR_PLACEHOLDER))
+            write_yaml_file(os.path.join(temp_dir, "meta.yaml"), {
+                "stage": stage_name,
+                "created_at": time.time(),
+                "size_bytes": self._dir_size(temp_dir),
+            })
+            try:
+                os.replace(temp_dir, entry_dir)
+            except OSError:
+                # Kisi aur run ne same entry pehle likh di
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            self.evict(keep=key)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    @staticmethod
+    def _dir_size(dir_path: str) -> int:
+        size = 0
+        for root, _, file_names in os.walk(dir_path):
+            for file_name in file_names:
+                size += os.path.getsize(os.path.join(root, file_name))
+        return size
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Total size max_size_bytes se neeche aane tak least-recently-used entries delete karta hai"""
+        try:
+            entries = []
+            for key in os.listdir(self.cache_dir):
+                meta_file_path = os.path.join(self._entry_dir(key), "meta.yaml")
+                if not os.path.exists(meta_file_path):
+                    continue
+                meta = read_yaml_file(meta_file_path)
+                entries.append((os.path.getmtime(meta_file_path), key, meta.get("size_bytes", 0)))
+
+            total_size = sum(size for _, _, size in entries)
+            for _, key, size in sorted(entries):
+                if total_size <= self.max_size_bytes:
+                    break
+                if key == keep:
+                    continue
+                shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+                total_size -= size
+                logging.info(f"Stage cache entry {key} evicted")
+        except Exception as e:
+            raise SensorException(e, sys)
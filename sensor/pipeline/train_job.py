@@ -0,0 +1,262 @@
+import fcntl
+import multiprocessing
+import os
+import re
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+from sensor.constant.training_pipeline import (
+    ARTIFACT_DIR,
+    PIPELINE_CHECKPOINT_FILE_NAME,
+    PIPELINE_TIMING_REPORT_FILE_NAME,
+    TRAINING_JOB_DIR,
+    TRAINING_JOB_ID_PATTERN,
+    TRAINING_JOB_SLOT_FILE_NAME,
+    TRAINING_JOB_LOCK_FILE_NAME,
+)
+from sensor.entity.config_entity import TrainingPipelineConfig
+from sensor.exception import SensorException
+from sensor.logger import logging
+from sensor.utils.main_utils import read_yaml_file, write_yaml_file
+
+PIPELINE_STAGES = ["data_ingestion", "data_validation", "data_transformation",
+                   "model_trainer", "model_evaluation", "model_pusher"]
+
+# API process ka apna worker pool (ek hi slot); spawn taaki event loop wale process ke threads fork na hon
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+class TrainingJobStore:
+    """Har training job ka status training_jobs/<job_id>.yaml mein, taaki API ke saare worker processes ise padh sakein"""
+
+    def __init__(self, job_dir: str = TRAINING_JOB_DIR):
+        self.job_dir = job_dir
+        os.makedirs(job_dir, exist_ok=True)
+
+    @staticmethod
+    def is_valid_job_id(job_id) -> bool:
+        # Job id uuid4().hex hi hota hai; "..%2F" jaisi value path mein na jud paaye
+        return isinstance(job_id, str) and re.fullmatch(TRAINING_JOB_ID_PATTERN, job_id) is not None
+
+    def _job_file_path(self, job_id: str) -> str:
+        if not self.is_valid_job_id(job_id):
+            raise ValueError(f"Invalid job id {job_id!r}")
+        return os.path.join(self.job_dir, f"{job_id}.yaml")
+
+    def get(self, job_id: str) -> Optional[dict]:
+        if not self.is_valid_job_id(job_id):
+            return None
+        file_path = self._job_file_path(job_id)
+        if not os.path.exists(file_path):
+            return None
+        return read_yaml_file(file_path)
+
+    def save(self, job: dict) -> dict:
+        file_path = self._job_file_path(job["job_id"])
+        temp_file_path = f"{file_path}.tmp-{os.getpid()}"
+        write_yaml_file(temp_file_path, job)
+        os.replace(temp_file_path, file_path)
+        return job
+
+    def delete(self, job_id: str) -> None:
+        file_path = self._job_file_path(job_id)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    def update(self, job_id: str, **fields) -> dict:
+        job = self.get(job_id) or {"job_id": job_id}
+        job.update(fields)
+        return self.save(job)
+
+
+class TrainingLock:
+    """
+    fcntl.flock wala file lock: ek deployment (same host/volume) pe ek waqt mein sirf ek training run.
+    Lock process ke saath jaata hai, isliye crash hone par apne aap chhoot jaata hai.
+    """
+
+    def __init__(self, job_dir: str = TRAINING_JOB_DIR):
+        os.makedirs(job_dir, exist_ok=True)
+        self.lock_file_path = os.path.join(job_dir, TRAINING_JOB_LOCK_FILE_NAME)
+        self._lock_file = None
+
+    def acquire(self, blocking: bool = False) -> bool:
+        self._lock_file = open(self.lock_file_path, "a+")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+
+    def release(self) -> None:
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def is_locked(self) -> bool:
+        if not self.acquire():
+            return True
+        self.release()
+        return False
+
+
+def _is_process_alive(pid) -> bool:
+    try:
+        os.kill(int(pid), 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except (PermissionError, TypeError, ValueError):
+        return pid is not None
+
+
+class TrainingSlot:
+    """
+    Ek deployment ka ek hi training job slot (train.slot file mein job id aur submit karne wale process ka pid).
+    Submit slot ko atomically claim karta hai (check + likhna ek chhote flock ke andar), isliye do saath aaye
+    /train calls mein se sirf ek ko job milta hai; worker run khatam hone par slot chhodta hai.
+    Slot tabhi busy maana jaata hai jab uska job queued ho aur submit wala process zinda ho, ya training lock
+    pakda hua ho; warna (crash ke baad) woh stale hai aur naya job use le sakta hai.
+    """
+
+    def __init__(self, job_dir: str = TRAINING_JOB_DIR):
+        os.makedirs(job_dir, exist_ok=True)
+        self.job_dir = job_dir
+        self.slot_file_path = os.path.join(job_dir, TRAINING_JOB_SLOT_FILE_NAME)
+        self.guard_file_path = f"{self.slot_file_path}.lock"
+
+    def _read(self) -> Optional[dict]:
+        if not os.path.exists(self.slot_file_path):
+            return None
+        return read_yaml_file(self.slot_file_path) or None
+
+    def _is_busy(self, slot: Optional[dict]) -> bool:
+        if slot is None:
+            return False
+        job = TrainingJobStore(self.job_dir).get(slot.get("job_id"))
+        if job is None or job.get("status") not in ("queued", "running"):
+            return False
+        if job["status"] == "queued" and _is_process_alive(slot.get("pid")):
+            return True
+        return TrainingLock(self.job_dir).is_locked()
+
+    def claim(self, job_id: str) -> bool:
+        with open(self.guard_file_path, "a+") as guard:
+            fcntl.flock(guard, fcntl.LOCK_EX)
+            if self._is_busy(self._read()):
+                return False
+            temp_file_path = f"{self.slot_file_path}.tmp-{os.getpid()}"
+            write_yaml_file(temp_file_path, {"job_id": job_id, "pid": os.getpid()})
+            os.replace(temp_file_path, self.slot_file_path)
+            return True
+
+    def release(self, job_id: str) -> None:
+        with open(self.guard_file_path, "a+") as guard:
+            fcntl.flock(guard, fcntl.LOCK_EX)
+            slot = self._read()
+            if slot is not None and slot.get("job_id") == job_id:
+                os.remove(self.slot_file_path)
+
+
+def run_training_job(job_id: str, run_id: Optional[str] = None, job_dir: str = TRAINING_JOB_DIR) -> str:
+    """Worker process mein chalta hai: lock lekar pipeline chalata hai aur job file mein status likhta hai"""
+    store = TrainingJobStore(job_dir)
+    lock = TrainingLock(job_dir)
+    # Slot is job ka hai, isliye lock ka intezaar karte hain (sirf koi status check ya purana run use pakde ho sakta hai)
+    lock.acquire(blocking=True)
+    try:
+        # Pipeline (sklearn/xgboost wagairah) sirf worker process mein import hota hai
+        from sensor.pipeline.training_pipeline import TrainPipeline
+
+        train_pipeline = TrainPipeline(run_id=run_id)
+        store.update(job_id, status="running", run_id=train_pipeline.run_id, pid=os.getpid(),
+                     started_at=datetime.now().isoformat())
+        train_pipeline.run_pipeline()
+        store.update(job_id, status="succeeded", finished_at=datetime.now().isoformat())
+        return "succeeded"
+    except Exception as e:
+        logging.exception(e)
+        store.update(job_id, status="failed", finished_at=datetime.now().isoformat(), error=str(e))
+        return "failed"
+    finally:
+        lock.release()
+        TrainingSlot(job_dir).release(job_id)
+
+
+def submit_training_job(run_id: Optional[str] = None, job_dir: str = TRAINING_JOB_DIR) -> Optional[dict]:
+    """
+    Training run ko background worker process pe bhejta hai aur turant job record return karta hai.
+    Slot claim na ho sake (koi job queued ya running hai) to None. run_id timestamp format mein na ho ya woh run maujood na ho to ValueError.
+    """
+    global _executor
+    if run_id is not None and not TrainingPipelineConfig.is_valid_run_id(run_id):
+        raise ValueError(f"Invalid run id {run_id!r}")
+    if run_id is not None and not os.path.isdir(TrainingPipelineConfig(run_id).artifact_dir):
+        raise ValueError(f"No pipeline run found with run id {run_id}")
+    try:
+        store = TrainingJobStore(job_dir)
+        slot = TrainingSlot(job_dir)
+        job_id = uuid.uuid4().hex
+        # Job record slot se pehle likhte hain, taaki slot ka job hamesha "queued" dikhe
+        job = store.save({
+            "job_id": job_id,
+            "status": "queued",
+            "run_id": run_id,
+            "submitted_at": datetime.now().isoformat(),
+        })
+        if not slot.claim(job_id):
+            store.delete(job_id)
+            return None
+        try:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+            _executor.submit(run_training_job, job_id, run_id, job_dir)
+        except Exception:
+            slot.release(job_id)
+            raise
+        return job
+    except Exception as e:
+        raise SensorException(e, sys)
+
+
+def get_training_job_status(job_id: str, job_dir: str = TRAINING_JOB_DIR) -> Optional[dict]:
+    """Job ka status + run ke checkpoint se stage progress + (run khatam hone par) timing report"""
+    try:
+        job = TrainingJobStore(job_dir).get(job_id)
+        if job is None:
+            return None
+        run_id = job.get("run_id")
+        if run_id is None:
+            return job
+
+        run_dir = os.path.join(ARTIFACT_DIR, run_id)
+        checkpoint_file_path = os.path.join(run_dir, PIPELINE_CHECKPOINT_FILE_NAME)
+        completed = {}
+        if os.path.exists(checkpoint_file_path):
+            completed = (read_yaml_file(checkpoint_file_path) or {}).get("stages", {})
+        job["stages"] = [
+            {"stage": stage, "status": "completed", "completed_at": completed[stage].get("completed_at")}
+            if stage in completed else {"stage": stage, "status": "pending"}
+            for stage in PIPELINE_STAGES
+        ]
+        if job["status"] == "running":
+            job["current_stage"] = next((stage for stage in PIPELINE_STAGES if stage not in completed), None)
+
+        timing_report_file_path = os.path.join(run_dir, PIPELINE_TIMING_REPORT_FILE_NAME)
+        if os.path.exists(timing_report_file_path):
+            timing_report = read_yaml_file(timing_report_file_path)
+            job["timings"] = {
+                "wall_time": timing_report.get("wall_time"),
+                "stages": {name.split(".", 1)[1]: task["duration"]
+                           for name, task in timing_report.get("tasks", {}).items() if name.startswith("pipeline.")},
+                "critical_paths": timing_report.get("critical_paths", {}),
+            }
+        return job
+    except Exception as e:
+        raise SensorException(e, sys)
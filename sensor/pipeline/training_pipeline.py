@@ -9,11 +9,77 @@ from sensor.components.data_transformation import DataTransformation
 from sensor.components.model_trainer import ModelTrainer
 from sensor.components.model_evaluation import ModelEvaluation
 from sensor.components.model_pusher import ModelPusher
+from sensor.utils.frame_store import frame_store
+from sensor.pipeline.stage_cache import StageCache
+from sensor.pipeline.checkpoint import RunCheckpoint
+from sensor.pipeline import dag
+from sensor.pipeline.dag import TaskGraph, TimingReport
+from sensor.utils.main_utils import write_yaml_file
+from sensor.data_access import sensor_data, feature_store
+from sensor.data_access.sensor_data import SensorData
+from sensor.utils import main_utils, schema, row_validator
+from sensor.ml.metric import classification_metric, drift_metric, quantile_sketch
+from sensor.ml.model import estimator, hyperparameter_search, model_bundle, tree_ensemble
+from sensor.ml.model.estimator import ModelResolver
+from sensor.constant.training_pipeline import SCHEMA_FILE_PATH
 
 class TrainPipeline:
     is_pipeline_running=False                                                                                                                 #yeh batata hai ki pipeline abhi chal rahi hai ya nahi (True ya False)
-    def __init__(self):
-        self.training_pipeline_config = TrainingPipelineConfig()                                                                             # jisme timestamp ke saath pipeline ka naam aur folder ka path hota hai
+    def __init__(self, run_id: str = None):
+        try:
+            self.training_pipeline_config = TrainingPipelineConfig(run_id)                                                                       # jisme timestamp ke saath pipeline ka naam aur folder ka path hota hai (run_id diya to wahi purana run)
+            if run_id is not None and not os.path.isdir(self.training_pipeline_config.artifact_dir):
+                raise Exception(f"No pipeline run found with run id {run_id}")
+            self.run_id = self.training_pipeline_config.timestamp                                                                                  # Isi id se fail hua run resume hota hai: TrainPipeline(run_id=...)
+            self.checkpoint = RunCheckpoint(self.training_pipeline_config.checkpoint_file_path,
+                                            self.training_pipeline_config.checkpoint_dir)                                                          # Har completed stage ka artifact, resume pe yahin se milta hai
+            self.stage_cache = None                                                                                                                # Inputs/config/code same hon to stage ka purana artifact yahin se milta hai
+            if self.training_pipeline_config.stage_cache_enabled:
+                self.stage_cache = StageCache(self.training_pipeline_config.stage_cache_dir,
+                                              self.training_pipeline_config.stage_cache_max_size_bytes)
+            self.stage_keys = {}                                                                                                                   # Har stage ka fingerprint, downstream stages ke fingerprint mein jaata hai
+        except Exception as e:
+            raise SensorException(e,sys)
+
+    def run_stage(self, stage_name: str, config, stage_dir: str, run, upstream=(), code=(), files=(), extra=None,
+                  cacheable: bool = True):
+        """
+        Stage ko checkpoint aur cache ke through chalata hai:
+        1. Isi run mein stage pehle complete ho chuka hai (resume) to checkpoint wala artifact
+        2. Fingerprint match hua to artifact cache se, warna run() chala kar result cache mein
+        Dono case mein end mein checkpoint likha jaata hai. Koi upstream stage bina fingerprint ke chala ho to cache skip.
+        extra: dict ya dict return karne wala function (sirf tab call hota hai jab stage sach mein chalana ho)
+        """
+        try:
+            artifact = self.checkpoint.load_artifact(stage_name)
+            if artifact is not None:
+                self.stage_keys[stage_name] = self.checkpoint.get_stage(stage_name).get("fingerprint")
+                logging.info(f"{stage_name} already completed in run {self.run_id}, resuming after it")
+                return artifact
+
+            upstream_keys = [self.stage_keys.get(name) for name in upstream]
+            if not cacheable or self.stage_cache is None or any(key is None for key in upstream_keys):
+                self.stage_keys[stage_name] = None
+                artifact = run()
+                self.checkpoint.record(stage_name, artifact)
+                return artifact
+
+            pipeline_config = self.training_pipeline_config
+            key = self.stage_cache.fingerprint(stage_name, config, pipeline_config.artifact_dir, pipeline_config.timestamp,
+                                               upstream=upstream_keys, code=code, files=files,
+                                               extra=extra() if callable(extra) else extra)
+            self.stage_keys[stage_name] = key
+
+            artifact = self.stage_cache.get(key, stage_dir, pipeline_config.artifact_dir)
+            if artifact is not None:
+                logging.info(f"{stage_name} reused from stage cache entry {key}")
+            else:
+                artifact = run()
+                self.stage_cache.put(key, stage_name, stage_dir, artifact, pipeline_config.artifact_dir)
+            self.checkpoint.record(stage_name, artifact, fingerprint=key)
+            return artifact
+        except Exception as e:
+            raise SensorException(e, sys)
 
         
     def start_data_ingestion(self)->DataIngestionArtifact:
@@ -21,8 +87,19 @@ class TrainPipeline:
             self.data_ingestion_config = DataIngestionConfig(training_pipeline_config=self.training_pipeline_config)                                      # Yeh config banata hai jisme path, file names, split ratio sab hota hai
             logging.info("Starting data ingestion")                                                                                                            #Yeh log batata hai ki ab data ingestion start ho gaya
 
-            data_ingestion = DataIngestion(data_ingestion_config=self.data_ingestion_config)                                                                           # Ab actual data ingestion component banate hain
-            data_ingestion_artifact = data_ingestion.initiate_data_ingestion()                                                               #Yeh MongoDB se data laata hai, csv me save karta hai, aur split karta hai
+            # MongoDB collection ka count + max key: data badla nahi to ingestion cache se
+            source_signature = lambda: {"source": SensorData().get_collection_signature(
+                self.data_ingestion_config.collection_name,
+                key=self.data_ingestion_config.watermark_key,
+                query=self.data_ingestion_config.export_query,
+            )}
+            data_ingestion_artifact = self.run_stage(
+                "data_ingestion", self.data_ingestion_config, self.data_ingestion_config.data_ingestion_dir,
+                lambda: DataIngestion(data_ingestion_config=self.data_ingestion_config).initiate_data_ingestion(),     #Yeh MongoDB se data laata hai, Parquet me save karta hai, aur split karta hai
+                code=[DataIngestion, sensor_data, feature_store, schema, main_utils, dag],
+                files=[SCHEMA_FILE_PATH],
+                extra=source_signature,
+            )
             logging.info(f"Data ingestion completed and artifact: {data_ingestion_artifact}")                                                         #Yeh batata hai ki kaunsa file kaha save hua (train.csv, test.csv)
 
             return data_ingestion_artifact
@@ -33,10 +110,16 @@ class TrainPipeline:
     def start_data_validaton(self,data_ingestion_artifact:DataIngestionArtifact)->DataValidationArtifact:
         try:
             data_validation_config = DataValidationConfig(training_pipeline_config=self.training_pipeline_config)
-            data_validation = DataValidation(data_ingestion_artifact=data_ingestion_artifact,
-            data_validation_config = data_validation_config
+            baseline_sketch_file_path = data_validation_config.baseline_sketch_file_path
+            data_validation_artifact = self.run_stage(
+                "data_validation", data_validation_config, data_validation_config.data_validation_dir,
+                lambda: DataValidation(data_ingestion_artifact=data_ingestion_artifact,
+                                       data_validation_config=data_validation_config).initiate_data_validation(),
+                upstream=["data_ingestion"],
+                code=[DataValidation, row_validator, drift_metric, quantile_sketch, schema, main_utils, dag],
+                files=[SCHEMA_FILE_PATH] + ([baseline_sketch_file_path] if baseline_sketch_file_path
+                                            and os.path.exists(baseline_sketch_file_path) else []),
             )
-            data_validation_artifact = data_validation.initiate_data_validation()
             return data_validation_artifact
         except  Exception as e:
             raise  SensorException(e,sys)
@@ -45,10 +128,14 @@ class TrainPipeline:
     def start_data_transformation(self,data_validation_artifact:DataValidationArtifact):
         try:
             data_transformation_config = DataTransformationConfig(training_pipeline_config=self.training_pipeline_config)
-            data_transformation = DataTransformation(data_validation_artifact=data_validation_artifact,
-            data_transformation_config=data_transformation_config
+            data_transformation_artifact = self.run_stage(
+                "data_transformation", data_transformation_config, data_transformation_config.data_transformation_dir,
+                lambda: DataTransformation(data_validation_artifact=data_validation_artifact,
+                                           data_transformation_config=data_transformation_config).initiate_data_transformation(),
+                upstream=["data_validation"],
+                code=[DataTransformation, estimator, schema, main_utils, dag],
+                files=[SCHEMA_FILE_PATH],
             )
-            data_transformation_artifact =  data_transformation.initiate_data_transformation()
             return data_transformation_artifact
         except  Exception as e:
             raise  SensorException(e,sys)
@@ -57,8 +144,12 @@ class TrainPipeline:
     def start_model_trainer(self,data_transformation_artifact:DataTransformationArtifact):
         try:
             model_trainer_config = ModelTrainerConfig(training_pipeline_config=self.training_pipeline_config)
-            model_trainer = ModelTrainer(model_trainer_config, data_transformation_artifact)
-            model_trainer_artifact = model_trainer.initiate_model_trainer()
+            model_trainer_artifact = self.run_stage(
+                "model_trainer", model_trainer_config, model_trainer_config.model_trainer_dir,
+                lambda: ModelTrainer(model_trainer_config, data_transformation_artifact).initiate_model_trainer(),
+                upstream=["data_transformation"],
+                code=[ModelTrainer, estimator, hyperparameter_search, model_bundle, tree_ensemble, classification_metric, main_utils],
+            )
             return model_trainer_artifact
         except  Exception as e:
             raise  SensorException(e,sys)
@@ -69,8 +160,23 @@ class TrainPipeline:
                                 ):
         try:
             model_eval_config = ModelEvaluationConfig(self.training_pipeline_config)
-            model_eval = ModelEvaluation(model_eval_config, data_validation_artifact, model_trainer_artifact)
-            model_eval_artifact = model_eval.initiate_model_evaluation()
+            # Saved best model bhi is stage ka input hai: naya model push hua to evaluation dobara chalega
+            def best_model_signature() -> dict:
+                model_resolver = ModelResolver()
+                if not model_resolver.is_model_exists():
+                    return {"best_model": None}
+                best_model_path = model_resolver.get_best_model_path()
+                best_model_stat = os.stat(best_model_path)
+                return {"best_model": {"path": best_model_path, "size": best_model_stat.st_size,
+                                       "mtime_ns": best_model_stat.st_mtime_ns}}
+            model_eval_artifact = self.run_stage(
+                "model_evaluation", model_eval_config, model_eval_config.model_evaluation_dir,
+                lambda: ModelEvaluation(model_eval_config, data_validation_artifact, model_trainer_artifact).initiate_model_evaluation(),
+                upstream=["data_validation", "model_trainer"],
+                code=[ModelEvaluation, estimator, model_bundle, tree_ensemble, classification_metric, schema, main_utils, dag],
+                files=[SCHEMA_FILE_PATH],
+                extra=best_model_signature,
+            )
             return model_eval_artifact
         except  Exception as e:
             raise  SensorException(e,sys)
@@ -78,8 +184,12 @@ class TrainPipeline:
     def start_model_pusher(self,model_eval_artifact:ModelEvaluationArtifact):
         try:
             model_pusher_config = ModelPusherConfig(training_pipeline_config=self.training_pipeline_config)
-            model_pusher = ModelPusher(model_pusher_config, model_eval_artifact)
-            model_pusher_artifact = model_pusher.initiate_model_pusher()
+            # Pusher saved_models mein likhta hai (side effect), isliye cache nahi hota, sirf checkpoint
+            model_pusher_artifact = self.run_stage(
+                "model_pusher", model_pusher_config, model_pusher_config.model_evaluation_dir,
+                lambda: ModelPusher(model_pusher_config, model_eval_artifact).initiate_model_pusher(),
+                cacheable=False,
+            )
             return model_pusher_artifact
         except  Exception as e:
             raise  SensorException(e,sys)
@@ -92,18 +202,38 @@ class TrainPipeline:
             TrainPipeline.is_pipeline_running=True
 
 
-            data_ingestion_artifact:DataIngestionArtifact = self.start_data_ingestion()
-            data_validation_artifact=self.start_data_validaton(data_ingestion_artifact=data_ingestion_artifact)
-            data_transformation_artifact = self.start_data_transformation(data_validation_artifact=data_validation_artifact)
-            model_trainer_artifact = self.start_model_trainer(data_transformation_artifact)
-            model_eval_artifact = self.start_model_evaluation(data_validation_artifact, model_trainer_artifact)
-            if not model_eval_artifact.is_model_accepted:
-               raise Exception("Trained model is not better than the best model")
-            model_pusher_artifact = self.start_model_pusher(model_eval_artifact)
+            # Har stage ek task hai jo apne upstream artifacts inputs mein leta hai; stages ke andar ke graphs
+            # (train/test, drift/sketches, candidate/incumbent) bhi isi timing report mein aate hain
+            timing_report, token = TimingReport.start()
+
+            def push_if_accepted(model_eval_artifact: ModelEvaluationArtifact):
+                if not model_eval_artifact.is_model_accepted:
+                    raise Exception("Trained model is not better than the best model")
+                return self.start_model_pusher(model_eval_artifact)
+
+            graph = TaskGraph("pipeline", max_workers=self.training_pipeline_config.max_workers)
+            graph.add_task("data_ingestion", self.start_data_ingestion)
+            graph.add_task("data_validation", lambda data_ingestion: self.start_data_validaton(data_ingestion_artifact=data_ingestion),
+                           inputs=["data_ingestion"])
+            graph.add_task("data_transformation", lambda data_validation: self.start_data_transformation(data_validation_artifact=data_validation),
+                           inputs=["data_validation"])
+            graph.add_task("model_trainer", lambda data_transformation: self.start_model_trainer(data_transformation),
+                           inputs=["data_transformation"])
+            graph.add_task("model_evaluation", lambda data_validation, model_trainer: self.start_model_evaluation(data_validation, model_trainer),
+                           inputs=["data_validation", "model_trainer"])
+            graph.add_task("model_pusher", lambda model_evaluation: push_if_accepted(model_evaluation), inputs=["model_evaluation"])
+            try:
+                graph.run()
+            finally:
+                TimingReport.reset(token)
+                write_yaml_file(self.training_pipeline_config.timing_report_file_path, timing_report.to_dict())
             TrainPipeline.is_pipeline_running=False
             #self.sync_artifact_dir_to_s3()
             #self.sync_saved_model_dir_to_s3()
         except  Exception as e:
             #self.sync_artifact_dir_to_s3()
             TrainPipeline.is_pipeline_running=False
-            raise  SensorException(e,sys)
\ No newline at end of file
+            raise  SensorException(e,sys)
+        finally:
+            # Stages ke beech diye gaye in-memory frames run ke baad chhod do; files disk pe audit ke liye rehti hain
+            frame_store.clear()
\ No newline at end of file
@@ -0,0 +1,65 @@
+import os
+import sys
+import threading
+from typing import Optional
+
+import pandas as pd
+
+from sensor.exception import SensorException
+
+
+class FrameStore:
+    """
+    Ek hi process (ek pipeline run) ke andar stages ke beech already-parsed, typed DataFrames ka handoff.
+    Frame file path ke naam se rakha jaata hai; file disk pe bhi likhi rehti hai (audit ke liye),
+    par agla stage use dobara parse karne ki jagah yahin se le leta hai.
+    File baad mein badal jaaye (mtime/size alag) toh stored frame ignore hota hai aur disk se padha jaata hai.
+    """
+
+    def __init__(self):
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(file_path: str) -> str:
+        return os.path.abspath(file_path)
+
+    @staticmethod
+    def _signature(file_path: str) -> Optional[tuple]:
+        try:
+            stat = os.stat(file_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def put(self, file_path: str, dataframe: pd.DataFrame) -> None:
+        """file_path pe likhe gaye dataframe ko yaad rakho (file likhne ke baad hi call karo)"""
+        try:
+            with self._lock:
+                self._frames[self._key(file_path)] = (self._signature(file_path), dataframe)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def get(self, file_path: str) -> Optional[pd.DataFrame]:
+        """Stored frame ki shallow copy (copy-on-write), ya None agar frame nahi hai / file badal gayi hai"""
+        with self._lock:
+            entry = self._frames.get(self._key(file_path))
+        if entry is None:
+            return None
+        signature, dataframe = entry
+        if signature is None or signature != self._signature(file_path):
+            self.discard(file_path)
+            return None
+        return dataframe.copy(deep=False)
+
+    def discard(self, file_path: str) -> None:
+        with self._lock:
+            self._frames.pop(self._key(file_path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+
+
+# Process-wide store; TrainPipeline run ke end mein ise clear karta hai
+frame_store = FrameStore()
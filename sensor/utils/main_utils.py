@@ -4,7 +4,12 @@ from sensor.exception import SensorException
 from sensor.logger import logging
 import os,sys
 import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import dill
+from typing import Iterator, Optional
+from sensor.utils.frame_store import frame_store
 
 def read_yaml_file(file_path: str) -> dict:
     try:
@@ -35,13 +40,16 @@ def save_numpy_array_data(file_path: str, array: np.array):
         raise SensorException(e, sys) from e
 
 
-def load_numpy_array_data(file_path: str) -> np.array:
+def load_numpy_array_data(file_path: str, mmap_mode: Optional[str] = None) -> np.array:
     """
     load numpy array data from file
     file_path: str location of file to load
+    mmap_mode: e.g. "r" to memory-map the file instead of reading it into RAM
     return: np.array data loaded
     """
     try:
+        if mmap_mode is not None:
+            return np.load(file_path, mmap_mode=mmap_mode)
         with open(file_path, "rb") as file_obj:
             return np.load(file_obj)
     except Exception as e:
@@ -66,4 +74,130 @@ def load_object(file_path: str, ) -> object:
         with open(file_path, "rb") as file_obj:
             return dill.load(file_obj)
     except Exception as e:
-        raise SensorException(e, sys) from e
\ No newline at end of file
+        raise SensorException(e, sys) from e
+
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def write_dataframe(file_path: str, dataframe: pd.DataFrame, compression: str = PARQUET_COMPRESSION,
+                    keep_in_memory: bool = False) -> None:
+    """
+    Save dataframe as Parquet (typed columns, compressed) or CSV, depending on the file extension
+    file_path: str location of file to save
+    dataframe: pd.DataFrame data to save
+    keep_in_memory: also hand the parsed frame to the next stage of this run through frame_store
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        if file_path.endswith(".parquet"):
+            dataframe.to_parquet(file_path, index=False, compression=compression)
+        else:
+            dataframe.to_csv(file_path, index=False, header=True)
+        if keep_in_memory:
+            frame_store.put(file_path, dataframe)
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def read_dataframe(file_path: str, columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    Load dataframe from a Parquet or CSV file, depending on the file extension
+    file_path: str location of file to load
+    columns: optional list of columns to read, Parquet only reads these columns from disk
+    return: pd.DataFrame data loaded
+    """
+    try:
+        if file_path.endswith(".parquet"):
+            return pd.read_parquet(file_path, columns=columns)
+        return pd.read_csv(file_path, usecols=columns)
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+def iter_dataframe_chunks(file_path: str, chunk_size: int, columns: Optional[list] = None) -> Iterator[pd.DataFrame]:
+    """
+    Parquet/CSV file ko chunk_size rows ke dataframes mein padhta hai, poori file kabhi memory mein nahi aati
+    file_path: str location of file to load
+    columns: optional list of columns to read
+    """
+    try:
+        if file_path.endswith(".parquet"):
+            parquet_file = pq.ParquetFile(file_path)
+            if columns is not None:
+                columns = [column for column in columns if column in parquet_file.schema_arrow.names]
+            for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(file_path, usecols=columns, chunksize=chunk_size)
+    except Exception as e:
+        raise SensorException(e, sys) from e
+
+
+class DataFrameChunkWriter:
+    """
+    Write dataframe chunks one after another into a single Parquet or CSV file.
+    With `dtypes` (column -> dtype, e.g. Schema.dtype_map) every chunk is aligned to those columns (missing
+    columns become NaN, others are dropped) and the Parquet types come from the dtypes (str -> string), so a
+    column that is all-null in the first chunk still gets its real type.
+    Without it the first chunk fixes the columns and types and a later chunk with an unknown column is an error.
+    """
+
+    def __init__(self, file_path: str, compression: str = PARQUET_COMPRESSION, dtypes: Optional[dict] = None):
+        self.file_path = file_path
+        self.compression = compression
+        self.columns = None if dtypes is None else list(dtypes)
+        self._columns_fixed = dtypes is not None
+        self._first_chunk = True
+        self.number_of_rows = 0
+        self._parquet_writer = None
+        self._arrow_schema = None
+        if dtypes is not None:
+            self._arrow_schema = pa.schema([
+                pa.field(column, pa.string() if dtype is str else pa.from_numpy_dtype(np.dtype(dtype)))
+                for column, dtype in dtypes.items()
+            ])
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        try:
+            first_chunk = self._first_chunk
+            if first_chunk:
+                os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+                if self.columns is None:
+                    self.columns = list(chunk.columns)
+            elif not self._columns_fixed:
+                unknown_columns = [column for column in chunk.columns if column not in self.columns]
+                if unknown_columns:
+                    raise ValueError(f"Chunk has columns {unknown_columns} that the first chunk of "
+                                     f"{self.file_path} did not have")
+            chunk = chunk.reindex(columns=self.columns)
+
+            if self.file_path.endswith(".parquet"):
+                if self._arrow_schema is None:
+                    self._arrow_schema = pa.Table.from_pandas(chunk, preserve_index=False).schema
+                if first_chunk:
+                    self._parquet_writer = pq.ParquetWriter(self.file_path, self._arrow_schema,
+                                                            compression=self.compression)
+                for field in self._arrow_schema:
+                    if field.type == pa.string() and not pd.api.types.is_string_dtype(chunk[field.name].dtype):
+                        chunk[field.name] = chunk[field.name].astype("string")
+                table = pa.Table.from_pandas(chunk, schema=self._arrow_schema, preserve_index=False)
+                self._parquet_writer.write_table(table)
+            else:
+                chunk.to_csv(self.file_path, index=False, header=first_chunk, mode="w" if first_chunk else "a")
+
+            self._first_chunk = False
+            self.number_of_rows += len(chunk)
+        except Exception as e:
+            raise SensorException(e, sys) from e
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
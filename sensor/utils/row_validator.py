@@ -0,0 +1,136 @@
+import sys
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from sensor.exception import SensorException
+
+INVALID_REASON_COLUMN = "invalid_reason"
+
+# Ek row kai checks fail kar sakti hai; invalid_reason mein pehla fail hua check is order mein likha jaata hai
+_REASONS = ["invalid_label", "not_numeric", "not_finite", "out_of_range", "too_many_nulls"]
+
+
+class RowValidator:
+    """
+    schema.yaml ke "validation" section se bana row-level validator.
+    Saare numerical columns ko ek (rows, columns) matrix bana kar har check ek vectorized operation mein chalta hai,
+    aur ek hi pass mein dataframe valid aur invalid rows mein split ho jaata hai.
+    """
+
+    def __init__(self, schema):
+        try:
+            self.schema = schema
+            rules = schema.config.get("validation", {}) or {}
+            self.labels = {column: [str(label) for label in labels]
+                           for column, labels in (rules.get("labels", {}) or {}).items()}
+            self.max_row_null_ratio: Optional[float] = rules.get("max_row_null_ratio")
+            self.max_column_null_ratio: Optional[float] = rules.get("max_column_null_ratio")
+
+            column_ranges = rules.get("column_ranges", {}) or {}
+            default_range = column_ranges.get("default", {}) or {}
+            numeric_columns = [column for column in schema.columns if column in schema.dtype_map
+                               and schema.dtype_map[column] is not str]
+            self.numeric_columns = numeric_columns
+            self.minimum = np.array([(column_ranges.get(column) or {}).get("min", default_range.get("min", -np.inf))
+                                     for column in numeric_columns], dtype=np.float64)
+            self.maximum = np.array([(column_ranges.get(column) or {}).get("max", default_range.get("max", np.inf))
+                                     for column in numeric_columns], dtype=np.float64)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def _coerce(self, dataframe: pd.DataFrame) -> tuple:
+        # Numeric columns ko column-major float matrix mein laata hai; jo value present thi par number nahi bani
+        # woh not_numeric hai (raw CSV jaise input ke liye; ingested files mein yeh schema.not_numeric_column se aata hai). Already-numeric columns sirf copy hote hain, parse sirf string columns ka hota hai.
+        n_rows = len(dataframe)
+        values = np.full((n_rows, len(self.numeric_columns)), np.nan, dtype=np.float64, order="F")
+        not_numeric = np.zeros(n_rows, dtype=bool)
+        coerced_columns = []
+        na_tokens = self.schema.na_tokens
+        for index, column in enumerate(self.numeric_columns):
+            if column not in dataframe.columns:
+                continue
+            series = dataframe[column]
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                values[:, index] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                continue
+            present = series.notna().to_numpy() & ~series.isin(na_tokens).to_numpy()
+            coerced = pd.to_numeric(series.where(present), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            not_numeric |= present & np.isnan(coerced)
+            values[:, index] = coerced
+            coerced_columns.append(index)
+        return values, not_numeric, coerced_columns
+
+    def validate(self, dataframe: pd.DataFrame) -> tuple:
+        """
+        return: (valid_df, invalid_df, report)
+        valid_df schema dtypes mein cast hota hai; invalid_df mein original values + invalid_reason column hota hai.
+        Ingestion ka not_numeric mask column (agar hai) not_numeric check mein judta hai aur output mein nahi rehta.
+        report mein har check ke failed rows aur jin columns ka null ratio limit se upar hai, woh hote hain.
+        """
+        try:
+            n_rows = len(dataframe)
+            values, not_numeric, coerced_columns = self._coerce(dataframe)
+            not_numeric_column = self.schema.not_numeric_column
+            if not_numeric_column in dataframe.columns:
+                # Ingestion pe values already NaN ban chuki hain; unki rows ka mask ingestion ne likha tha
+                not_numeric |= dataframe[not_numeric_column].fillna(False).to_numpy(dtype=bool)
+                dataframe = dataframe.drop(columns=[not_numeric_column])
+            missing = np.isnan(values)
+
+            checks = {}
+            invalid_label = np.zeros(n_rows, dtype=bool)
+            for column, labels in self.labels.items():
+                if column in dataframe.columns:
+                    invalid_label |= ~dataframe[column].isin(labels).to_numpy()
+                else:
+                    invalid_label[:] = True
+            checks["invalid_label"] = invalid_label
+            checks["not_numeric"] = not_numeric
+            checks["not_finite"] = np.isinf(values).any(axis=1)
+            # NaN ke saath comparison False deta hai, isliye null values range check mein fail nahi hoti
+            checks["out_of_range"] = np.zeros(n_rows, dtype=bool)
+            bounded = np.flatnonzero(np.isfinite(self.minimum) | np.isfinite(self.maximum))
+            if len(bounded) > 0:
+                bounded_values = values[:, bounded]
+                checks["out_of_range"] = ((bounded_values < self.minimum[bounded])
+                                          | (bounded_values > self.maximum[bounded])).any(axis=1)
+            if self.max_row_null_ratio is not None and values.shape[1] > 0:
+                checks["too_many_nulls"] = missing.sum(axis=1) > self.max_row_null_ratio * values.shape[1]
+            else:
+                checks["too_many_nulls"] = np.zeros(n_rows, dtype=bool)
+
+            invalid = np.zeros(n_rows, dtype=bool)
+            for reason in _REASONS:
+                invalid |= checks[reason]
+
+            column_null_ratio = missing.mean(axis=0) if n_rows > 0 else np.zeros(len(self.numeric_columns))
+            columns_over_null_limit = []
+            if self.max_column_null_ratio is not None:
+                columns_over_null_limit = [column for column, ratio in zip(self.numeric_columns, column_null_ratio)
+                                           if ratio > self.max_column_null_ratio]
+
+            invalid_reason = np.select([checks[reason][invalid] for reason in _REASONS], _REASONS, default="")
+            # copy() se invalid rows (chhota frame) consolidate ho jaate hain, phir reason column judta hai
+            invalid_df = dataframe.loc[invalid].copy()
+            invalid_df[INVALID_REASON_COLUMN] = invalid_reason
+
+            # Sab rows valid hon toh copy hi nahi; warna ek boolean take. String columns ki values
+            # already-coerced matrix se aati hain, dobara parse nahi hoti.
+            valid_df = dataframe.copy(deep=False) if len(invalid_df) == 0 else dataframe.loc[~invalid]
+            for index in coerced_columns:
+                column_values = values[:, index] if len(invalid_df) == 0 else values[~invalid, index]
+                valid_df[self.numeric_columns[index]] = column_values.astype(self.schema.numeric_dtype)
+            valid_df = self.schema.cast(valid_df).reset_index(drop=True)
+
+            report = {
+                "rows": int(n_rows),
+                "valid_rows": int(n_rows - invalid.sum()),
+                "invalid_rows": int(invalid.sum()),
+                "failed_checks": {reason: int(checks[reason].sum()) for reason in _REASONS},
+                "columns_over_null_limit": columns_over_null_limit,
+            }
+            return valid_df, invalid_df.reset_index(drop=True), report
+        except Exception as e:
+            raise SensorException(e, sys)
@@ -0,0 +1,146 @@
+import sys
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from sensor.constant.training_pipeline import (
+    SCHEMA_DROP_COLS,
+    SCHEMA_FILE_PATH,
+    SCHEMA_NA_TOKENS,
+    SCHEMA_NOT_NUMERIC_COLUMN,
+    SCHEMA_NUMERIC_DTYPE,
+    TARGET_COLUMN,
+)
+from sensor.exception import SensorException
+from sensor.utils.frame_store import frame_store
+from sensor.utils.main_utils import read_yaml_file
+
+
+class Schema:
+    """
+    schema.yaml ka compiled roop: column order, dtype map, NA tokens aur drop list ek hi jagah.
+    Ise get_schema() se lo, taaki YAML poore process mein sirf ek baar parse ho.
+    """
+
+    def __init__(self, schema_config: dict, numeric_dtype=SCHEMA_NUMERIC_DTYPE, na_tokens=SCHEMA_NA_TOKENS):
+        try:
+            self.config = schema_config
+            self.target_column = TARGET_COLUMN
+            self.numeric_dtype = np.dtype(numeric_dtype)
+            self.na_tokens = list(na_tokens)
+            self.drop_columns = [str(col).strip() for col in schema_config.get(SCHEMA_DROP_COLS, [])]
+
+            self.column_types = {}
+            for column in schema_config["columns"]:
+                column_name, column_type = list(column.items())[0]
+                self.column_types[str(column_name).strip()] = column_type
+
+            self.columns = [column for column in self.column_types if column not in self.drop_columns]
+            self.numerical_columns = [str(col).strip() for col in schema_config.get("numerical_columns", [])]
+            self.feature_columns = [column for column in self.columns if column != self.target_column]
+
+            # category columns (target) string rehte hain, baaki sab numeric dtype mein (NaN ke saath)
+            self.dtype_map = {
+                column: (str if self.column_types[column] == "category" else self.numeric_dtype)
+                for column in self.columns
+            }
+            # Ingestion pe jo present value number nahi ban paayi uski row is bool column mein mark hoti hai,
+            # taaki row validation not_numeric pakad sake (value khud NaN ban chuki hoti hai)
+            self.not_numeric_column = SCHEMA_NOT_NUMERIC_COLUMN
+            self.ingested_dtype_map = {**self.dtype_map, self.not_numeric_column: np.bool_}
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def projection(self) -> dict:
+        """MongoDB inclusion projection: sirf schema columns, `_id` nahi."""
+        projection = {"_id": 0}
+        for column in self.columns:
+            projection[column] = 1
+        return projection
+
+    def cast(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Dataframe ke known columns ko schema dtypes mein laata hai. Jo column pehle se sahi dtype mein hai
+        use chhod deta hai, isliye already-typed data pe yeh lagbhag free hai.
+        """
+        try:
+            numeric_dtype = self.numeric_dtype
+            for column in dataframe.columns:
+                dtype = self.dtype_map.get(column)
+                if dtype is None or dtype is str:
+                    continue
+                series = dataframe[column]
+                if series.dtype == numeric_dtype:
+                    continue
+                if pd.api.types.is_numeric_dtype(series.dtype):
+                    dataframe[column] = series.astype(numeric_dtype)
+                else:
+                    series = series.where(~series.isin(self.na_tokens))
+                    dataframe[column] = pd.to_numeric(series, errors="coerce").astype(numeric_dtype)
+            return dataframe
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def coerce(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        cast() jaisa, par saath mein not_numeric_column bhi banata hai: jis row ki koi present value (NA token nahi)
+        number nahi ban paayi woh True. Ingestion yahi use karta hai taaki coercion ke baad bhi pata rahe.
+        """
+        try:
+            numeric_dtype = self.numeric_dtype
+            not_numeric = np.zeros(len(dataframe), dtype=bool)
+            columns = {}
+            for column in dataframe.columns:
+                series = dataframe[column]
+                dtype = self.dtype_map.get(column)
+                if dtype is None or dtype is str or series.dtype == numeric_dtype:
+                    columns[column] = series
+                elif pd.api.types.is_numeric_dtype(series.dtype):
+                    columns[column] = series.astype(numeric_dtype)
+                else:
+                    present = series.notna() & ~series.isin(self.na_tokens)
+                    coerced = pd.to_numeric(series.where(present), errors="coerce")
+                    not_numeric |= (present & coerced.isna()).to_numpy()
+                    columns[column] = coerced.astype(numeric_dtype)
+            columns[self.not_numeric_column] = not_numeric
+            # Ek hi baar naya frame: column-by-column assign se frame fragmented ho jaata hai
+            return pd.DataFrame(columns, index=dataframe.index)
+        except Exception as e:
+            raise SensorException(e, sys)
+
+    def read(self, file_path: str, columns: Optional[list] = None, cast: bool = True) -> pd.DataFrame:
+        """
+        Parquet/CSV file ko ek hi pass mein typed dataframe ke roop mein padhta hai:
+        CSV pe NA tokens aur dtypes parser ko hi de dete hain, Parquet already typed hota hai.
+        cast=False: sirf NA tokens hatte hain, jo values number nahi ban paati woh string hi rehti hain (row validation ke liye)
+        Isi run ke pichle stage ne file frame_store mein di ho toh parse hi nahi hoti, wahi frame milta hai.
+        """
+        try:
+            dataframe = frame_store.get(file_path)
+            if dataframe is not None:
+                if columns is not None:
+                    dataframe = dataframe[columns]
+                return self.cast(dataframe) if cast else dataframe
+
+            if file_path.endswith(".parquet"):
+                dataframe = pd.read_parquet(file_path, columns=columns)
+                return self.cast(dataframe) if cast else dataframe
+
+            if not cast:
+                return pd.read_csv(file_path, usecols=columns, na_values=self.na_tokens, low_memory=False)
+
+            try:
+                return pd.read_csv(file_path, usecols=columns, na_values=self.na_tokens, dtype=self.dtype_map)
+            except (ValueError, TypeError):
+                # Koi value number nahi ban paayi; ab bina dtype ke padh kar coerce karte hain
+                return self.cast(pd.read_csv(file_path, usecols=columns, na_values=self.na_tokens))
+        except Exception as e:
+            raise SensorException(e, sys)
+
+
+@lru_cache(maxsize=None)
+def get_schema(file_path: str = SCHEMA_FILE_PATH) -> Schema:
+    """Compiled Schema, process mein ek baar banta hai aur phir cache se milta hai."""
+    return Schema(read_yaml_file(file_path))
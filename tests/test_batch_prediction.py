@@ -0,0 +1,36 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sensor.constant.application import PREDICTION_COLUMN_NAME
+from sensor.pipeline.batch_prediction import BatchPrediction
+from sensor.utils.schema import get_schema
+
+
+class ConstantModel:
+    def predict(self, x):
+        return np.zeros(len(x), dtype=int)
+
+
+@pytest.fixture
+def upload():
+    # Pehle chunk (5 rows) mein truck_id aur class dono poore null hain
+    schema = get_schema()
+    frame = pd.DataFrame({column: np.arange(12, dtype=float) for column in schema.feature_columns})
+    frame["truck_id"] = [None] * 5 + [f"T{index}" for index in range(7)]
+    frame[schema.target_column] = [None] * 5 + ["pos"] * 7
+    return frame
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_pass_through_column_null_in_first_chunk(upload, output_format):
+    body = b"".join(BatchPrediction(ConstantModel(), chunk_size=5).stream(
+        io.BytesIO(upload.to_csv(index=False).encode()), "csv", output_format))
+
+    output = pd.read_csv(io.BytesIO(body)) if output_format == "csv" else pd.read_parquet(io.BytesIO(body))
+    assert len(output) == 12
+    assert output["truck_id"].iloc[5:].tolist() == [f"T{index}" for index in range(7)]
+    assert output["truck_id"].iloc[:5].isna().all()
+    assert output[PREDICTION_COLUMN_NAME].notna().all()
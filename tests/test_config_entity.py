@@ -0,0 +1,11 @@
+import pytest
+
+from sensor.entity.config_entity import TrainingPipelineConfig
+
+
+def test_run_id_must_be_a_timestamp():
+    config = TrainingPipelineConfig("01_02_2026_03_04_05")
+    assert config.timestamp == "01_02_2026_03_04_05"
+    for run_id in ["../../etc", "01_02_2026_03_04_05/../..", "01_02_2026_03_04_05\n", ""]:
+        with pytest.raises(ValueError):
+            TrainingPipelineConfig(run_id)
@@ -0,0 +1,16 @@
+import functools
+import time
+
+from sensor.pipeline.dag import TaskGraph
+
+
+def test_process_task_duration_excludes_queue_wait():
+    # Ek worker, teen tasks: baad wali tasks queue mein wait karti hain, woh time unke duration mein nahi
+    graph = TaskGraph("sleepers", executor="process", max_workers=1)
+    for name in ("a", "b", "c"):
+        graph.add_task(name, functools.partial(time.sleep, 0.3))
+    graph.run()
+
+    assert all(timing["duration"] < 0.45 for timing in graph.timings.values())
+    starts = sorted(timing["start"] for timing in graph.timings.values())
+    assert starts[-1] - starts[0] >= 0.55
@@ -0,0 +1,153 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from bson import ObjectId
+
+from sensor.components.data_ingestion import DataIngestion
+from sensor.configuration.mongo_db_connection import MongoDBClient
+from sensor.data_access.feature_store import FeatureStore
+from sensor.data_access.sensor_data import SensorData
+from sensor.entity.config_entity import DataIngestionConfig, TrainingPipelineConfig
+from sensor.utils.main_utils import DataFrameChunkWriter, read_dataframe
+
+
+@pytest.fixture
+def data_ingestion(tmp_path):
+    config = DataIngestionConfig(TrainingPipelineConfig())
+    config.export_chunk_size = 7
+    config.training_file_path = str(tmp_path / "ingested" / "train.parquet")
+    config.testing_file_path = str(tmp_path / "ingested" / "test.parquet")
+    return DataIngestion(config)
+
+
+def write_feature_store_part(data_ingestion, file_path, start, stop):
+    columns = data_ingestion._schema.columns
+    frame = pd.DataFrame({column: [float(index) for index in range(start, stop)] for column in columns})
+    frame[data_ingestion._schema.target_column] = ["pos" if index % 3 == 0 else "neg" for index in range(start, stop)]
+    return DataIngestion.write_chunks_to_feature_store([frame], str(file_path), dtypes=data_ingestion._schema.dtype_map)
+
+
+def test_split_streams_every_feature_store_row_exactly_once(data_ingestion, tmp_path):
+    parts = {str(tmp_path / "part-1.parquet"): 0, str(tmp_path / "part-2.parquet"): 0}
+    for (file_path, _), (start, stop) in zip(list(parts.items()), [(0, 60), (60, 100)]):
+        parts[file_path] = write_feature_store_part(data_ingestion, file_path, start, stop)
+
+    data_ingestion.split_data_as_train_test(parts)
+
+    config = data_ingestion.data_ingestion_config
+    train, test = read_dataframe(config.training_file_path), read_dataframe(config.testing_file_path)
+    assert len(test) == 20 and len(train) == 80
+    assert sorted(pd.concat([train, test])["aa_000"]) == [float(index) for index in range(100)]
+    assert list(train.columns) == data_ingestion._schema.columns + [data_ingestion._schema.not_numeric_column]
+    assert not train[data_ingestion._schema.not_numeric_column].any()
+
+
+def test_coercion_marks_rows_whose_values_were_not_numeric(data_ingestion):
+    schema = data_ingestion._schema
+    chunk = pd.DataFrame({"aa_000": ["1", "na", "abc", None, 5], schema.target_column: ["neg"] * 5})
+    coerced = data_ingestion.coerce_numeric_chunk(chunk)
+    assert coerced["aa_000"].isna().tolist() == [False, True, True, True, False]
+    assert coerced[schema.not_numeric_column].tolist() == [False, False, True, False, False]
+
+
+def test_chunk_writer_fails_on_a_column_the_first_chunk_did_not_have(tmp_path):
+    with DataFrameChunkWriter(str(tmp_path / "out.parquet")) as writer:
+        writer.write(pd.DataFrame({"a": [1.0]}))
+        with pytest.raises(Exception, match="'b'"):
+            writer.write(pd.DataFrame({"a": [2.0], "b": [3.0]}))
+
+
+def test_chunk_writer_takes_columns_and_types_from_the_dtypes(tmp_path):
+    # Pehle chunk mein "b" hai hi nahi aur "class" poora null hai
+    file_path = str(tmp_path / "out.parquet")
+    with DataFrameChunkWriter(file_path, dtypes={"a": np.float32, "b": np.float32, "class": str}) as writer:
+        writer.write(pd.DataFrame({"a": [1.0], "class": [None]}))
+        writer.write(pd.DataFrame({"a": [2.0], "b": [3.0], "c": [4.0], "class": ["pos"]}))
+    written = read_dataframe(file_path)
+    assert list(written.columns) == ["a", "b", "class"]
+    assert written["a"].dtype == np.float32 and written["b"].dtype == np.float32
+    assert written["b"].tolist()[1] == 3.0
+    assert written["class"].tolist()[1] == "pos"
+
+
+def object_id_at(seconds, serial):
+    # Client-side ObjectId jaisa: timestamp + apna counter, alag clients ke ids interleave ho sakte hain
+    return ObjectId(int(1_700_000_000 + seconds).to_bytes(4, "big") + serial.to_bytes(8, "big"))
+
+
+def test_incremental_export_picks_up_late_inserts_below_the_watermark(data_ingestion, tmp_path, monkeypatch):
+    mongomock = pytest.importorskip("mongomock")
+    monkeypatch.setattr(MongoDBClient, "client", mongomock.MongoClient())
+    config = data_ingestion.data_ingestion_config
+    config.incremental = True
+    config.feature_store_dir = str(tmp_path / "feature_store")
+    collection = SensorData()._get_collection(config.collection_name)
+
+    def insert(seconds, serial):
+        collection.insert_one({"_id": object_id_at(seconds, serial), "aa_000": float(serial), "class": "neg"})
+
+    def export(version):
+        config.feature_store_version = version
+        data_ingestion.export_data_into_feature_store()
+        return sorted(FeatureStore(config.feature_store_dir).read_all()["aa_000"])
+
+    for serial in range(10):
+        insert(seconds=100 + serial, serial=serial)
+    assert export("v1") == list(range(10))
+
+    # Ek slow client ka document watermark se neeche, aur ek naya document
+    insert(seconds=105, serial=100)
+    insert(seconds=200, serial=101)
+    assert export("v2") == list(range(10)) + [100, 101]
+
+    # Kuch naya nahi: naya part nahi, koi duplicate nahi
+    assert export("v3") == list(range(10)) + [100, 101]
+    assert len(FeatureStore(config.feature_store_dir).versions) == 2
+
+
+def test_incremental_export_starts_a_new_store_when_the_source_was_reloaded(data_ingestion, tmp_path, monkeypatch):
+    mongomock = pytest.importorskip("mongomock")
+    monkeypatch.setattr(MongoDBClient, "client", mongomock.MongoClient())
+    config = data_ingestion.data_ingestion_config
+    config.incremental = True
+    config.feature_store_dir = str(tmp_path / "feature_store")
+    collection = SensorData()._get_collection(config.collection_name)
+
+    def seed(seconds, serials):
+        collection.drop()
+        collection.insert_many([{"_id": object_id_at(seconds + serial, serial), "aa_000": float(serial),
+                                 "class": "neg"} for serial in serials])
+
+    def export(version):
+        config.feature_store_version = version
+        data_ingestion.export_data_into_feature_store()
+        return sorted(FeatureStore(config.feature_store_dir).read_all()["aa_000"])
+
+    seed(100, range(10))
+    assert export("v1") == list(range(10))
+
+    # Wahi data naye _id ke saath dobara load: purane parts pe append nahi, nayi store
+    seed(5000, range(10))
+    assert export("v2") == list(range(10))
+
+    # Kam keys ke saath dobara load (watermark se neeche): bhi nayi store
+    seed(10, range(4))
+    assert export("v3") == list(range(4))
+    feature_store = FeatureStore(config.feature_store_dir)
+    assert [version["version"] for version in feature_store.versions] == ["v3"]
+    assert sorted(os.listdir(config.feature_store_dir)) == ["manifest.yaml", "part-v3.parquet", "window-v3.parquet"]
+
+
+def test_split_is_the_same_for_the_same_random_state(data_ingestion, tmp_path):
+    file_path = str(tmp_path / "part-1.parquet")
+    parts = {file_path: write_feature_store_part(data_ingestion, file_path, 0, 50)}
+    config = data_ingestion.data_ingestion_config
+
+    def test_rows(random_state):
+        config.split_random_state = random_state
+        data_ingestion.split_data_as_train_test(parts)
+        return sorted(read_dataframe(config.testing_file_path)["aa_000"])
+
+    assert test_rows(7) == test_rows(7)
+    assert test_rows(7) != test_rows(8)
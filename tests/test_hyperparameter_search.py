@@ -0,0 +1,19 @@
+import numpy as np
+
+from sensor.ml.model.hyperparameter_search import HyperparameterSearch
+
+
+def test_validation_fold_is_split_off_before_resampling(tmp_path):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(1000, 5)).astype(np.float32)
+    y = (x[:, 0] > 1.3).astype(np.int8)
+    search = HyperparameterSearch(str(tmp_path / "trials.yaml"), {}, n_trials=1, min_estimators=10,
+                                  max_estimators=10, resample=True)
+    train_index, valid_index = search._split(y)
+    folds = search._prepare_folds(x, y, train_index, valid_index)
+
+    # Validation fold asli rows aur asli class balance hai; synthetic rows sirf train fold mein
+    np.testing.assert_array_equal(folds["x_valid"], x[valid_index])
+    assert folds["y_valid"].mean() < 0.2
+    assert abs(folds["y_train"].mean() - 0.5) < 0.05
+    assert not set(map(bytes, folds["x_train"])) & set(map(bytes, folds["x_valid"]))
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from scipy.stats import ks_2samp
+
+from sensor.ml.metric.quantile_sketch import ColumnSketches, QuantileSketch, sketch_ks_2samp
+
+
+def scania_like(n, seed, shift=0.0):
+    # Scania ke columns jaisa: ~60% zeros, baaki rounded lognormal (integer values, bahut saare ties)
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.lognormal(3 + shift, 1.5, n))
+    values[rng.random(n) < 0.6] = 0
+    return values
+
+
+@pytest.mark.parametrize("n", [50_000, 200_000])
+def test_identical_zero_inflated_samples_do_not_drift(n):
+    base, current = scania_like(n, seed=1), scania_like(n, seed=2)
+    assert ks_2samp(base, current).pvalue > 0.05
+    # Baseline batches mein bana aur merge hua sketch bhi
+    base_sketch = QuantileSketch.from_values(base[: n // 2]).merge(QuantileSketch.from_values(base[n // 2:]))
+    _, p_value = sketch_ks_2samp(base_sketch, QuantileSketch.from_values(current))
+    assert p_value > 0.05
+
+
+def test_shifted_zero_inflated_sample_drifts():
+    base, current = scania_like(200_000, seed=1), scania_like(200_000, seed=3, shift=0.1)
+    _, p_value = sketch_ks_2samp(QuantileSketch.from_values(base), QuantileSketch.from_values(current))
+    assert p_value < 0.05
+
+
+def test_point_mass_is_a_step_in_the_cdf():
+    values = np.where(np.random.default_rng(0).random(10_000) < 0.6, 0.0, 3.0)
+    sketch = QuantileSketch.from_values(values)
+    share_of_zeros = np.mean(values == 0)
+    assert sketch.cdf([0.0])[0] == pytest.approx(share_of_zeros)
+    assert sketch.cdf([0.0], side="left")[0] == 0.0
+    assert sketch.cdf([1.5])[0] == pytest.approx(share_of_zeros)
+    assert sketch.rank_error() == 0.0
+
+
+def test_column_sketches_round_trip_keeps_point_masses(tmp_path):
+    values = scania_like(10_000, seed=4)
+    sketches = ColumnSketches({"aa_000": QuantileSketch.from_values(values)})
+    file_path = str(tmp_path / "sketches.npz")
+    sketches.save(file_path)
+    loaded = ColumnSketches.load(file_path).sketches["aa_000"]
+    original = sketches.sketches["aa_000"]
+    np.testing.assert_array_equal(loaded.points, original.points)
+    np.testing.assert_allclose(loaded.cdf([0.0, 5.0, 100.0]), original.cdf([0.0, 5.0, 100.0]))
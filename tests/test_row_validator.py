@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from sensor.utils.row_validator import INVALID_REASON_COLUMN, RowValidator
+from sensor.utils.schema import get_schema
+
+
+def ingested_frame(schema, aa_000_values):
+    frame = pd.DataFrame({column: np.ones(len(aa_000_values)) for column in schema.feature_columns})
+    frame["aa_000"] = aa_000_values
+    frame[schema.target_column] = "neg"
+    return frame
+
+
+def test_not_numeric_fires_on_values_coerced_at_ingestion():
+    schema = get_schema()
+    ingested = schema.coerce(ingested_frame(schema, ["1", "abc", "na"]))
+    assert ingested["aa_000"].isna().tolist() == [False, True, True]
+
+    valid_df, invalid_df, report = RowValidator(schema).validate(ingested)
+    assert report["failed_checks"]["not_numeric"] == 1
+    assert invalid_df[INVALID_REASON_COLUMN].tolist() == ["not_numeric"]
+    assert schema.not_numeric_column not in valid_df.columns
+    assert schema.not_numeric_column not in invalid_df.columns
+
@@ -0,0 +1,56 @@
+import threading
+
+import pandas as pd
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from sensor.configuration.mongo_db_connection import MongoDBClient
+from sensor.data_access.sensor_data import SensorData
+
+COLLECTION_NAME = "sensor-test"
+
+
+@pytest.fixture
+def sensor_data(monkeypatch):
+    monkeypatch.setattr(MongoDBClient, "client", mongomock.MongoClient())
+    data = SensorData()
+    data._get_collection(COLLECTION_NAME).insert_many(
+        [{"_id": index, "aa_000": float(index % 17), "class": "pos" if index % 5 == 0 else "neg"}
+         for index in range(1000)]
+    )
+    return data
+
+
+def test_partition_boundaries_split_evenly(sensor_data):
+    boundaries = sensor_data.get_partition_boundaries(COLLECTION_NAME, n_partitions=4)
+    assert boundaries == [250, 500, 750]
+    assert sensor_data.get_partition_boundaries(COLLECTION_NAME, n_partitions=1) == []
+
+
+def test_partitioned_export_streams_chunks_in_key_order(sensor_data):
+    chunks = list(sensor_data.export_collection_in_partitions(
+        COLLECTION_NAME, n_partitions=4, chunk_size=100, projection={"_id": 1, "aa_000": 1}))
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    exported = pd.concat(chunks, ignore_index=True)
+    expected = pd.concat(sensor_data.export_collection_as_chunks(
+        COLLECTION_NAME, chunk_size=100, projection={"_id": 1, "aa_000": 1}), ignore_index=True)
+    pd.testing.assert_frame_equal(exported, expected)
+
+
+def test_partitioned_export_keeps_a_bounded_number_of_chunks_in_flight(sensor_data, monkeypatch):
+    produced = []
+    original = SensorData._documents_to_dataframe
+
+    def counting(documents):
+        produced.append(len(documents))
+        return original(documents)
+
+    monkeypatch.setattr(SensorData, "_documents_to_dataframe", staticmethod(counting))
+    chunks = sensor_data.export_collection_in_partitions(COLLECTION_NAME, n_partitions=4, chunk_size=10,
+                                                         prefetch_chunks=2)
+    next(chunks)
+    # Workers ko queue bharne ka mauka do; har partition (queue + haath mein ek) se zyada aage nahi jaata
+    threading.Event().wait(0.5)
+    assert len(produced) <= 4 * (2 + 1) + 1
+    chunks.close()